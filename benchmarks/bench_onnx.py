@@ -0,0 +1,68 @@
+"""Benchmark the int8 ONNX Runtime backend against the PyTorch pipeline.
+
+Scores the same comments with ``transformers.pipeline`` (full precision,
+torch) and with the dynamically quantized ONNX export served by onnxruntime.
+Reports label agreement, the largest score difference and texts per second
+for each backend. The model is exported first if ``--onnx-dir`` has no export
+yet (that step needs torch, ``onnx`` and ``onnxruntime``).
+
+Usage::
+
+    python benchmarks/bench_onnx.py                           # roberta, 2k comments from data/
+    python benchmarks/bench_onnx.py --model distilbert-base-uncased-finetuned-sst-2-english -n 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+import duckdb
+
+from mlb_sentiment.models.onnx_backend import compare
+from mlb_sentiment.models.process import get_model_from_string
+
+
+def _parquet_texts(data_root: str, n: int) -> list:
+    pattern = os.path.join(data_root, "*", "*_comments.parquet").replace("'", "''")
+    rows = duckdb.sql(
+        f"SELECT text FROM read_parquet('{pattern}', union_by_name = true) "
+        f"WHERE text <> '' LIMIT {n}"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--model",
+        default="twitter-roberta-base-sentiment",
+        help="Hugging Face sentiment model (as in --sentiment-model)",
+    )
+    parser.add_argument(
+        "--data", default="data", help="Root folder of per-team Parquet"
+    )
+    parser.add_argument("--onnx-dir", default=None, help="Root folder of exports")
+    parser.add_argument("-n", type=int, default=2000, help="Number of comments")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per batch")
+    args = parser.parse_args()
+
+    model = get_model_from_string(args.model)
+    texts = _parquet_texts(args.data, args.n)
+    report = compare(model.value, texts, args.onnx_dir, batch_size=args.batch_size)
+
+    print(f"{'Comments:':14} {report['texts']}")
+    print(f"{'Agreement:':14} {report['agreement']:8.2%}")
+    print(f"{'Max diff:':14} {report['max_score_diff']:8.4f}")
+    print(f"{'Torch:':14} {report['torch_per_second']:8.0f} texts/s")
+    print(f"{'ONNX int8:':14} {report['onnx_per_second']:8.0f} texts/s")
+    print(
+        f"{'Speedup:':14} "
+        f"{report['onnx_per_second'] / report['torch_per_second']:8.1f}x"
+    )
+    for text, expected, actual in report["disagreements"]:
+        print(f"  {expected} -> {actual}: {text[:70]!r}")
+
+
+if __name__ == "__main__":
+    main()
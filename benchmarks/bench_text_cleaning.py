@@ -0,0 +1,97 @@
+"""Benchmark scalar vs columnar Reddit text cleaning.
+
+Compares ``format_reddit_text`` (one call per comment, plus the short-comment
+``re.findall`` filter) against ``format_reddit_text_column`` (one Arrow pass
+over the whole column) and checks that both produce identical output.
+
+The corpus is either the raw comments of a real game thread (``--url``, needs
+Reddit credentials) or comment text from the committed Parquet under ``data/``.
+The stored text is already cleaned, so the Parquet corpus understates the work
+the scalar path does on raw threads (links, newlines, emoji).
+
+Usage::
+
+    python benchmarks/bench_text_cleaning.py                  # 20k comments from data/
+    python benchmarks/bench_text_cleaning.py --url https://www.reddit.com/r/NewYorkMets/comments/...
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import time
+
+import duckdb
+
+from mlb_sentiment.database.reddit import (
+    format_reddit_text,
+    format_reddit_text_column,
+    keep_comment_mask,
+)
+
+
+def _thread_texts(url: str, n: int) -> list:
+    from mlb_sentiment import config
+
+    submission = config.load_reddit_client().submission(url=url)
+    submission.comments.replace_more(limit=None)
+    return [c.body for c in submission.comments.list()][:n]
+
+
+def _parquet_texts(data_root: str, n: int) -> list:
+    pattern = os.path.join(data_root, "*", "*_comments.parquet").replace("'", "''")
+    rows = duckdb.sql(
+        f"SELECT text FROM read_parquet('{pattern}', union_by_name = true) LIMIT {n}"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _scalar(texts: list) -> list:
+    out = [format_reddit_text(t) for t in texts]
+    keep = [len(re.findall(r"[A-Za-z0-9]", t)) > 3 for t in out]
+    return out, keep
+
+
+def _columnar(texts: list) -> list:
+    out = format_reddit_text_column(texts)
+    keep = keep_comment_mask(out)
+    return out.to_pylist(), keep.to_pylist()
+
+
+def _best_of(fn, texts: list, repeat: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None, help="Reddit game thread to fetch")
+    parser.add_argument(
+        "--data", default="data", help="Root folder of per-team Parquet"
+    )
+    parser.add_argument("-n", type=int, default=20000, help="Number of comments")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path")
+    args = parser.parse_args()
+
+    texts = (
+        _thread_texts(args.url, args.n)
+        if args.url
+        else _parquet_texts(args.data, args.n)
+    )
+    scalar_s, scalar = _best_of(_scalar, texts, args.repeat)
+    columnar_s, columnar = _best_of(_columnar, texts, args.repeat)
+    assert scalar == columnar, "columnar cleaner diverged from format_reddit_text"
+
+    print(f"{'Comments:':12} {len(texts)}")
+    print(f"{'Scalar:':12} {scalar_s * 1000:8.1f} ms")
+    print(f"{'Columnar:':12} {columnar_s * 1000:8.1f} ms")
+    print(f"{'Speedup:':12} {scalar_s / columnar_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Usage::
 
     python pipeline/build_site_data.py                 # data/ -> site/data/
     python pipeline/build_site_data.py --data data --out site/data
+    python pipeline/build_site_data.py --team NYM --live 776543 --watch 30
 """
 
 from __future__ import annotations
@@ -17,6 +18,7 @@ import argparse
 import glob
 import json
 import os
+import time
 from datetime import datetime, timezone
 
 import duckdb
@@ -65,31 +67,146 @@ TEAM_NAMES = {
 WINDOW_MIN = 4  # comment-binning window for the per-game sentiment line
 
 
+# Time columns by file kind: (v1 Eastern wall-clock string, v2 UTC timestamp).
+# v2+ files (``schema_version`` >= 2 in the Parquet metadata) store native
+# timestamps; both versions are read side by side and converted to Eastern
+# wall time in SQL, so nothing downstream re-parses strings.
+TIME_COLUMNS = {
+    "comments": ("created_est", "created_utc"),
+    "game_events": ("est", "utc"),
+}
+
+
+# Compacted (cold) partitions live under <data>/compacted/<kind>/team=<TEAM>/
+# season=<YYYY>/month=<MM>/ (written by ``mlb-sentiment compact``); the daily
+# files in <data>/<TEAM>/ are the hot tier. Both are read together.
+COMPACTED_DIR = "compacted"
+
+# Rolling segments written by ``mlb-sentiment live`` during a game, under
+# <data>/live/<TEAM>/. The full build ignores them; ``--live`` reads them.
+LIVE_DIR = "live"
+
+
+def _quote(path: str) -> str:
+    return path.replace("'", "''")
+
+
+def _patterns(team_dir: str, kind: str) -> tuple:
+    """Globs of a team's daily files and compacted partitions of ``kind``."""
+    data_root, team = os.path.split(os.path.normpath(team_dir))
+    hot = os.path.join(team_dir, f"*{kind}*.parquet")
+    cold = os.path.join(
+        data_root, COMPACTED_DIR, kind, f"team={team}", "*", "*", "*.parquet"
+    )
+    return hot, cold
+
+
+def _source(team_dir: str, kind: str, filename: bool = False) -> str:
+    """SQL relation over a team's daily files and compacted partitions.
+
+    Compacted rows for a day that also has a daily file are skipped, so a day
+    re-fetched after compaction is never counted twice. With ``filename`` the
+    rows keep the path of the file they were read from.
+    """
+    hot, cold = _patterns(team_dir, kind)
+    exclude = "" if filename else " EXCLUDE (filename)"
+    hot_sql = f"""
+        SELECT *{exclude},
+            TRY_CAST(regexp_extract(filename, '_(\\d{{4}}-\\d{{2}}-\\d{{2}})_', 1)
+                     AS DATE) AS day
+        FROM read_parquet('{_quote(hot)}', union_by_name = true, filename = true)
+    """
+    if not glob.glob(cold):
+        return f"({hot_sql})"
+    cold_sql = f"""
+        SELECT * FROM read_parquet(
+            '{_quote(cold)}', union_by_name = true, hive_partitioning = false,
+            filename = {str(filename).lower()}
+        )
+    """
+    if not glob.glob(hot):
+        return f"({cold_sql})"
+    return f"""(
+        WITH hot AS ({hot_sql})
+        SELECT * FROM hot
+        UNION ALL BY NAME
+        SELECT * FROM ({cold_sql})
+        WHERE day NOT IN (SELECT day FROM hot WHERE day IS NOT NULL)
+    )"""
+
+
+def _eastern_select(con: duckdb.DuckDBPyConnection, source: str, kind: str):
+    """Return (columns to drop, SQL expression) yielding Eastern wall time."""
+    est_col, utc_col = TIME_COLUMNS[kind]
+    columns = {
+        row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    }
+    parts = []
+    if utc_col in columns:
+        parts.append(f"timezone('America/New_York', {utc_col})")
+    if est_col in columns:
+        parts.append(f"TRY_CAST({est_col} AS TIMESTAMP)")
+    expr = f"COALESCE({', '.join(parts)})" if parts else "CAST(NULL AS TIMESTAMP)"
+    return [c for c in (est_col, utc_col) if c in columns], expr
+
+
 def _signed_comments(con: duckdb.DuckDBPyConnection, team_dir: str) -> pd.DataFrame:
     """Load comments and apply the dashboard's score-sign convention in SQL."""
-    pattern = os.path.join(team_dir, "*comments*.parquet").replace("'", "''")
-    df = con.execute(f"""
+    patterns = [p for p in _patterns(team_dir, "comments") if glob.glob(p)]
+    return _signed(con, _source(team_dir, "comments", filename=True), patterns)
+
+
+def _signed(
+    con: duckdb.DuckDBPyConnection, source: str, patterns: list
+) -> pd.DataFrame:
+    """``source`` must carry a ``filename`` column; ``patterns`` are its globs."""
+    _, created_est = _eastern_select(con, source, "comments")
+    # Newer files store float32 scores; widen and round them to the precision
+    # float32 carries so old and new files produce identical aggregates.
+    # Legacy float64 scores are used as stored.
+    globs = ", ".join(f"'{_quote(p)}'" for p in patterns)
+    float32_files = con.execute(f"""
+        SELECT DISTINCT file_name FROM parquet_schema([{globs}])
+        WHERE name = 'sentiment_score' AND type = 'FLOAT'
+        """).fetchall()
+    score = "sentiment_score"
+    if float32_files:
+        files = ", ".join(f"'{_quote(f)}'" for (f,) in float32_files)
+        score = (
+            f"CASE WHEN filename IN ({files}) "
+            "THEN round(CAST(sentiment_score AS DOUBLE), 6) "
+            "ELSE sentiment_score END"
+        )
+    return con.execute(f"""
         SELECT
             CAST(game_id AS BIGINT) AS game_id,
             author,
             text,
-            created_est,
+            {created_est} AS created_est,
             sentiment,
             CASE
                 WHEN sentiment = 'neutral'  THEN 0.0
-                WHEN sentiment = 'negative' THEN -abs(sentiment_score)
-                ELSE sentiment_score
+                WHEN sentiment = 'negative' THEN -abs({score})
+                ELSE {score}
             END AS sentiment_score
-        FROM read_parquet('{pattern}')
-        ORDER BY created_est
+        FROM {source}
+        -- Ties on time are broken on the row itself, so the order (and the
+        -- panels picked from it) is the same from daily files or partitions.
+        ORDER BY created_est, game_id, author, text, sentiment_score
         """).fetchdf()
-    df["created_est"] = pd.to_datetime(df["created_est"])
-    return df
 
 
 def _read(con: duckdb.DuckDBPyConnection, team_dir: str, kind: str) -> pd.DataFrame:
-    pattern = os.path.join(team_dir, f"*{kind}*.parquet").replace("'", "''")
-    return con.execute(f"SELECT * FROM read_parquet('{pattern}')").fetchdf()
+    # Rows come back in a fixed order whatever files they were read from.
+    source = _source(team_dir, kind)
+    if kind not in TIME_COLUMNS:
+        return con.execute(f"SELECT * FROM {source} ORDER BY ALL").fetchdf()
+    drop, est = _eastern_select(con, source, kind)
+    exclude = f" EXCLUDE ({', '.join(drop)})" if drop else ""
+    return con.execute(
+        f"SELECT *{exclude}, {est} AS {TIME_COLUMNS[kind][0]} FROM {source} "
+        "ORDER BY ALL"
+    ).fetchdf()
 
 
 def _regression(x: np.ndarray, y: np.ndarray):
@@ -137,9 +254,7 @@ def _sentiment_ts(comments: pd.DataFrame) -> list:
 def _run_diff_ts(events: pd.DataFrame, team_is_home: bool) -> list:
     if events.empty:
         return []
-    ev = events.copy()
-    ev["est"] = pd.to_datetime(ev["est"])
-    ev = ev.sort_values("est")
+    ev = events.sort_values("est")
     home = pd.to_numeric(ev["home_score"], errors="coerce").fillna(0)
     away = pd.to_numeric(ev["away_score"], errors="coerce").fillna(0)
     diff = (home - away) if team_is_home else (away - home)
@@ -181,9 +296,7 @@ def _attach_innings(comments: pd.DataFrame, events: pd.DataFrame) -> pd.DataFram
     comments["inning"] = pd.NA
     if comments.empty or events.empty:
         return comments
-    ev = events.copy()
-    ev["est"] = pd.to_datetime(ev["est"])
-    for gid, g_ev in ev.groupby("game_id"):
+    for gid, g_ev in events.groupby("game_id"):
         bounds = g_ev.groupby("inning")["est"].max().sort_values()
         if bounds.empty:
             continue
@@ -216,7 +329,7 @@ def _inning_sentiment(comments: pd.DataFrame) -> list:
 
 
 def _fmt_comment(r, with_date=False):
-    est = pd.to_datetime(r["created_est"])  # stored as US/Eastern wall time
+    est = r["created_est"]  # US/Eastern wall time
     try:
         utc = EASTERN.localize(est.to_pydatetime()).astimezone(pytz.utc)
         utc_s = utc.strftime("%H:%M")
@@ -238,9 +351,9 @@ def _fmt_comment(r, with_date=False):
 def _game_comment_panels(gc: pd.DataFrame) -> dict:
     """Top 10, bottom 10, and 10 evenly spread across the game's innings."""
     gc = gc[gc["author"] != "None"]
-    top = gc.sort_values("sentiment_score", ascending=False).head(10)
-    bottom = gc.sort_values("sentiment_score").head(10)
-    by_time = gc.sort_values("created_est")
+    top = gc.sort_values("sentiment_score", ascending=False, kind="stable").head(10)
+    bottom = gc.sort_values("sentiment_score", kind="stable").head(10)
+    by_time = gc.sort_values("created_est", kind="stable")
     n = len(by_time)
     if n <= 10:
         spread = by_time
@@ -260,14 +373,21 @@ def _season_highlights(comments: pd.DataFrame, date_map: dict, n: int = 15) -> d
     if c.empty:
         return {"positive": [], "negative": []}
     c["game_date"] = c["game_id"].map(date_map)
-    pos = c.sort_values("sentiment_score", ascending=False).head(n)
-    neg = c.sort_values("sentiment_score").head(n)
+    pos = c.sort_values("sentiment_score", ascending=False, kind="stable").head(n)
+    neg = c.sort_values("sentiment_score", kind="stable").head(n)
     return {
         "positive": [_fmt_comment(r, with_date=True) for _, r in pos.iterrows()],
         "negative": [_fmt_comment(r, with_date=True) for _, r in neg.iterrows()],
     }
 
 
+def _counts(values: pd.Series) -> pd.Series:
+    """Value counts, most common first; equal counts in name order."""
+    counts = values.value_counts()
+    order = np.lexsort((counts.index.astype(str), -counts.to_numpy()))
+    return counts.iloc[order]
+
+
 def _event_pie(events: pd.DataFrame, team: str, top_n: int = 8) -> dict:
     """Count batting events for the team vs the opponent."""
     if events.empty:
@@ -279,25 +399,25 @@ def _event_pie(events: pd.DataFrame, team: str, top_n: int = 8) -> dict:
         ev["home_team"],
         ev["visiting_team"],
     )
-    team_counts = ev.loc[ev["batting"] == team, "event"].value_counts().head(top_n)
-    opp_counts = ev.loc[ev["batting"] != team, "event"].value_counts().head(top_n)
+    team_counts = _counts(ev.loc[ev["batting"] == team, "event"]).head(top_n)
+    opp_counts = _counts(ev.loc[ev["batting"] != team, "event"]).head(top_n)
     fmt = lambda s: [{"event": k, "count": int(v)} for k, v in s.items()]
     return {"team": fmt(team_counts), "opponent": fmt(opp_counts)}
 
 
 def _top_commenters(comments: pd.DataFrame) -> dict:
     c = comments[comments["author"] != "None"]
-    active = c["author"].value_counts().head(10)
-    pos = c.loc[c["sentiment"] == "positive", "author"].value_counts().head(5)
-    neg = c.loc[c["sentiment"] == "negative", "author"].value_counts().head(5)
+    active = _counts(c["author"]).head(10)
+    pos = _counts(c.loc[c["sentiment"] == "positive", "author"]).head(5)
+    neg = _counts(c.loc[c["sentiment"] == "negative", "author"]).head(5)
     pos_ex = (
         c[c["sentiment"] == "positive"]
-        .sort_values("sentiment_score", ascending=False)
+        .sort_values("sentiment_score", ascending=False, kind="stable")
         .head(6)[["author", "sentiment_score", "text", "created_est"]]
     )
     neg_ex = (
         c[c["sentiment"] == "negative"]
-        .sort_values("sentiment_score")
+        .sort_values("sentiment_score", kind="stable")
         .head(6)[["author", "sentiment_score", "text", "created_est"]]
     )
     ex = lambda df: [
@@ -305,7 +425,7 @@ def _top_commenters(comments: pd.DataFrame) -> dict:
             "author": r["author"],
             "score": round(float(r["sentiment_score"]), 3),
             "text": r["text"],
-            "date": pd.to_datetime(r["created_est"]).strftime("%m/%d/%Y"),
+            "date": r["created_est"].strftime("%m/%d/%Y"),
         }
         for _, r in df.iterrows()
     ]
@@ -342,8 +462,8 @@ def _moment_comments(gc, t, W, k=3):
     """Top-k and bottom-k comments in the window around a moment."""
     win = gc[(gc["created_est"] >= t - W) & (gc["created_est"] < t + W)]
     win = win[win["author"] != "None"]
-    top = win.sort_values("sentiment_score", ascending=False).head(k)
-    bottom = win.sort_values("sentiment_score").head(k)
+    top = win.sort_values("sentiment_score", ascending=False, kind="stable").head(k)
+    bottom = win.sort_values("sentiment_score", kind="stable").head(k)
     return {
         "top": [_fmt_comment(r) for _, r in top.iterrows()],
         "bottom": [_fmt_comment(r) for _, r in bottom.iterrows()],
@@ -373,9 +493,7 @@ def _biggest_moments(
         gc = gc.dropna(subset=["inning"])  # in-game comments only
     if gc.empty:
         return []
-    ev = ge.copy()
-    ev["est"] = pd.to_datetime(ev["est"], errors="coerce")
-    ev = ev.dropna(subset=["est"]).sort_values("est").reset_index(drop=True)
+    ev = ge.dropna(subset=["est"]).sort_values("est").reset_index(drop=True)
     if ev.empty:
         return []
     home = pd.to_numeric(ev["home_score"], errors="coerce").fillna(0).to_numpy()
@@ -459,9 +577,7 @@ def _clip_to_game_window(comments, events, pad_min=10):
     Comments whose game has no usable event timestamps are kept as-is."""
     if comments.empty or events.empty:
         return comments
-    ev = events.copy()
-    ev["est"] = pd.to_datetime(ev["est"], errors="coerce")
-    ev = ev.dropna(subset=["est"])
+    ev = events.dropna(subset=["est"])
     if ev.empty:
         return comments
     bounds = ev.groupby("game_id")["est"].agg(["min", "max"])
@@ -482,7 +598,11 @@ def build_team(con, team: str, team_dir: str) -> dict:
     games["game_id"] = games["game_id"].astype("int64")
     events["game_id"] = events["game_id"].astype("int64")
     games["game_date"] = pd.to_datetime(games["game_date"])
-    games = games.sort_values("game_date").reset_index(drop=True)
+    # Start time and id break doubleheader ties, so the order does not depend
+    # on which file (daily or compacted) a game was read from.
+    games = games.sort_values(
+        ["game_date", "game_start_time_est", "game_id"]
+    ).reset_index(drop=True)
 
     # Clip comments to each game's window (±10 min) before anything else, so
     # pre/post-game chatter is excluded from every downstream stat.
@@ -601,13 +721,62 @@ def build_team(con, team: str, team_dir: str) -> dict:
     }
 
 
+def update_live_game(
+    con, team: str, game_id: int, data_root: str, out_dir: str
+) -> dict | None:
+    """
+    Refresh one game's ``per_game`` entry in ``<out>/<TEAM>.json`` from its
+    live segments, leaving the rest of the payload as the last build wrote it.
+    ``game_id`` is the raw gamePk the segments are named by.
+
+    Returns the updated entry, or None if there are no segments or no payload.
+    """
+    pattern = os.path.join(
+        data_root, LIVE_DIR, team, f"{team}_*_{game_id}_*_comments.parquet"
+    )
+    path = os.path.join(out_dir, f"{team}.json")
+    if not glob.glob(pattern) or not os.path.exists(path):
+        return None
+    gc = _signed(
+        con,
+        f"read_parquet('{_quote(pattern)}', union_by_name = true, filename = true)",
+        [pattern],
+    )
+    # The game's events are not stored until the nightly upload: no innings yet.
+    gc = _attach_innings(gc, pd.DataFrame())
+
+    with open(path) as fh:
+        payload = json.load(fh)
+    # Payload entries are keyed by the team-prefixed id the comments carry.
+    key = str(gc["game_id"].iloc[0]) if len(gc) else str(game_id)
+    entry = payload["per_game"].setdefault(
+        key,
+        {"team_is_home": None, "run_diff_ts": [], "moments": []},
+    )
+    entry["sentiment_ts"] = _sentiment_ts(gc)
+    entry["comments"] = _game_comment_panels(gc)
+    entry["live"] = {
+        "comments": int(len(gc)),
+        "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
+    }
+    # The dashboard may be reading the file; swap it in atomically.
+    tmp = path + ".tmp"
+    with open(tmp, "w") as fh:
+        json.dump(payload, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+    return entry
+
+
 def discover_teams(data_root: str) -> list:
-    teams = []
-    for entry in sorted(os.listdir(data_root)):
+    teams = set()
+    for entry in os.listdir(data_root):
         team_dir = os.path.join(data_root, entry)
         if os.path.isdir(team_dir) and glob.glob(os.path.join(team_dir, "*.parquet")):
-            teams.append(entry)
-    return teams
+            teams.add(entry)
+    # Teams whose daily files have all been compacted.
+    for part in glob.glob(os.path.join(data_root, COMPACTED_DIR, "*", "team=*")):
+        teams.add(os.path.basename(part).split("=", 1)[1])
+    return sorted(teams)
 
 
 def main():
@@ -616,8 +785,38 @@ def main():
         "--data", default="data", help="Root folder of per-team Parquet"
     )
     parser.add_argument("--out", default="site/data", help="Output folder for JSON")
+    parser.add_argument(
+        "--live",
+        type=int,
+        metavar="GAME_ID",
+        help="Only refresh this game's series from its live segments (needs --team)",
+    )
+    parser.add_argument("--team", help="Team of the --live game")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="With --live, keep refreshing every SECONDS until interrupted",
+    )
     args = parser.parse_args()
 
+    if args.live is not None:
+        if not args.team:
+            parser.error("--live requires --team")
+        con = duckdb.connect()
+        while True:
+            entry = update_live_game(con, args.team, args.live, args.data, args.out)
+            if entry is None:
+                print(f"No live segments or payload for {args.team} game {args.live}.")
+            else:
+                print(
+                    f"  refreshed {args.team} game {args.live}: "
+                    f"{entry['live']['comments']} comments"
+                )
+            if not args.watch:
+                return
+            time.sleep(args.watch)
+
     os.makedirs(args.out, exist_ok=True)
     con = duckdb.connect()
     teams = discover_teams(args.data) if os.path.isdir(args.data) else []
@@ -2,8 +2,9 @@
 
 Live fetching requires Reddit credentials and MLB Stats API egress that only
 exist inside the GitHub Action. This module fabricates a week of games for a
-single team using the *exact* Parquet schema produced by ``mlb_sentiment`` so
-the rest of the pipeline (DuckDB build + static site) can be exercised offline.
+single team in the v1 Parquet layout (Eastern wall-clock time strings), which
+the DuckDB build still reads alongside v2 files, so the rest of the pipeline
+(DuckDB build + static site) can be exercised offline.
 
 The fabricated sentiment is intentionally correlated with the score so the
 charts tell a coherent story: fans turn positive when their team scores and
@@ -0,0 +1,133 @@
+"""Raw MLB Stats API archive and offline reprocessing.
+
+The Parquet written by ``upload`` only keeps the rows parsed out of the Stats
+API responses. This module also keeps the responses themselves, as
+zstd-compressed JSON, so the ``*_games.parquet`` and ``*_game_events.parquet``
+files can be regenerated after a parsing change without touching the network.
+
+Layout under the archive directory::
+
+    schedule/<TEAM>/<TEAM>_<YYYY-MM-DD>.json.zst   team id, schedule, record,
+                                                   team abbreviations
+    feeds/<gamePk>.json.zst                        statsapi live feed
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+
+from mlb_sentiment.database.mlb import save_mlb_events, save_mlb_games
+from mlb_sentiment.fetch.mlb import GameContext, fetch_mlb_events, fetch_mlb_games
+
+
+def write_json_zst(path, obj):
+    """Write ``obj`` as zstd-compressed JSON, atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with pa.output_stream(tmp, compression="zstd") as fh:
+        fh.write(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+    os.replace(tmp, path)
+
+
+def read_json_zst(path):
+    """Read zstd-compressed JSON written by ``write_json_zst``."""
+    with pa.input_stream(path, compression="zstd") as fh:
+        return json.loads(fh.read().decode("utf-8"))
+
+
+def _schedule_path(archive_dir, team_acronym, date):
+    date_tag = datetime.strptime(date, "%m/%d/%Y").strftime("%Y-%m-%d")
+    return os.path.join(
+        archive_dir, "schedule", team_acronym, f"{team_acronym}_{date_tag}.json.zst"
+    )
+
+
+def _feed_path(archive_dir, game_id):
+    return os.path.join(archive_dir, "feeds", f"{game_id}.json.zst")
+
+
+def archive_game_context(context, archive_dir):
+    """
+    Archive everything a GameContext fetched: the team's schedule, record and
+    team abbreviations, plus the live feed of every scheduled game.
+
+    Call it after ``fetch_mlb_games``/``fetch_mlb_events`` so the feeds are
+    still in the shared feed cache.
+    """
+    for g in context.schedule:
+        write_json_zst(
+            _feed_path(archive_dir, g["game_id"]), context.feed(g["game_id"])
+        )
+    write_json_zst(
+        _schedule_path(archive_dir, context.team_acronym, context.date),
+        {
+            "team_acronym": context.team_acronym,
+            "team_id": context.team_id,
+            "date": context.date,
+            "schedule": context.schedule,
+            "record": list(context.record),
+            "abbreviations": {
+                name: context.abbreviation(name)
+                for g in context.schedule
+                for name in (g["home_name"], g["away_name"])
+            },
+        },
+    )
+
+
+def load_game_context(archive_dir, team_acronym, date):
+    """Rebuild a GameContext from the archive; its feeds are read lazily from disk."""
+    data = read_json_zst(_schedule_path(archive_dir, team_acronym, date))
+    return GameContext(
+        team_acronym,
+        data["date"],
+        schedule=data["schedule"],
+        team_id=data["team_id"],
+        record=data["record"],
+        abbreviations=data["abbreviations"],
+        feed_loader=lambda game_id: read_json_zst(_feed_path(archive_dir, game_id)),
+    )
+
+
+def archived_team_days(archive_dir, teams, start_date, end_date):
+    """
+    List the (team, date) pairs with an archived schedule in a date range.
+
+    Args:
+        teams (list): Team acronyms to include.
+        start_date (str): First date (MM/DD/YYYY), inclusive.
+        end_date (str): Last date (MM/DD/YYYY), inclusive.
+    """
+    start_dt = datetime.strptime(start_date, "%m/%d/%Y")
+    end_dt = datetime.strptime(end_date, "%m/%d/%Y")
+    pairs = []
+    for team in teams:
+        for offset in range((end_dt - start_dt).days + 1):
+            date = (start_dt + timedelta(days=offset)).strftime("%m/%d/%Y")
+            if os.path.exists(_schedule_path(archive_dir, team, date)):
+                pairs.append((team, date))
+    return pairs
+
+
+def reprocess_team_day(archive_dir, data_dir, team_acronym, date):
+    """
+    Regenerate one team/date's games and game-events Parquet from the archive.
+
+    Returns:
+        tuple: (number of games, number of events) written.
+    """
+    context = load_game_context(archive_dir, team_acronym, date)
+    games = fetch_mlb_games(team_acronym, date=date, context=context)
+    if not games:
+        return 0, 0
+    events = fetch_mlb_events(team_acronym, date=date, context=context)
+
+    date_tag = datetime.strptime(date, "%m/%d/%Y").strftime("%Y-%m-%d")
+    out_dir = os.path.join(data_dir, team_acronym)
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{team_acronym}_{date_tag}")
+    save_mlb_events(events, filename=base)
+    save_mlb_games(games, filename=base)
+    return len(games), len(events)
@@ -0,0 +1,156 @@
+"""Record/replay of Reddit HTTP traffic for offline profiling and benchmarks.
+
+``config.load_reddit_client`` can hand PRAW a requests session that records
+every exchange to a cassette, or one that replays a cassette with no network
+access. Replay is deterministic: requests are matched on method, path, query
+and form body, and repeated requests get their recorded responses back in
+order. Cassettes are zstd-compressed JSON written with
+``archive.write_json_zst``; OAuth tokens are redacted before they are saved.
+
+Record once with credentials, then profile anywhere::
+
+    REDDIT_CASSETTE=cassettes/nym.json.zst REDDIT_CASSETTE_MODE=record \\
+        mlb-sentiment upload --team-acronym NYM --date 09/14/2025
+    REDDIT_CASSETTE=cassettes/nym.json.zst REDDIT_CASSETTE_MODE=replay \\
+        python -m cProfile -s cumtime -m mlb_sentiment.cli upload ...
+"""
+
+import atexit
+import json
+import threading
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from mlb_sentiment.archive import read_json_zst, write_json_zst
+
+CASSETTE_MODES = ("record", "replay")
+
+# Response headers worth keeping, besides Reddit's ``x-ratelimit-*`` state.
+_KEPT_HEADERS = ("content-type", "retry-after")
+_REDACTED = "REDACTED"
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recorded response."""
+
+
+def request_key(method, url, params=None, data=None):
+    """Canonical ``METHOD path?query [body]`` for matching a request."""
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query) + list((params or {}).items())
+    if isinstance(data, dict):
+        data = list(data.items())
+    elif isinstance(data, (str, bytes)):
+        data = parse_qsl(data.decode() if isinstance(data, bytes) else data)
+    key = f"{method.upper()} {parsed.path}"
+    if query:
+        key += "?" + urlencode(sorted((str(k), str(v)) for k, v in query))
+    if data:
+        key += " " + urlencode(sorted((str(k), str(v)) for k, v in data))
+    return key
+
+
+def _redact(key, text):
+    """Strip OAuth tokens from access-token responses."""
+    if "access_token" not in key:
+        return text
+    try:
+        body = json.loads(text)
+    except ValueError:
+        return text
+    if "access_token" in body:
+        body["access_token"] = _REDACTED
+    return json.dumps(body)
+
+
+def _build_response(url, entry):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    # Rate-limit headers are kept for reference but not replayed, so neither
+    # prawcore nor the scheduler sleeps on a window that has long passed.
+    response.headers = CaseInsensitiveDict(
+        {
+            name: value
+            for name, value in entry["headers"].items()
+            if not name.lower().startswith("x-ratelimit")
+        }
+    )
+    response._content = entry["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+class RecordingSession(requests.Session):
+    """requests session that appends every exchange to a cassette file."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.exchanges = []
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        response = super().request(method, url, params=params, data=data, **kwargs)
+        key = request_key(method, url, params, data)
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() in _KEPT_HEADERS or name.lower().startswith("x-ratelimit")
+        }
+        with self._lock:
+            self.exchanges.append(
+                {
+                    "key": key,
+                    "status": response.status_code,
+                    "headers": headers,
+                    "body": _redact(key, response.text),
+                }
+            )
+        return response
+
+    def save(self):
+        """Write the exchanges recorded so far (also run at exit)."""
+        with self._lock:
+            exchanges = list(self.exchanges)
+        write_json_zst(self.path, {"version": 1, "exchanges": exchanges})
+
+
+class ReplaySession(requests.Session):
+    """
+    requests session that answers from a cassette and never touches the
+    network. A request missing from the cassette raises ``CassetteMiss``.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._responses = defaultdict(list)
+        for entry in read_json_zst(path)["exchanges"]:
+            self._responses[entry["key"]].append(entry)
+        self._served = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        key = request_key(method, url, params, data)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key}")
+            # Serve recordings in order; keep repeating the last one.
+            index = min(self._served[key], len(entries) - 1)
+            self._served[key] += 1
+        return _build_response(url, entries[index])
+
+
+def cassette_session(path, mode):
+    """Return the session for a cassette ``mode`` ("record" or "replay")."""
+    if mode == "record":
+        return RecordingSession(path)
+    if mode == "replay":
+        return ReplaySession(path)
+    raise ValueError(f"Unsupported cassette mode: {mode} (expected {CASSETTE_MODES})")
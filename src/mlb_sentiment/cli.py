@@ -1,12 +1,77 @@
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
 import click
+import pyarrow.parquet as pq
+import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
-from mlb_sentiment.fetch.reddit import fetch_reddit_posts, fetch_reddit_comments
-from mlb_sentiment.database.reddit import save_reddit_posts, save_reddit_comments
-from mlb_sentiment.fetch.mlb import fetch_mlb_events, fetch_mlb_games
+from mlb_sentiment import config, info, utility
+from mlb_sentiment.archive import (
+    archive_game_context,
+    archived_team_days,
+    load_game_context,
+    reprocess_team_day,
+)
+from mlb_sentiment.live import SegmentWriter, follow_game, game_finished
+from mlb_sentiment.fetch.reddit import (
+    fetch_reddit_posts,
+    fetch_reddit_posts_range,
+    fetch_reddit_comments,
+    score_comments,
+)
+from mlb_sentiment.database.reddit import (
+    comment_delta,
+    latest_comment_utc,
+    load_reddit_posts,
+    save_reddit_comments,
+    save_reddit_posts,
+)
+from mlb_sentiment.fetch.mlb import (
+    GameContext,
+    configure_feed_cache,
+    fetch_mlb_events,
+    fetch_mlb_games,
+    game_contexts_for_range,
+    prefetch_league_snapshots,
+)
 from mlb_sentiment.database.mlb import save_mlb_events, save_mlb_games
-from mlb_sentiment.models.process import get_model_from_string
+from mlb_sentiment.database.compact import COMPACTED_DIR, compact_team, restore_day
+from mlb_sentiment.database.schema import SCHEMA_VERSION, migrate_file
+from mlb_sentiment.models.cache import configure_sentiment_cache, get_sentiment_cache
+from mlb_sentiment.models.pool import configure_scoring_pool
+from mlb_sentiment.models.server import (
+    ScoringServer,
+    configure_scoring_client,
+    default_socket_path,
+)
+from mlb_sentiment.models.process import (
+    HUGGING_FACE_BACKENDS,
+    get_model_from_string,
+    set_backend,
+)
+from mlb_sentiment.scheduler import DEFAULT_LIMITS, configure_scheduler, get_scheduler
+from mlb_sentiment.score import comment_files, init_worker, score_file
+from mlb_sentiment.stub_server import (
+    STATSAPI_PREFIX,
+    StubServer,
+    SyntheticLeague,
+    spawn_stub_server,
+)
+
+SENTIMENT_MODEL_CHOICES = [
+    "vader",
+    "distilbert-base-uncased-finetuned-sst-2-english",
+    "twitter-roberta-base-sentiment",
+    "null",
+]
+
+# Per-thread Reddit clients of the team pools (see ``_thread_reddit_client``).
+_REDDIT_CLIENTS = threading.local()
 
 
 @click.group()
@@ -15,44 +80,367 @@ def cli():
     pass
 
 
+def _apply_options(f, options):
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def comment_fetch_options(f):
+    """How a game thread's comment tree is downloaded."""
+    return _apply_options(
+        f,
+        [
+            click.option(
+                "--fetch-mode",
+                default="single",
+                show_default=True,
+                type=click.Choice(["single", "sorts"]),
+                help="'single': one tree download per thread with budgeted "
+                "MoreComments expansion; 'sorts': legacy re-download per sort order.",
+            ),
+            click.option(
+                "--more-requests",
+                default=32,
+                show_default=True,
+                help="Max MoreComments expansion requests per thread (single mode).",
+            ),
+            click.option(
+                "--more-seconds",
+                default=60.0,
+                show_default=True,
+                help="Max seconds spent expanding MoreComments per thread "
+                "(single mode).",
+            ),
+        ],
+    )
+
+
+def scoring_options(f):
+    """How fetched comments are scored."""
+    return _apply_options(
+        f,
+        [
+            click.option(
+                "--sentiment-model",
+                default="null",
+                show_default=True,
+                type=click.Choice(SENTIMENT_MODEL_CHOICES),
+                help="Sentiment analysis model to use for Reddit comments.",
+            ),
+            click.option(
+                "--batch-size",
+                default=32,
+                show_default=True,
+                help="Comments per sentiment-model forward pass.",
+            ),
+            click.option(
+                "--score-workers",
+                default=1,
+                show_default=True,
+                help="Worker processes scoring comments, each with the model "
+                "loaded once (1 = score in this process).",
+            ),
+            click.option(
+                "--sentiment-cache",
+                default=config.SENTIMENT_CACHE,
+                help="SQLite file caching sentiment results by model, revision "
+                "and text across runs (default: $MLB_SENTIMENT_CACHE, else memory "
+                "only).",
+            ),
+            click.option(
+                "--sentiment-backend",
+                default=config.SENTIMENT_BACKEND,
+                show_default=True,
+                type=click.Choice(HUGGING_FACE_BACKENDS),
+                help="Run Hugging Face models on torch, or as int8 ONNX exports on "
+                "onnxruntime (exported to $MLB_ONNX_DIR on first use).",
+            ),
+        ],
+    )
+
+
+def team_pool_options(f):
+    """Options of the commands that work through many teams concurrently."""
+    return _apply_options(
+        f,
+        [
+            click.option(
+                "--teams",
+                multiple=True,
+                help="Team acronyms (repeatable or comma-separated; default: all "
+                "processed teams).",
+            ),
+            click.option(
+                "--workers",
+                default=4,
+                show_default=True,
+                help="Teams fetched concurrently (bounded thread pool).",
+            ),
+        ],
+    )
+
+
+def fetch_options(f):
+    """Options shared by every command that fetches + scores a team/date."""
+    options = [
+        click.option("--date", default=None, help="The date to fetch (MM/DD/YYYY)."),
+        click.option(
+            "--comments-limit",
+            default=5,
+            show_default=True,
+            help="Max number of Reddit comments to save (0 = all).",
+        ),
+        click.option(
+            "--yesterday",
+            is_flag=True,
+            help="Shortcut: set --date to one day before current date.",
+        ),
+        click.option(
+            "--data-dir",
+            default="data",
+            show_default=True,
+            help="Root directory for per-team Parquet output.",
+        ),
+        comment_fetch_options,
+        scoring_options,
+        click.option(
+            "--feed-cache-dir",
+            default=None,
+            help="Keep finished games' MLB live feeds here across runs "
+            "(default: $MLB_FEED_CACHE_DIR, else memory only).",
+        ),
+        click.option(
+            "--archive-dir",
+            default=config.ARCHIVE_DIR,
+            help="Also archive the raw Stats API schedule and game feeds here as "
+            "zstd JSON, for `reprocess` (default: $MLB_ARCHIVE_DIR, else off).",
+        ),
+        click.option(
+            "--merge",
+            is_flag=True,
+            help="Upsert into the day's stored comments by Reddit id: only new or "
+            "edited comments are scored and written; the rest are kept.",
+        ),
+        click.option(
+            "--store-raw",
+            is_flag=True,
+            help="Also store each comment's body as fetched, so `score` can "
+            "(re)score the same text later with any model.",
+        ),
+    ]
+    return _apply_options(f, options)
+
+
+def _resolve_date(date, yesterday):
+    """Return the MM/DD/YYYY date to fetch, honoring --yesterday."""
+    if yesterday:
+        return (datetime.now() - timedelta(days=1)).strftime("%m/%d/%Y")
+    return date
+
+
+def _output_base(data_dir, team_acronym, date):
+    """Return the ``<data-dir>/<TEAM>/<TEAM>_<YYYY-MM-DD>`` prefix (dir created)."""
+    out_dir = os.path.join(data_dir, team_acronym)
+    os.makedirs(out_dir, exist_ok=True)
+    date_tag = datetime.strptime(date, "%m/%d/%Y").strftime("%Y-%m-%d")
+    return os.path.join(out_dir, f"{team_acronym}_{date_tag}")
+
+
+def _parse_teams(teams):
+    """Flatten repeatable/comma-separated --teams values (default: all processed)."""
+    team_list = [
+        t.strip().upper() for arg in teams for t in arg.split(",") if t.strip()
+    ]
+    return team_list or list(info.PROCESSED_TEAMS)
+
+
+def _fetch_team_day(
+    team_acronym,
+    date,
+    reddit,
+    comments_limit,
+    fetch_mode,
+    more_requests,
+    more_seconds,
+    posts=None,
+    context=None,
+    archive_dir=None,
+):
+    """
+    Fetch one team's games, events, posts and (unscored) comments for a date.
+    ``posts`` may be passed in when they were already discovered (e.g. by a
+    range scan); otherwise they are fetched for ``date``. All MLB lookups go
+    through one GameContext, so the schedule, feeds and record load once;
+    with ``archive_dir`` the raw responses are archived as well.
+
+    Returns:
+        tuple: (bundle dict, None) on success, or (None, reason str) when there
+        is nothing to write.
+    """
+    context = context or GameContext(team_acronym, date)
+    games = fetch_mlb_games(team_acronym, date=date, context=context)
+    if not games:
+        return None, f"No MLB games found for {team_acronym} on {date}."
+    game_events = fetch_mlb_events(team_acronym, date=date, context=context)
+    if archive_dir:
+        archive_game_context(context, archive_dir)
+    if posts is None:
+        posts = fetch_reddit_posts(
+            team_acronym, date=date, reddit=reddit, context=context
+        )
+    if not posts:
+        return None, f"No Reddit posts found for {team_acronym} on {date}."
+    comments = fetch_reddit_comments(
+        posts,
+        limit=comments_limit,
+        sentiment_model=None,
+        mode=fetch_mode,
+        more_requests=more_requests,
+        more_seconds=more_seconds,
+        reddit=reddit,
+    )
+    bundle = {
+        "games": games,
+        "game_events": game_events,
+        "posts": posts,
+        "comments": comments,
+    }
+    return bundle, None
+
+
+def _fetch_team_days(
+    team_acronym, dates, reddit, leagues, *fetch_args, archive_dir=None
+):
+    """
+    Fetch one team over several dates, discovering posts in one listing pass.
+    Schedules and records come from the shared ``leagues`` snapshots.
+
+    Returns:
+        list: ``(date, bundle, reason)`` per date; ``reason`` explains a
+        missing bundle: a message when there is nothing to write, or the
+        exception that date raised.
+    """
+    contexts = game_contexts_for_range(
+        team_acronym, dates[0], dates[-1], leagues=leagues
+    )
+    posts_by_date = fetch_reddit_posts_range(
+        team_acronym, dates[0], dates[-1], reddit=reddit, contexts=contexts
+    )
+    results = []
+    for date in dates:
+        try:
+            bundle, reason = _fetch_team_day(
+                team_acronym,
+                date,
+                reddit,
+                *fetch_args,
+                posts=posts_by_date.get(date, []),
+                context=contexts[date],
+                archive_dir=archive_dir,
+            )
+        except Exception as e:  # noqa: BLE001 - one date must not sink the rest
+            bundle, reason = None, e
+        results.append((date, bundle, reason))
+    return results
+
+
+def _thread_reddit_client():
+    """
+    This thread's Reddit client. PRAW clients are not thread-safe, so every
+    team-pool worker builds its own; their requests still go through the
+    shared scheduler.
+    """
+    reddit = getattr(_REDDIT_CLIENTS, "reddit", None)
+    if reddit is None:
+        reddit = _REDDIT_CLIENTS.reddit = config.load_reddit_client()
+    return reddit
+
+
+def _each_team_day(team_list, workers, fetch, failed):
+    """
+    Run ``fetch(team)`` for every team on a bounded thread pool and yield
+    ``(team, day, result, reason)`` per date as each team completes, so the
+    caller scores one team while the others are still fetching. A team or
+    date that raised is echoed and added to ``failed`` instead.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch, team): team for team in team_list}
+        for future in as_completed(futures):
+            team = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:  # noqa: BLE001 - one team must not sink the run
+                click.echo(f"{team}: failed ({e})")
+                failed.append(team)
+                continue
+            for day, result, reason in results:
+                if isinstance(reason, Exception):
+                    click.echo(f"{team} {day}: failed ({reason})")
+                    failed.append(f"{team} {day}")
+                    continue
+                yield team, day, result, reason
+
+
+def _echo_request_report():
+    """Print per-endpoint request stats from the shared scheduler."""
+    for endpoint, s in get_scheduler().report().items():
+        rate = "-" if s["per_second"] is None else f"{s['per_second']:.2f}/s"
+        click.echo(
+            f"{endpoint + ':':20} {s['calls']} calls, {s['retries']} retries, "
+            f"{s['errors']} errors, waited {s['wait_seconds']:.1f}s, {rate}"
+        )
+
+
+def _echo_sentiment_cache():
+    """Print the shared sentiment cache's hit counters, once it has been used."""
+    cache = get_sentiment_cache()
+    rate = cache.hit_rate()
+    if rate is None:
+        return
+    stats = cache.stats
+    click.echo(
+        f"{'Sentiment cache:':20} {stats['hits']} hits, {stats['disk_hits']} from "
+        f"disk, {stats['misses']} scored ({rate:.0%} hit rate)"
+    )
+
+
+def _comment_delta(bundle, data_dir, team_acronym, date):
+    """
+    Narrow a fetched bundle's comments to those a merging save would change,
+    so only they get scored. A day already compacted is first restored to its
+    daily file, which the merge then updates.
+    """
+    day = datetime.strptime(date, "%m/%d/%Y").date()
+    restore_day(data_dir, team_acronym, "comments", day)
+    fetched = len(bundle["comments"])
+    bundle["comments"] = comment_delta(
+        bundle["comments"], _output_base(data_dir, team_acronym, date)
+    )
+    click.echo(
+        f"{team_acronym} {date}: {len(bundle['comments'])} of {fetched} "
+        "comment(s) new or edited"
+    )
+    return bundle
+
+
+def _save_team_day(bundle, base, merge=False, store_raw=False):
+    """Write a fetched (and scored) team/date bundle to Parquet under ``base``."""
+    save_reddit_posts(bundle["posts"], filename=base)
+    save_reddit_comments(
+        bundle["comments"], filename=base, merge=merge, store_raw=store_raw
+    )
+    save_mlb_events(bundle["game_events"], filename=base)
+    save_mlb_games(bundle["games"], filename=base)
+
+
 @cli.command()
 @click.option(
     "--team-acronym",
     required=True,
     help="The team acronym (e.g., NYY for New York Yankees).",
 )
-@click.option("--date", default=None, help="The date to fetch (MM/DD/YYYY).")
-@click.option(
-    "--comments-limit",
-    default=5,
-    show_default=True,
-    help="Max number of Reddit comments to save (0 = all).",
-)
-@click.option(
-    "--yesterday",
-    is_flag=True,
-    help="Shortcut: set --date to one day before current date.",
-)
-@click.option(
-    "--data-dir",
-    default="data",
-    show_default=True,
-    help="Root directory for per-team Parquet output.",
-)
-@click.option(
-    "--sentiment-model",
-    default="null",
-    show_default=True,
-    type=click.Choice(
-        [
-            "vader",
-            "distilbert-base-uncased-finetuned-sst-2-english",
-            "twitter-roberta-base-sentiment",
-            "null",
-        ]
-    ),
-    help="Sentiment analysis model to use for Reddit comments.",
-)
+@fetch_options
 def upload(
     team_acronym,
     date,
@@ -60,22 +448,34 @@ def upload(
     yesterday,
     data_dir,
     sentiment_model,
+    fetch_mode,
+    more_requests,
+    more_seconds,
+    batch_size,
+    score_workers,
+    sentiment_cache,
+    sentiment_backend,
+    feed_cache_dir,
+    archive_dir,
+    merge,
+    store_raw,
 ):
     """
     Fetch Reddit game threads and MLB events for a team/date and write Parquet
     to ``<data-dir>/<TEAM>/``. The static-site build (``pipeline/build_site_data``)
     reads these files; no external storage is required.
     """
-    if yesterday:
-        date = (datetime.now() - timedelta(days=1)).strftime("%m/%d/%Y")
+    date = _resolve_date(date, yesterday)
     if not date:
         click.echo("You must provide --date (or use --yesterday).")
         return
+    configure_feed_cache(disk_dir=feed_cache_dir)
+    configure_sentiment_cache(path=sentiment_cache)
+    set_backend(sentiment_backend, config.ONNX_DIR)
+    configure_scoring_pool(workers=score_workers)
 
-    out_dir = os.path.join(data_dir, team_acronym)
-    os.makedirs(out_dir, exist_ok=True)
-    date_tag = datetime.strptime(date, "%m/%d/%Y").strftime("%Y-%m-%d")
-    base = os.path.join(out_dir, f"{team_acronym}_{date_tag}")
+    base = _output_base(data_dir, team_acronym, date)
+    out_dir = os.path.dirname(base)
 
     # --------------------------
     # Options summary
@@ -91,34 +491,1160 @@ def upload(
     click.echo(f"{'Comments Limit:':20} {limit_display}")
     click.echo(f"{'Output Prefix:':20} {base}")
     click.echo(f"{'Sentiment Model:':20} {sentiment_model}")
+    click.echo(f"{'Fetch Mode:':20} {fetch_mode}")
     click.echo("=" * 60 + "\n")
 
     # --------------------------
-    # Fetch
+    # Fetch + score
     # --------------------------
-    games = fetch_mlb_games(team_acronym, date=date)
-    if not games:
-        click.echo(f"No MLB games found for {team_acronym} on {date}. Exiting.")
-        return
-    game_events = fetch_mlb_events(team_acronym, date=date)
-    posts = fetch_reddit_posts(team_acronym, date=date)
-    if not posts:
-        click.echo(f"No Reddit posts found for {team_acronym} on {date}. Exiting.")
+    bundle, reason = _fetch_team_day(
+        team_acronym,
+        date,
+        config.load_reddit_client(),
+        comments_limit,
+        fetch_mode,
+        more_requests,
+        more_seconds,
+        archive_dir=archive_dir,
+    )
+    if bundle is None:
+        click.echo(f"{reason} Exiting.")
         return
-    comments = fetch_reddit_comments(
-        posts,
-        limit=comments_limit,
-        sentiment_model=get_model_from_string(sentiment_model),
+    if merge:
+        _comment_delta(bundle, data_dir, team_acronym, date)
+    score_comments(
+        bundle["comments"],
+        get_model_from_string(sentiment_model),
+        batch_size=batch_size,
     )
 
     # --------------------------
     # Save Parquet
     # --------------------------
-    save_reddit_posts(posts, filename=base)
-    save_reddit_comments(comments, filename=base)
-    save_mlb_events(game_events, filename=base)
-    save_mlb_games(games, filename=base)
+    _save_team_day(bundle, base, merge=merge, store_raw=store_raw)
+    date_tag = datetime.strptime(date, "%m/%d/%Y").strftime("%Y-%m-%d")
     click.echo(f"\nWrote Parquet for {team_acronym} {date_tag} to {out_dir}/")
+    _echo_sentiment_cache()
+
+
+@cli.command("upload-all")
+@team_pool_options
+@click.option(
+    "--days",
+    default=1,
+    show_default=True,
+    help="Fetch this many days ending at --date; posts for the whole range "
+    "are discovered in one listing pass per team.",
+)
+@fetch_options
+def upload_all(
+    teams,
+    workers,
+    days,
+    date,
+    comments_limit,
+    yesterday,
+    data_dir,
+    sentiment_model,
+    fetch_mode,
+    more_requests,
+    more_seconds,
+    batch_size,
+    score_workers,
+    sentiment_cache,
+    sentiment_backend,
+    feed_cache_dir,
+    archive_dir,
+    merge,
+    store_raw,
+):
+    """
+    Fetch, score and write Parquet for many teams in one process.
+
+    The sentiment model is loaded once, the statsapi team cache is shared,
+    and teams are fetched concurrently on a bounded worker pool (one Reddit
+    client per worker) while this process scores each team's comments as its
+    fetch completes. With ``--days N`` the N days ending at ``--date`` are fetched.
+    Game feeds are shared too, so a head-to-head game downloads once.
+    """
+    date = _resolve_date(date, yesterday)
+    if not date:
+        click.echo("You must provide --date (or use --yesterday).")
+        return
+    feed_cache = configure_feed_cache(disk_dir=feed_cache_dir)
+    configure_sentiment_cache(path=sentiment_cache)
+    set_backend(sentiment_backend, config.ONNX_DIR)
+    configure_scoring_pool(workers=score_workers)
+    end_dt = datetime.strptime(date, "%m/%d/%Y")
+    dates = [
+        (end_dt - timedelta(days=i)).strftime("%m/%d/%Y")
+        for i in reversed(range(max(1, days)))
+    ]
+    team_list = _parse_teams(teams)
+    model = get_model_from_string(sentiment_model)
+
+    click.echo("=" * 60)
+    click.echo(" MLB Sentiment Multi-Team Fetcher ".center(60, "="))
+    click.echo("=" * 60)
+    click.echo(f"{'Teams:':20} {' '.join(team_list)}")
+    click.echo(f"{'Dates:':20} {dates[0]} - {dates[-1]}")
+    click.echo(f"{'Workers:':20} {workers}")
+    click.echo(f"{'Sentiment Model:':20} {sentiment_model}")
+    click.echo(f"{'Fetch Mode:':20} {fetch_mode}")
+    click.echo("=" * 60 + "\n")
+
+    # Shared state: one league-wide schedule (+ standings per date) serving
+    # every team. Each worker thread has its own Reddit client.
+    leagues = prefetch_league_snapshots(dates[0], dates[-1])
+
+    written, skipped, failed = [], [], []
+
+    def fetch(team):
+        return _fetch_team_days(
+            team,
+            dates,
+            _thread_reddit_client(),
+            leagues,
+            comments_limit,
+            fetch_mode,
+            more_requests,
+            more_seconds,
+            archive_dir=archive_dir,
+        )
+
+    # Scoring stage: consume each team's comments as its fetch completes.
+    for team, day, bundle, reason in _each_team_day(team_list, workers, fetch, failed):
+        label = f"{team} {day}"
+        if bundle is None:
+            click.echo(reason)
+            skipped.append(label)
+            continue
+        try:
+            if merge:
+                _comment_delta(bundle, data_dir, team, day)
+            score_comments(bundle["comments"], model, batch_size=batch_size)
+            _save_team_day(
+                bundle,
+                _output_base(data_dir, team, day),
+                merge=merge,
+                store_raw=store_raw,
+            )
+            written.append(label)
+        except Exception as e:  # noqa: BLE001
+            click.echo(f"{label}: failed ({e})")
+            failed.append(label)
+
+    click.echo("\n" + "=" * 60)
+    click.echo(f"{'Written:':20} {', '.join(sorted(written)) or '-'}")
+    click.echo(f"{'Skipped:':20} {', '.join(sorted(skipped)) or '-'}")
+    click.echo(f"{'Failed:':20} {', '.join(sorted(failed)) or '-'}")
+    click.echo(
+        f"{'Game feeds:':20} {feed_cache.stats['downloads']} downloaded, "
+        f"{feed_cache.stats['hits']} shared, {feed_cache.stats['disk_hits']} from disk"
+    )
+    _echo_sentiment_cache()
+    _echo_request_report()
+    if failed:
+        raise click.ClickException(f"{len(failed)} team/date(s) failed to upload.")
+
+
+def _refresh_team_days(team_acronym, dates, data_dir, reddit, *fetch_args):
+    """
+    Fetch the late comments on one team's stored game threads for each date:
+    only comments at or after the newest stored one per game. The threads come
+    from the stored posts, so nothing is re-discovered.
+
+    Returns:
+        list: ``(date, comments, reason)`` per date; ``reason`` is a message
+        when nothing is stored, or the exception that date raised.
+    """
+    comments_limit, fetch_mode, more_requests, more_seconds = fetch_args
+    results = []
+    for date in dates:
+        try:
+            day = datetime.strptime(date, "%m/%d/%Y").date()
+            for kind in ("posts", "comments"):
+                restore_day(data_dir, team_acronym, kind, day)
+            base = _output_base(data_dir, team_acronym, date)
+            posts = load_reddit_posts(base)
+            if not posts:
+                reason = f"No stored threads for {team_acronym} on {date}."
+                results.append((date, None, reason))
+                continue
+            comments = fetch_reddit_comments(
+                posts,
+                limit=comments_limit,
+                sentiment_model=None,
+                mode=fetch_mode,
+                more_requests=more_requests,
+                more_seconds=more_seconds,
+                reddit=reddit,
+                since_utc=latest_comment_utc(base),
+            )
+            results.append((date, comments, None))
+        except Exception as e:  # noqa: BLE001 - one date must not sink the rest
+            results.append((date, None, e))
+    return results
+
+
+@cli.command("refresh-recent")
+@team_pool_options
+@click.option(
+    "--days",
+    default=3,
+    show_default=True,
+    help="Revisit game threads from this many days ending at --date.",
+)
+@click.option(
+    "--date",
+    default=None,
+    help="Last date to refresh (MM/DD/YYYY; default: today).",
+)
+@click.option(
+    "--comments-limit",
+    default=0,
+    show_default=True,
+    help="Max number of Reddit comments to read per thread (0 = all).",
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory for per-team Parquet output.",
+)
+@comment_fetch_options
+@scoring_options
+@click.option(
+    "--store-raw",
+    is_flag=True,
+    help="Also store new comments' bodies as fetched (see `upload --help`).",
+)
+def refresh_recent(
+    teams,
+    days,
+    date,
+    comments_limit,
+    data_dir,
+    sentiment_model,
+    fetch_mode,
+    more_requests,
+    more_seconds,
+    batch_size,
+    score_workers,
+    sentiment_cache,
+    sentiment_backend,
+    store_raw,
+    workers,
+):
+    """
+    Pick up comments posted after the last run on recently finished game
+    threads. Threads are read from the stored posts; per game only comments
+    at or after the newest stored one are fetched, scored and merged into the
+    day's comments. Games, events and posts are left untouched.
+    """
+    end_dt = datetime.strptime(date, "%m/%d/%Y") if date else datetime.now()
+    dates = [
+        (end_dt - timedelta(days=i)).strftime("%m/%d/%Y")
+        for i in reversed(range(max(1, days)))
+    ]
+    team_list = _parse_teams(teams)
+    model = get_model_from_string(sentiment_model)
+    configure_sentiment_cache(path=sentiment_cache)
+    set_backend(sentiment_backend, config.ONNX_DIR)
+    configure_scoring_pool(workers=score_workers)
+    click.echo(
+        f"Refreshing {len(team_list)} team(s) for {dates[0]} - {dates[-1]} "
+        f"under {data_dir}/"
+    )
+
+    added, failed = 0, []
+
+    def fetch(team):
+        return _refresh_team_days(
+            team,
+            dates,
+            data_dir,
+            _thread_reddit_client(),
+            comments_limit,
+            fetch_mode,
+            more_requests,
+            more_seconds,
+        )
+
+    for team, day, comments, _ in _each_team_day(team_list, workers, fetch, failed):
+        if comments is None:
+            continue
+        try:
+            base = _output_base(data_dir, team, day)
+            comments = comment_delta(comments, base)
+            if not comments:
+                continue
+            score_comments(comments, model, batch_size=batch_size)
+            save_reddit_comments(
+                comments, filename=base, merge=True, store_raw=store_raw
+            )
+            added += len(comments)
+        except Exception as e:  # noqa: BLE001
+            click.echo(f"{team} {day}: failed ({e})")
+            failed.append(f"{team} {day}")
+
+    click.echo(f"Merged {added} new or edited comment(s).")
+    _echo_sentiment_cache()
+    _echo_request_report()
+    if failed:
+        raise click.ClickException(f"{len(failed)} team/date(s) failed to refresh.")
+
+
+@cli.command()
+@click.option(
+    "--team", "team_acronym", required=True, help="Team to follow (e.g. NYM)."
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory; segments go under DATA_DIR/live/<TEAM>/.",
+)
+@click.option(
+    "--sentiment-model",
+    default="null",
+    show_default=True,
+    type=click.Choice(SENTIMENT_MODEL_CHOICES),
+    help="Sentiment analysis model to use for Reddit comments.",
+)
+@click.option(
+    "--flush-seconds",
+    default=30.0,
+    show_default=True,
+    help="Write a segment once the oldest buffered comment is this old.",
+)
+@click.option(
+    "--flush-comments",
+    default=200,
+    show_default=True,
+    help="Write a segment once this many comments are buffered.",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Comments per sentiment-model forward pass.",
+)
+@click.option(
+    "--status-seconds",
+    default=120.0,
+    show_default=True,
+    help="How often to check whether the game is over.",
+)
+def live(
+    team_acronym,
+    data_dir,
+    sentiment_model,
+    flush_seconds,
+    flush_comments,
+    batch_size,
+    status_seconds,
+):
+    """
+    Follow today's game thread while the game is on, scoring comments in
+    micro-batches and writing rolling Parquet segments until it ends. Refresh
+    the dashboard's series for the game with
+    ``pipeline/build_site_data.py --live``.
+    """
+    team_acronym = team_acronym.upper()
+    # Game days are Eastern calendar days (a late game runs past UTC midnight).
+    today = datetime.strptime(utility.utc_to_est(time.time()), utility.EST_FORMAT)
+    reddit = config.load_reddit_client()
+    posts = fetch_reddit_posts(
+        team_acronym, date=today.strftime("%m/%d/%Y"), reddit=reddit
+    )
+    # Posts carry team-prefixed game ids; statsapi and segment names use the
+    # raw gamePk. In a doubleheader, follow the first game still on.
+    games = [
+        (post, info.get_game_pk_from_game_id(post["game_id"]))
+        for post in posts
+        if post.get("game_id")
+    ]
+    games = [(post, game_pk) for post, game_pk in games if not game_finished(game_pk)]
+    if not games:
+        click.echo(f"No active game thread for {team_acronym} today. Exiting.")
+        return
+    post, game_pk = games[0]
+    writer = SegmentWriter(
+        data_dir,
+        team_acronym,
+        today.date(),
+        game_pk,
+        get_model_from_string(sentiment_model),
+        flush_seconds=flush_seconds,
+        flush_comments=flush_comments,
+        batch_size=batch_size,
+    )
+    click.echo(f"Following {post['url']} (game {game_pk}); Ctrl-C to stop.")
+    try:
+        stats = follow_game(
+            reddit, post, team_acronym, writer, status_seconds=status_seconds
+        )
+    except KeyboardInterrupt:
+        stats = writer.stats
+    click.echo(
+        f"Wrote {stats['comments']} comment(s) in {stats['segments']} segment(s)."
+    )
+
+
+@cli.command("bench-fetch")
+@click.option(
+    "--cassette",
+    required=True,
+    help="Cassette recorded with REDDIT_CASSETTE_MODE=record.",
+)
+@click.option("--team-acronym", required=True, help="Team the cassette covers.")
+@click.option("--date", required=True, help="Date the cassette covers (MM/DD/YYYY).")
+@click.option(
+    "--archive-dir",
+    default=config.ARCHIVE_DIR,
+    help="Raw Stats API archive for the date, so game ids need no network "
+    "(default: $MLB_ARCHIVE_DIR, else statsapi is called).",
+)
+@click.option(
+    "--comments-limit",
+    default=5,
+    show_default=True,
+    help="Max number of Reddit comments per thread (0 = all); match the recording.",
+)
+@click.option(
+    "--fetch-mode",
+    default="single",
+    show_default=True,
+    type=click.Choice(["single", "sorts"]),
+    help="Comment fetch mode; match the recording.",
+)
+@click.option(
+    "--more-requests",
+    default=32,
+    show_default=True,
+    help="Max MoreComments expansion requests per thread (single mode).",
+)
+@click.option("--repeat", default=5, show_default=True, help="Timed replays.")
+def bench_fetch(
+    cassette,
+    team_acronym,
+    date,
+    archive_dir,
+    comments_limit,
+    fetch_mode,
+    more_requests,
+    repeat,
+):
+    """
+    Replay a recorded Reddit cassette through fetch_reddit_posts and
+    fetch_reddit_comments with no network, and report their timings.
+    Comments are fetched unscored, so only the fetch path is measured.
+    """
+    context = (
+        load_game_context(archive_dir, team_acronym, date) if archive_dir else None
+    )
+    timings = {"posts": [], "comments": []}
+    for _ in range(max(1, repeat)):
+        reddit = config.load_reddit_client(cassette=cassette, cassette_mode="replay")
+        start = time.perf_counter()
+        posts = fetch_reddit_posts(
+            team_acronym, date=date, reddit=reddit, context=context
+        )
+        timings["posts"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        comments = fetch_reddit_comments(
+            posts,
+            limit=comments_limit,
+            sentiment_model=None,
+            mode=fetch_mode,
+            more_requests=more_requests,
+            more_seconds=None,  # a wall-clock budget would make replays differ
+            reddit=reddit,
+        )
+        timings["comments"].append(time.perf_counter() - start)
+    click.echo(f"{len(posts)} post(s), {len(comments)} comment(s) per replay")
+    for stage, seconds in timings.items():
+        seconds = sorted(seconds)
+        click.echo(
+            f"{stage + ':':20} min {seconds[0] * 1000:.1f} ms, "
+            f"median {seconds[len(seconds) // 2] * 1000:.1f} ms over {len(seconds)}"
+        )
+
+
+def _stored_texts(data_dir, n):
+    """Up to ``n`` stored comment texts under ``data_dir``, newest files first."""
+    paths = sorted(
+        (
+            os.path.join(root, name)
+            for root, _, names in os.walk(data_dir)
+            for name in names
+            if name.endswith("_comments.parquet")
+        ),
+        reverse=True,
+    )
+    texts = []
+    for path in paths:
+        texts.extend(pq.read_table(path, columns=["text"])["text"].to_pylist())
+        if len(texts) >= n:
+            break
+    return [t for t in texts if t][:n]
+
+
+@cli.command("export-onnx")
+@click.option(
+    "--sentiment-model",
+    "models",
+    multiple=True,
+    type=click.Choice(SENTIMENT_MODEL_CHOICES[1:3]),
+    help="Model to export (repeatable; default: both Hugging Face models).",
+)
+@click.option(
+    "--onnx-dir",
+    default=config.ONNX_DIR,
+    help="Root folder of the exports (default: $MLB_ONNX_DIR, else "
+    "~/.cache/mlb-sentiment/onnx).",
+)
+@click.option(
+    "--check",
+    default=1000,
+    show_default=True,
+    help="Stored comments scored by both backends to compare labels and "
+    "throughput (0 = skip).",
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory of per-team Parquet the check comments come from.",
+)
+@click.option(
+    "--min-agreement",
+    default=0.97,
+    show_default=True,
+    help="Fail when fewer labels than this share match the torch model.",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Comments per forward pass in the check.",
+)
+def export_onnx(models, onnx_dir, check, data_dir, min_agreement, batch_size):
+    """
+    Export the Hugging Face models to ONNX with dynamic int8 quantization for
+    ``--sentiment-backend onnx``, then check the export against the torch
+    model on stored comments: label agreement and texts per second.
+    """
+    from mlb_sentiment.models.onnx_backend import compare, export_model
+
+    texts = _stored_texts(data_dir, check) if check > 0 else []
+    if check > 0 and not texts:
+        click.echo(f"No stored comments under {data_dir}/; skipping the check.")
+    failed = []
+    for name in models or SENTIMENT_MODEL_CHOICES[1:3]:
+        model = get_model_from_string(name)
+        path = export_model(model.value, onnx_dir)
+        click.echo(f"Exported {model.value} to {path}/")
+        if not texts:
+            continue
+        report = compare(model.value, texts, onnx_dir, batch_size=batch_size)
+        click.echo(f"{'Agreement:':20} {report['agreement']:.2%} of {report['texts']}")
+        click.echo(f"{'Max score diff:':20} {report['max_score_diff']:.4f}")
+        click.echo(
+            f"{'Throughput:':20} torch {report['torch_per_second']:.0f}/s, "
+            f"onnx int8 {report['onnx_per_second']:.0f}/s "
+            f"({report['onnx_per_second'] / report['torch_per_second']:.1f}x)"
+        )
+        for text, expected, actual in report["disagreements"]:
+            click.echo(f"  {expected} -> {actual}: {text[:70]!r}")
+        if report["agreement"] < min_agreement:
+            failed.append(name)
+    if failed:
+        raise click.ClickException(
+            f"Label agreement below {min_agreement:.0%} for: {', '.join(failed)}"
+        )
+
+
+@cli.command("score-server")
+@click.option(
+    "--sentiment-model",
+    "models",
+    multiple=True,
+    required=True,
+    type=click.Choice(SENTIMENT_MODEL_CHOICES[:3]),
+    help="Model to load at start and keep warm (repeatable).",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    default=default_socket_path(),
+    show_default=True,
+    help="Unix socket to listen on ($MLB_SCORE_SOCKET; clients use the same).",
+)
+@click.option(
+    "--score-workers",
+    default=1,
+    show_default=True,
+    help="Worker processes scoring each model (1 = score in this process).",
+)
+@click.option(
+    "--sentiment-cache",
+    default=config.SENTIMENT_CACHE,
+    help="SQLite sentiment cache (see `upload --help`).",
+)
+@click.option(
+    "--sentiment-backend",
+    default=config.SENTIMENT_BACKEND,
+    show_default=True,
+    type=click.Choice(HUGGING_FACE_BACKENDS),
+    help="Hugging Face model backend (see `upload --help`).",
+)
+@click.option(
+    "--max-batch",
+    default=1024,
+    show_default=True,
+    help="Texts per coalesced scoring call.",
+)
+@click.option(
+    "--max-wait-ms",
+    default=5.0,
+    show_default=True,
+    help="Milliseconds a request waits for others to join its scoring call.",
+)
+def score_server(
+    models,
+    socket_path,
+    score_workers,
+    sentiment_cache,
+    sentiment_backend,
+    max_batch,
+    max_wait_ms,
+):
+    """
+    Keep sentiment models loaded and score batches for local processes over
+    a Unix socket until interrupted. While it runs, ``upload``, ``upload-all``
+    and ``refresh-recent`` send their comments to it instead of loading the
+    model themselves; concurrent requests share scoring calls.
+    """
+    configure_scoring_client(enabled=False)  # this process does the scoring
+    configure_sentiment_cache(path=sentiment_cache)
+    set_backend(sentiment_backend, config.ONNX_DIR)
+    configure_scoring_pool(workers=score_workers)
+    click.echo(f"Loading {', '.join(models)} ...")
+    try:
+        server = ScoringServer(
+            socket_path,
+            models=[get_model_from_string(name) for name in models],
+            max_batch=max_batch,
+            max_wait=max_wait_ms / 1000,
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Scoring on {server.path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        configure_scoring_pool(workers=1)
+    click.echo(json.dumps(server.stats(), indent=2))
+
+
+def _stub_options(f):
+    """Options shared by the commands that run the local API stand-in."""
+    options = [
+        click.option(
+            "--date",
+            default="06/15/2025",
+            show_default=True,
+            help="Last night the synthetic league plays (MM/DD/YYYY).",
+        ),
+        click.option(
+            "--days", default=1, show_default=True, help="Nights ending at --date."
+        ),
+        click.option(
+            "--comments",
+            default=5000,
+            show_default=True,
+            help="Comments per synthetic game thread.",
+        ),
+        click.option(
+            "--max-depth",
+            default=10,
+            show_default=True,
+            help="Reply depth served before 'continue this thread' stubs.",
+        ),
+        click.option("--seed", default=0, show_default=True, help="Data seed."),
+    ]
+    return _apply_options(f, options)
+
+
+def _stub_dates(date, days):
+    end_dt = datetime.strptime(date, "%m/%d/%Y")
+    return [
+        (end_dt - timedelta(days=i)).strftime("%m/%d/%Y")
+        for i in reversed(range(max(1, days)))
+    ]
+
+
+@cli.command("stub-server")
+@_stub_options
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8765, show_default=True)
+def stub_server(date, days, comments, max_depth, seed, host, port):
+    """
+    Serve synthetic Reddit and Stats API data locally (see
+    ``mlb_sentiment.stub_server``) until interrupted.
+    """
+    league = SyntheticLeague(
+        _stub_dates(date, days), comments=comments, max_depth=max_depth, seed=seed
+    )
+    server = StubServer(league, host=host, port=port)
+    click.echo("Point the fetchers at the stub with:")
+    click.echo(f"  export REDDIT_BASE_URL={server.url}")
+    click.echo(f"  export MLB_STATSAPI_URL={server.statsapi_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    click.echo(json.dumps(server.stats(), indent=2))
+
+
+@cli.command("load-test")
+@_stub_options
+@click.option(
+    "--teams",
+    multiple=True,
+    help="Team acronyms to upload (repeatable or comma-separated; default: all "
+    "processed teams).",
+)
+@click.option(
+    "--data-dir",
+    default=None,
+    help="Where to write Parquet (default: a temporary directory, removed after).",
+)
+@click.option(
+    "--sentiment-model",
+    default="null",
+    show_default=True,
+    type=click.Choice(SENTIMENT_MODEL_CHOICES),
+    help="Sentiment analysis model to use for Reddit comments.",
+)
+@click.option(
+    "--more-requests",
+    default=None,
+    type=int,
+    help="Max MoreComments expansion requests per thread (default: no cap).",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Comments per sentiment-model forward pass.",
+)
+@click.option(
+    "--score-workers",
+    default=1,
+    show_default=True,
+    help="Worker processes scoring comments (1 = score in this process).",
+)
+@click.option(
+    "--throttle",
+    is_flag=True,
+    help="Keep the production rate limits (by default the scheduler is unthrottled, "
+    "so the run measures the pipeline rather than the limits).",
+)
+@click.pass_context
+def load_test(
+    ctx,
+    date,
+    days,
+    comments,
+    max_depth,
+    seed,
+    teams,
+    data_dir,
+    sentiment_model,
+    more_requests,
+    batch_size,
+    score_workers,
+    throttle,
+):
+    """
+    Run ``upload`` for every team on a synthetic league night served by a
+    local stub in a child process, then report wall time, comment throughput,
+    peak RSS of this process and the API calls the stub served.
+    """
+    team_list = _parse_teams(teams)
+    if not throttle:
+        configure_scheduler(limits={name: (1e6, 1e6, 64) for name in DEFAULT_LIMITS})
+    process, url = spawn_stub_server(
+        dates=_stub_dates(date, days), comments=comments, max_depth=max_depth, seed=seed
+    )
+    config.REDDIT_BASE_URL = url
+    config.use_statsapi_url(url + STATSAPI_PREFIX)
+    out_dir = data_dir or tempfile.mkdtemp(prefix="mlb-sentiment-load-")
+    timings = []
+    try:
+        start = time.perf_counter()
+        for day in _stub_dates(date, days):
+            for team in team_list:
+                team_start = time.perf_counter()
+                ctx.invoke(
+                    upload,
+                    team_acronym=team,
+                    date=day,
+                    comments_limit=0,
+                    yesterday=False,
+                    data_dir=out_dir,
+                    sentiment_model=sentiment_model,
+                    fetch_mode="single",
+                    more_requests=more_requests,
+                    more_seconds=None,
+                    batch_size=batch_size,
+                    score_workers=score_workers,
+                    sentiment_cache=None,
+                    sentiment_backend=config.SENTIMENT_BACKEND,
+                    feed_cache_dir=None,
+                    archive_dir=None,
+                    merge=False,
+                    store_raw=False,
+                )
+                timings.append((f"{team} {day}", time.perf_counter() - team_start))
+        elapsed = time.perf_counter() - start
+        stub_stats = requests.get(url + "/__stats", timeout=10).json()
+        written = sum(
+            pq.read_metadata(os.path.join(root, name)).num_rows
+            for root, _, names in os.walk(out_dir)
+            for name in names
+            if name.endswith("_comments.parquet")
+        )
+    finally:
+        process.terminate()
+        config.REDDIT_BASE_URL = None
+        config.use_statsapi_url(None)
+        if data_dir is None:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    import resource  # POSIX only; ru_maxrss is in KiB on Linux
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    slowest = max(timings, key=lambda t: t[1])
+    click.echo("\n" + "=" * 60)
+    click.echo(f"{'Uploads:':20} {len(timings)} in {elapsed:.1f}s")
+    click.echo(f"{'Slowest:':20} {slowest[0]} ({slowest[1]:.1f}s)")
+    click.echo(f"{'Comments written:':20} {written} ({written / elapsed:.0f}/s)")
+    click.echo(f"{'Peak RSS:':20} {peak_mb:.0f} MiB")
+    total = sum(stub_stats["requests"].values())
+    click.echo(
+        f"{'API calls served:':20} {total} "
+        f"({stub_stats['bytes'] / 2**20:.1f} MiB of responses)"
+    )
+    for endpoint, calls in stub_stats["requests"].items():
+        click.echo(f"  {endpoint + ':':22} {calls}")
+    _echo_request_report()
+
+
+@cli.command()
+@click.option(
+    "--teams",
+    multiple=True,
+    help="Team acronyms to rebuild (repeatable or comma-separated; default: all processed teams).",
+)
+@click.option("--start", required=True, help="First date to rebuild (MM/DD/YYYY).")
+@click.option(
+    "--end", default=None, help="Last date to rebuild (MM/DD/YYYY; default: --start)."
+)
+@click.option(
+    "--archive-dir",
+    default=config.ARCHIVE_DIR,
+    required=config.ARCHIVE_DIR is None,
+    help="Raw Stats API archive written by upload --archive-dir "
+    "(default: $MLB_ARCHIVE_DIR).",
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory for per-team Parquet output.",
+)
+@click.option(
+    "--workers",
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Team/date files rebuilt in parallel (processes).",
+)
+def reprocess(teams, start, end, archive_dir, data_dir, workers):
+    """
+    Regenerate ``*_games.parquet`` and ``*_game_events.parquet`` from the raw
+    Stats API archive, with no network access. Comments and posts are left
+    untouched.
+    """
+    pairs = archived_team_days(archive_dir, _parse_teams(teams), start, end or start)
+    if not pairs:
+        click.echo(f"No archived schedules under {archive_dir} for that range.")
+        return
+
+    click.echo(f"Rebuilding {len(pairs)} team/date file set(s) from {archive_dir}/")
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(reprocess_team_day, archive_dir, data_dir, team, date): (
+                team,
+                date,
+            )
+            for team, date in pairs
+        }
+        for future in as_completed(futures):
+            team, date = futures[future]
+            try:
+                n_games, n_events = future.result()
+                click.echo(f"{team} {date}: {n_games} games, {n_events} events")
+            except Exception as e:  # noqa: BLE001 - report and keep going
+                click.echo(f"{team} {date}: failed ({e})")
+                failed.append(f"{team} {date}")
+    if failed:
+        raise click.ClickException(f"{len(failed)} file set(s) failed to rebuild.")
+
+
+@cli.command()
+@click.option(
+    "--model",
+    "--sentiment-model",
+    "sentiment_model",
+    required=True,
+    type=click.Choice(SENTIMENT_MODEL_CHOICES[:3]),
+    help="Sentiment model to score the stored comments with.",
+)
+@click.option(
+    "--teams",
+    multiple=True,
+    help="Team acronyms to score (repeatable or comma-separated; default: all processed teams).",
+)
+@click.option(
+    "--since",
+    default=None,
+    help="First date to score (MM/DD/YYYY; default: everything stored).",
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory of per-team Parquet to score in place.",
+)
+@click.option(
+    "--set-primary",
+    is_flag=True,
+    help="Also copy the results into sentiment / sentiment_score, the columns "
+    "the dashboard reads.",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Comments per sentiment-model forward pass.",
+)
+@click.option(
+    "--sentiment-cache",
+    default=config.SENTIMENT_CACHE,
+    help="SQLite sentiment cache (see `upload --help`).",
+)
+@click.option(
+    "--sentiment-backend",
+    default=config.SENTIMENT_BACKEND,
+    show_default=True,
+    type=click.Choice(HUGGING_FACE_BACKENDS),
+    help="Hugging Face model backend (see `upload --help`).",
+)
+@click.option(
+    "--workers",
+    default=2,
+    show_default=True,
+    help="Files scored in parallel (processes, each with the model loaded once).",
+)
+def score(
+    sentiment_model,
+    teams,
+    since,
+    data_dir,
+    set_primary,
+    batch_size,
+    sentiment_cache,
+    sentiment_backend,
+    workers,
+):
+    """
+    Score stored comments with a model, without fetching anything. Only rows
+    with no result for the model's current revision are scored; results are
+    written to model-tagged columns (``sentiment_<tag>``,
+    ``sentiment_score_<tag>``, ``sentiment_revision_<tag>``) of the daily
+    files and compacted partitions, in place.
+    """
+    model = get_model_from_string(sentiment_model)
+    since_day = datetime.strptime(since, "%m/%d/%Y").date() if since else None
+    paths = comment_files(data_dir, _parse_teams(teams), since_day)
+    if not paths:
+        click.echo(f"No stored comments under {data_dir}/ for those teams.")
+        return
+
+    workers = max(1, min(workers, len(paths)))
+    click.echo(f"Scoring {len(paths)} file(s) with {sentiment_model}")
+    scored, total, failed = 0, 0, []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(
+            model.value,
+            max(1, (os.cpu_count() or 1) // workers),
+            (sentiment_backend, config.ONNX_DIR),
+            sentiment_cache,
+        ),
+    ) as pool:
+        futures = {
+            pool.submit(
+                score_file, path, model, batch_size, since_day, set_primary
+            ): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = os.path.relpath(futures[future], data_dir)
+            try:
+                n_scored, n_rows = future.result()
+            except Exception as e:  # noqa: BLE001 - report and keep going
+                click.echo(f"{path}: failed ({e})")
+                failed.append(path)
+                continue
+            scored += n_scored
+            total += n_rows
+            if n_scored:
+                click.echo(f"{path}: scored {n_scored} of {n_rows}")
+    click.echo(f"Scored {scored} of {total} stored comment(s).")
+    if failed:
+        raise click.ClickException(f"{len(failed)} file(s) failed to score.")
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory of per-team Parquet to upgrade in place.",
+)
+@click.option(
+    "--workers",
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Files rewritten in parallel (processes).",
+)
+def migrate(data_dir, workers):
+    """
+    Upgrade every Parquet file under the data directory to the current schema
+    version (v2: UTC timestamp columns; v3: Reddit comment ids; v4: the
+    model behind ``sentiment`` and optional raw comment text). Files already
+    current are left alone, so it is safe to re-run. Compacted partitions are
+    upgraded by ``compact`` itself.
+    """
+    compacted = os.path.join(data_dir, COMPACTED_DIR)
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(data_dir)
+        if not root.startswith(compacted)
+        for name in names
+        if name.endswith(".parquet")
+    )
+    if not paths:
+        click.echo(f"No Parquet files under {data_dir}/.")
+        return
+
+    click.echo(f"Upgrading {len(paths)} file(s) under {data_dir}/ to v{SCHEMA_VERSION}")
+    rewritten, failed = 0, []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(migrate_file, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                rewritten += int(future.result())
+            except Exception as e:  # noqa: BLE001 - report and keep going
+                click.echo(f"{futures[future]}: failed ({e})")
+                failed.append(futures[future])
+    click.echo(
+        f"Rewrote {rewritten} file(s); {len(paths) - rewritten - len(failed)} already current."
+    )
+    if failed:
+        raise click.ClickException(f"{len(failed)} file(s) failed to migrate.")
+
+
+@cli.command()
+@click.option(
+    "--teams",
+    multiple=True,
+    help="Team acronyms to compact (repeatable or comma-separated; default: all processed teams).",
+)
+@click.option(
+    "--data-dir",
+    default="data",
+    show_default=True,
+    help="Root directory for per-team Parquet output.",
+)
+@click.option(
+    "--hot-days",
+    default=7,
+    show_default=True,
+    help="Daily files from the last N days stay uncompacted (the hot tier).",
+)
+@click.option(
+    "--workers",
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Teams compacted in parallel (processes).",
+)
+def compact(teams, data_dir, hot_days, workers):
+    """
+    Fold daily Parquet files older than the hot window into month partitions
+    under DATA_DIR/compacted/<kind>/team=/season=/month=, then delete them.
+    Safe to re-run; re-fetched days replace their compacted rows.
+    """
+    before = (datetime.now() - timedelta(days=hot_days)).date()
+    team_list = _parse_teams(teams)
+    click.echo(
+        f"Compacting daily files before {before:%Y-%m-%d} for {len(team_list)} "
+        f"team(s) into {os.path.join(data_dir, COMPACTED_DIR)}/"
+    )
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(compact_team, data_dir, team, before): team
+            for team in team_list
+        }
+        for future in as_completed(futures):
+            team = futures[future]
+            try:
+                n_files, n_partitions = future.result()
+                if n_files:
+                    click.echo(
+                        f"{team}: folded {n_files} file(s) into {n_partitions} partition(s)"
+                    )
+            except Exception as e:  # noqa: BLE001 - report and keep going
+                click.echo(f"{team}: failed ({e})")
+                failed.append(team)
+    if failed:
+        raise click.ClickException(f"{len(failed)} team(s) failed to compact.")
+
+
+@cli.command("refresh-teams")
+def refresh_teams():
+    """
+    Regenerate the bundled team registry (ids, names, abbreviations) from the
+    Stats API. Run after a club is renamed or relocated and commit the result.
+    """
+    registry = info.refresh_team_registry()
+    click.echo(
+        f"Wrote {len(registry['teams'])} teams to {info.REGISTRY_PATH} "
+        f"(registry version {registry['version']})."
+    )
 
 
 if __name__ == "__main__":
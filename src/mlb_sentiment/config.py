@@ -1,6 +1,10 @@
 import os
 from dotenv import load_dotenv
 import praw
+import prawcore
+import statsapi
+
+from mlb_sentiment.scheduler import RateLimitedRequestor
 
 load_dotenv()
 
@@ -8,10 +12,97 @@ REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
 
+# Optional on-disk tier for finished games' statsapi live feeds.
+FEED_CACHE_DIR = os.getenv("MLB_FEED_CACHE_DIR")
+
+# Optional SQLite file caching sentiment results across runs (models/cache.py
+# reads it directly, so scoring does not import this module).
+SENTIMENT_CACHE = os.getenv("MLB_SENTIMENT_CACHE")
+
+# How the Hugging Face models run ("torch" or "onnx") and where the ONNX
+# exports are kept (models/process.py reads these directly as well).
+SENTIMENT_BACKEND = os.getenv("MLB_SENTIMENT_BACKEND", "torch")
+ONNX_DIR = os.getenv("MLB_ONNX_DIR")
+
+# Optional raw Stats API archive (zstd JSON) read by `mlb-sentiment reprocess`.
+ARCHIVE_DIR = os.getenv("MLB_ARCHIVE_DIR")
+
+# Optional Reddit traffic cassette: "record" captures every exchange to
+# REDDIT_CASSETTE, "replay" serves them back with no network or credentials.
+REDDIT_CASSETTE = os.getenv("REDDIT_CASSETTE")
+REDDIT_CASSETTE_MODE = os.getenv("REDDIT_CASSETTE_MODE", "replay")
+
+# Optional stand-ins for the live APIs (e.g. ``mlb_sentiment.stub_server``):
+# REDDIT_BASE_URL serves both OAuth tokens and API calls; MLB_STATSAPI_URL
+# replaces "https://statsapi.mlb.com/api/".
+REDDIT_BASE_URL = os.getenv("REDDIT_BASE_URL")
+MLB_STATSAPI_URL = os.getenv("MLB_STATSAPI_URL")
+
+STATSAPI_DEFAULT_URL = "https://statsapi.mlb.com/api/"
+_statsapi_url = STATSAPI_DEFAULT_URL
+
+
+def use_statsapi_url(base_url=None):
+    """
+    Point every statsapi endpoint at ``base_url`` (None restores the live
+    API). statsapi builds its endpoint URLs at import, so they are rewritten
+    in place.
+    """
+    global _statsapi_url
+    base_url = base_url or STATSAPI_DEFAULT_URL
+    if not base_url.endswith("/"):
+        base_url += "/"
+    for endpoint in statsapi.endpoints.ENDPOINTS.values():
+        if endpoint["url"].startswith(_statsapi_url):
+            endpoint["url"] = base_url + endpoint["url"][len(_statsapi_url) :]
+    statsapi.BASE_URL = statsapi.endpoints.BASE_URL = base_url
+    _statsapi_url = base_url
+
+
+if MLB_STATSAPI_URL:
+    use_statsapi_url(MLB_STATSAPI_URL)
+
+
+def load_reddit_client(cassette=None, cassette_mode=None):
+    """
+    Build the PRAW client. Every live request goes through the shared
+    rate-limit-aware scheduler. With ``REDDIT_BASE_URL`` set, requests go to
+    that server instead of Reddit, and placeholder credentials are used.
+
+    Args:
+        cassette (str, optional): Cassette path (default: $REDDIT_CASSETTE).
+        cassette_mode (str, optional): "record" or "replay"
+            (default: $REDDIT_CASSETTE_MODE, else "replay").
+    """
+    cassette = cassette or REDDIT_CASSETTE
+    mode = cassette_mode or REDDIT_CASSETTE_MODE
+    replay = bool(cassette) and mode == "replay"
+    urls = {}
+    if REDDIT_BASE_URL:
+        urls = {"oauth_url": REDDIT_BASE_URL, "reddit_url": REDDIT_BASE_URL}
+    # Replays and stand-in servers need no credentials; recorded tokens are
+    # redacted anyway.
+    placeholder = "replay" if replay else ("stub" if REDDIT_BASE_URL else None)
+    client_id = REDDIT_CLIENT_ID or placeholder
+    client_secret = REDDIT_SECRET or placeholder
+    user_agent = REDDIT_USER_AGENT or (placeholder and f"mlb-sentiment {placeholder}")
+    if not cassette:
+        return praw.Reddit(
+            client_id=client_id,
+            client_secret=client_secret,
+            user_agent=user_agent,
+            requestor_class=RateLimitedRequestor,
+            **urls,
+        )
+    # Imported here: the cassette module reuses archive.py, which imports this one.
+    from mlb_sentiment.cassette import cassette_session
 
-def load_reddit_client():
     return praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_SECRET,
-        user_agent=REDDIT_USER_AGENT,
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent,
+        # Replays are not throttled, so they measure the fetch path itself.
+        requestor_class=prawcore.Requestor if replay else RateLimitedRequestor,
+        requestor_kwargs={"session": cassette_session(cassette, mode)},
+        **urls,
     )
@@ -0,0 +1,160 @@
+"""Compaction of the daily per-team Parquet files into partitioned datasets.
+
+``upload`` writes four small files per team per day under ``<data>/<TEAM>/``.
+Those daily files are the *hot* tier: cheap to write and to overwrite when a
+day is re-fetched. ``compact`` folds the ones older than the hot window into
+one file per kind, team and month (the *cold* tier)::
+
+    <data>/compacted/<kind>/team=<TEAM>/season=<YYYY>/month=<MM>/part-0.parquet
+
+Compacted rows keep the day they came from in a ``day`` column and are sorted
+by time, so row-group statistics stay selective. Folding a day that is already
+in a partition replaces its rows, which makes compaction idempotent, and
+readers skip cold rows for any day that also has a hot file.
+"""
+
+import os
+import re
+from collections import defaultdict
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from mlb_sentiment.database.schema import (
+    SCHEMA_VERSION,
+    build_table,
+    concat_tables,
+    schema_version,
+    upgrade_frame,
+    write_table,
+)
+
+COMPACTED_DIR = "compacted"
+
+_DAILY_FILE = re.compile(
+    r"_(\d{4})-(\d{2})-(\d{2})_(game_events|games|comments|posts)\.parquet$"
+)
+
+# Row order inside a partition: time first so min/max statistics prune well.
+_SORT_KEYS = {
+    "comments": ["created_utc", "id"],
+    "posts": ["created_utc", "id"],
+    "game_events": ["utc", "event_id"],
+    "games": ["day", "game_start_time_est", "game_id"],
+}
+
+
+def partition_path(data_dir, kind, team_acronym, day):
+    """Return the compacted file holding ``day`` for a team and file kind."""
+    return os.path.join(
+        data_dir,
+        COMPACTED_DIR,
+        kind,
+        f"team={team_acronym}",
+        f"season={day.year}",
+        f"month={day.month:02d}",
+        "part-0.parquet",
+    )
+
+
+def daily_files(data_dir, team_acronym, before=None):
+    """
+    List a team's daily (hot) files as (day, kind, path), oldest first.
+
+    Args:
+        before (datetime.date): Only include days strictly before this date.
+    """
+    team_dir = os.path.join(data_dir, team_acronym)
+    if not os.path.isdir(team_dir):
+        return []
+    files = []
+    for name in os.listdir(team_dir):
+        match = _DAILY_FILE.search(name)
+        if not match:
+            continue
+        day = date(*(int(part) for part in match.groups()[:3]))
+        if before is None or day < before:
+            files.append((day, match.group(4), os.path.join(team_dir, name)))
+    return sorted(files)
+
+
+def _read_daily(path, kind, day):
+    """Read one daily file (v1 or v2) as a table in the compacted layout."""
+    if schema_version(path) < SCHEMA_VERSION:
+        source = upgrade_frame(pd.read_parquet(path), kind)
+    else:
+        source = pq.read_table(path)
+    table = build_table(kind, source)
+    return table.append_column("day", pa.array([day] * table.num_rows, pa.date32()))
+
+
+def _read_partition(path, kind):
+    """Read a partition file in the current schema (plus its ``day`` column)."""
+    if schema_version(path) >= SCHEMA_VERSION:
+        return pq.read_table(path)
+    df = pd.read_parquet(path)
+    days = pa.array(df.pop("day"), pa.date32())
+    return build_table(kind, upgrade_frame(df, kind)).append_column("day", days)
+
+
+def _fold(path, kind, days):
+    """Merge daily files into one partition file, replacing rows for their days."""
+    tables = [_read_daily(daily, kind, day) for day, daily in days]
+    if os.path.exists(path):
+        existing = _read_partition(path, kind)
+        refreshed = pa.array(sorted({day for day, _ in days}), pa.date32())
+        keep = pc.invert(pc.is_in(existing["day"], value_set=refreshed))
+        tables.insert(0, existing.filter(keep))
+    table = concat_tables(tables)
+    table = table.sort_by([(key, "ascending") for key in _SORT_KEYS[kind]])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_table(table, path)
+
+
+def compact_team(data_dir, team_acronym, before):
+    """
+    Fold a team's daily files dated before ``before`` into the compacted
+    dataset, then delete them.
+
+    Returns:
+        tuple: (daily files folded, partition files written).
+    """
+    partitions = defaultdict(list)
+    for day, kind, path in daily_files(data_dir, team_acronym, before):
+        target = partition_path(data_dir, kind, team_acronym, day)
+        partitions[(target, kind)].append((day, path))
+
+    for (target, kind), days in sorted(partitions.items()):
+        _fold(target, kind, days)
+        # Only drop the hot files once their partition is safely replaced.
+        for _, path in days:
+            os.remove(path)
+    return sum(len(days) for days in partitions.values()), len(partitions)
+
+
+def restore_day(data_dir, team_acronym, kind, day):
+    """
+    Write a compacted day back out as its daily (hot) file, so it can be
+    updated in place, e.g. by a merging re-run. The hot file shadows the
+    day's compacted rows until the next ``compact``.
+
+    Returns:
+        str: The daily file path, or None if the day was never compacted or a
+        daily file already exists.
+    """
+    daily = os.path.join(
+        data_dir, team_acronym, f"{team_acronym}_{day:%Y-%m-%d}_{kind}.parquet"
+    )
+    partition = partition_path(data_dir, kind, team_acronym, day)
+    if os.path.exists(daily) or not os.path.exists(partition):
+        return None
+    table = _read_partition(partition, kind)
+    table = table.filter(pc.equal(table["day"], pa.scalar(day, pa.date32())))
+    if not table.num_rows:
+        return None
+    os.makedirs(os.path.dirname(daily), exist_ok=True)
+    write_table(table.drop_columns(["day"]), daily)
+    return daily
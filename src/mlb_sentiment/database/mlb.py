@@ -1,4 +1,16 @@
-import pandas as pd
+from mlb_sentiment import utility
+from mlb_sentiment.database.schema import SCHEMAS, build_table, write_table
+
+
+def _columns(rows, names):
+    """Transpose row tuples into named columns, replacing commas in strings."""
+    columns = {name: [] for name in names}
+    for row in rows:
+        for name, value in zip(names, row):
+            if isinstance(value, str):
+                value = value.replace(",", "...")
+            columns[name].append(value)
+    return columns
 
 
 def save_mlb_games(games, filename: str = "MyDatabase"):
@@ -7,8 +19,8 @@ def save_mlb_games(games, filename: str = "MyDatabase"):
 
     Parameters
     ----------
-    games : list of dicts
-        Each dict represents one game's data.
+    games : list of tuples
+        Each tuple represents one game's data, in ``games`` schema order.
     filename : str
         Base filename (no extension needed, .parquet is added automatically).
     """
@@ -16,27 +28,8 @@ def save_mlb_games(games, filename: str = "MyDatabase"):
         filename if filename.endswith("_games.parquet") else filename + "_games.parquet"
     )
 
-    # Convert to DataFrame for easy export
-    df = pd.DataFrame(
-        games,
-        columns=[
-            "game_id",
-            "game_date",
-            "game_start_time_est",
-            "home_team",
-            "away_team",
-            "home_score",
-            "away_score",
-            "wins",
-            "losses",
-        ],
-    )
-
-    # Replace commas in string columns with "..."
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].astype(str).str.replace(",", "...")
-
-    df.to_parquet(parquet_filename, index=False, engine="pyarrow")
+    table = build_table("games", _columns(games, SCHEMAS["games"].names))
+    write_table(table, parquet_filename)
     print(f"Saved {len(games)} games into Parquet: {parquet_filename}")
     return True
 
@@ -49,8 +42,9 @@ def save_mlb_events(game_events, filename: str = "MyDatabase"):
     ----------
     game_events : list of tuples
         Each tuple represents one row of game data
-        (inning, halfInning, event, description, est, home_team, visiting_team,
-         home_score, away_score, outs, people_on_base, captivatingIndex).
+        (game_id, inning, halfInning, event, description, utc, home_team,
+         visiting_team, home_score, away_score, outs, people_on_base,
+         captivatingIndex), where utc is a UTC timestamp.
     filename : str
         Base filename (no extension needed, .parquet is added automatically).
     """
@@ -60,34 +54,12 @@ def save_mlb_events(game_events, filename: str = "MyDatabase"):
         else filename + "_game_events.parquet"
     )
 
-    # Convert to DataFrame for easy export
-    df = pd.DataFrame(
-        game_events,
-        columns=[
-            "game_id",
-            "inning",
-            "halfInning",
-            "event",
-            "description",
-            "est",
-            "home_team",
-            "visiting_team",
-            "home_score",
-            "away_score",
-            "outs",
-            "people_on_base",
-            "captivatingIndex",
-        ],
-    )
-
+    columns = _columns(game_events, SCHEMAS["game_events"].names[1:])
     # Add an autoincrementing event_id column
-    df.index.name = "event_id"
-    df.reset_index(inplace=True)
-
-    # Replace commas in string columns with "..."
-    for col in df.select_dtypes(include="object").columns:
-        df[col] = df[col].astype(str).str.replace(",", "...")
+    columns["event_id"] = range(len(game_events))
+    columns["utc"] = utility.iso_to_utc_array(columns["utc"])
 
-    df.to_parquet(parquet_filename, index=False, engine="pyarrow")
+    table = build_table("game_events", columns)
+    write_table(table, parquet_filename)
     print(f"Saved {len(game_events)} events into Parquet: {parquet_filename}")
     return True
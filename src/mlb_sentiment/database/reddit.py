@@ -1,7 +1,27 @@
+import os
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from mlb_sentiment import utility
+from mlb_sentiment.database.schema import (
+    SCHEMA_VERSION,
+    build_table,
+    concat_tables,
+    schema_version,
+    upgrade_frame,
+    write_table,
+)
 import re
 
+# Characters Python's ``\s`` and ``str.strip()`` treat as whitespace once text is
+# ASCII-only. Arrow's RE2 ``\s`` omits \v and \x1c-\x1f, so spell them out to
+# keep the columnar cleaner byte-for-byte identical to ``format_reddit_text``.
+_ASCII_WHITESPACE = "\t\n\v\f\r \x1c\x1d\x1e\x1f"
+_WHITESPACE_RE = r"\t\n\v\f\r \x1c-\x1f"
+_NON_SPACE_WHITESPACE_RE = r"\t\n\v\f\r\x1c-\x1f"
+
 
 def format_reddit_text(text: str) -> str:
     """
@@ -36,38 +56,227 @@ def format_reddit_text(text: str) -> str:
     return text
 
 
-def save_reddit_comments(comments, filename: str = "MyDatabase"):
+def format_reddit_text_column(texts) -> pa.Array:
     """
-    Save Reddit comments to a Parquet file.
+    Vectorized ``format_reddit_text`` over a whole column.
+
+    Args:
+        texts: Strings as a list, pandas Series, or Arrow array. None becomes "".
+
+    Returns:
+        pyarrow.StringArray: Cleaned text, identical to ``format_reddit_text``
+        applied to each value.
     """
-    comments_file = (
+    if isinstance(texts, pa.ChunkedArray):
+        texts = texts.combine_chunks()
+    if not (isinstance(texts, pa.Array) and pa.types.is_string(texts.type)):
+        texts = [
+            "" if t is None else t if isinstance(t, str) else str(t) for t in texts
+        ]
+        try:
+            texts = pa.array(texts, type=pa.string())
+        except (pa.ArrowException, UnicodeEncodeError):
+            # Lone surrogates cannot be encoded as UTF-8; use the scalar path.
+            return pa.array([format_reddit_text(t) for t in texts], type=pa.string())
+    texts = texts.fill_null("")
+
+    texts = pc.replace_substring_regex(texts, r"[\n\r,]", " ")
+    texts = pc.replace_substring_regex(texts, "[*#]", "")
+    texts = pc.if_else(
+        pc.greater(pc.utf8_length(texts), 255),
+        pc.binary_join_element_wise(pc.utf8_slice_codeunits(texts, 0, 255), "...", ""),
+        texts,
+    )
+    # Remove non-ASCII characters
+    texts = pc.replace_substring_regex(texts, r"[^\x00-\x7f]", " ")
+    # Strip links
+    texts = pc.replace_substring_regex(texts, f"http[^{_WHITESPACE_RE}]+", "")
+    # Collapse extra spaces. Single spaces are already collapsed, so only
+    # rewrite runs and non-space whitespace (far fewer matches than ``\s+``).
+    texts = pc.replace_substring_regex(
+        texts, f"[{_WHITESPACE_RE}]{{2,}}|[{_NON_SPACE_WHITESPACE_RE}]", " "
+    )
+    return pc.utf8_trim(texts, characters=_ASCII_WHITESPACE)
+
+
+def keep_comment_mask(texts) -> pa.Array:
+    """
+    Boolean mask of cleaned comments worth storing: more than three ASCII
+    letters or digits (the column form of the short/noisy comment filter).
+    """
+    return pc.match_substring_regex(texts, "(?:[A-Za-z0-9][^A-Za-z0-9]*){4}")
+
+
+def reddit_id_to_int(reddit_id):
+    """
+    Decode a base-36 Reddit id ("k3x9ab", or a fullname like "t1_k3x9ab") into
+    the integer stored as a comment's ``id``. None stays None.
+    """
+    if reddit_id is None:
+        return None
+    return int(str(reddit_id).rsplit("_", 1)[-1], 36)
+
+
+def _comments_file(filename):
+    return (
         filename
         if filename.endswith("_comments.parquet")
         else filename + "_comments.parquet"
     )
 
-    all_comments = []
-    comment_id_counter = 1
-    for comment in comments:
-        formatted_text = format_reddit_text(comment["text"])
-        # Skip very short/noisy comments
-        if len(re.findall(r"[A-Za-z0-9]", formatted_text)) <= 3:
-            continue
-        all_comments.append(
-            {
-                "id": comment_id_counter,
-                "game_id": comment.get("game_id"),
-                "author": comment["author"],
-                "text": formatted_text,
-                "created_est": utility.utc_to_est(comment["created_utc"]),
-                "sentiment": comment["sentiment"]["emotion"],
-                "sentiment_score": comment["sentiment"]["score"],
-            }
+
+def load_reddit_comments(filename):
+    """
+    Read a day's stored comments as a table in the current schema, or None if
+    the file does not exist yet.
+    """
+    comments_file = _comments_file(filename)
+    if not os.path.exists(comments_file):
+        return None
+    if schema_version(comments_file) < SCHEMA_VERSION:
+        return build_table(
+            "comments", upgrade_frame(pd.read_parquet(comments_file), "comments")
         )
-        comment_id_counter += 1
+    return pq.read_table(comments_file)
 
-    pd.DataFrame(all_comments).to_parquet(comments_file, index=False, engine="pyarrow")
-    print(f"Saved {len(all_comments)} comments into Parquet: {comments_file}")
+
+def latest_comment_utc(filename):
+    """
+    Return the newest stored comment time per game as
+    ``{game_id: epoch seconds}`` (empty if nothing is stored yet).
+    """
+    stored = load_reddit_comments(filename)
+    if stored is None or not stored.num_rows:
+        return {}
+    newest = stored.group_by("game_id").aggregate([("created_utc", "max")])
+    return {
+        str(game_id): created.timestamp()
+        for game_id, created in zip(
+            newest["game_id"].to_pylist(), newest["created_utc_max"].to_pylist()
+        )
+        if game_id is not None and created is not None
+    }
+
+
+def load_reddit_posts(filename):
+    """
+    Read a day's stored game threads back as post dictionaries (``game_id``,
+    ``url``, ``title``, ``team_acronym``), or an empty list if none are stored.
+    """
+    posts_file = (
+        filename if filename.endswith("_posts.parquet") else filename + "_posts.parquet"
+    )
+    if not os.path.exists(posts_file):
+        return []
+    df = pd.read_parquet(
+        posts_file, columns=["game_id", "team_acronym", "post_title", "post_url"]
+    )
+    return [
+        {
+            "game_id": row.game_id,
+            "team_acronym": row.team_acronym,
+            "title": row.post_title,
+            "url": row.post_url,
+        }
+        for row in df.itertuples(index=False)
+    ]
+
+
+def comment_delta(comments, filename):
+    """
+    Return the fetched comments a merge would actually change: those not yet
+    stored under ``filename`` (by Reddit id) or whose cleaned text was edited.
+    Comments too short to be stored are dropped, so only the delta needs scoring.
+    """
+    comments = list(comments)
+    texts = format_reddit_text_column([comment["text"] for comment in comments])
+    keep = keep_comment_mask(texts).to_pylist()
+    stored = load_reddit_comments(filename)
+    stored_text = (
+        {}
+        if stored is None
+        else dict(zip(stored["id"].to_pylist(), stored["text"].to_pylist()))
+    )
+    delta = []
+    for comment, text, k in zip(comments, texts.to_pylist(), keep):
+        comment_id = reddit_id_to_int(comment.get("id"))
+        if k and (comment_id is None or stored_text.get(comment_id) != text):
+            delta.append(comment)
+    return delta
+
+
+def _model_columns(kept):
+    """
+    Model-tagged score columns for the comments' results: the label, score
+    and revision of each model that scored some of them (null elsewhere).
+    """
+    sentiments = [comment["sentiment"] for comment in kept]
+    columns = {}
+    for tag in sorted({s["model"] for s in sentiments if s.get("model")}):
+        mine = [s if s.get("model") == tag else {} for s in sentiments]
+        columns[f"sentiment_{tag}"] = [s.get("emotion") for s in mine]
+        columns[f"sentiment_score_{tag}"] = [s.get("score") for s in mine]
+        columns[f"sentiment_revision_{tag}"] = [s.get("revision") for s in mine]
+    return columns
+
+
+def save_reddit_comments(
+    comments, filename: str = "MyDatabase", merge=False, store_raw=False
+):
+    """
+    Save Reddit comments to a Parquet file.
+
+    Args:
+        comments (list): Scored comment dictionaries. ``id`` / ``parent_id`` are
+            the Reddit id and parent fullname when known.
+        filename (str): Output prefix or ``*_comments.parquet`` path.
+        merge (bool): Upsert into the existing file by comment id instead of
+            overwriting it: new comments are added, stored ones with the same
+            id are replaced and the rest are kept.
+        store_raw (bool): Also keep each comment's body as fetched (and
+            scored) in ``raw_text``, so ``mlb-sentiment score`` can rescore
+            the same input later.
+    """
+    comments_file = _comments_file(filename)
+
+    comments = list(comments)
+    texts = format_reddit_text_column([comment["text"] for comment in comments])
+    # Skip very short/noisy comments
+    keep = keep_comment_mask(texts)
+    kept = [comment for comment, k in zip(comments, keep.to_pylist()) if k]
+
+    table = build_table(
+        "comments",
+        {
+            "id": [reddit_id_to_int(comment.get("id")) for comment in kept],
+            "game_id": [comment.get("game_id") for comment in kept],
+            "author": [comment["author"] for comment in kept],
+            "text": pc.filter(texts, keep),
+            # Convert every comment's timestamp in one pass.
+            "created_utc": utility.epoch_to_utc_array(
+                [comment["created_utc"] for comment in kept]
+            ),
+            "sentiment": [comment["sentiment"]["emotion"] for comment in kept],
+            "sentiment_score": [comment["sentiment"]["score"] for comment in kept],
+            "parent_id": [comment.get("parent_id") for comment in kept],
+            "sentiment_model": [comment["sentiment"].get("model") for comment in kept],
+            "raw_text": [comment["text"] if store_raw else None for comment in kept],
+            **_model_columns(kept),
+        },
+    )
+    written = table.num_rows
+    stored = load_reddit_comments(comments_file) if merge else None
+    if stored is not None:
+        # Stored rows whose id was re-fetched are replaced by the new version.
+        replaced = pc.is_in(stored["id"], value_set=table["id"].drop_null())
+        stored = stored.filter(pc.invert(pc.fill_null(replaced, False)))
+        table = concat_tables([stored, table])
+        table = table.sort_by([("created_utc", "ascending"), ("id", "ascending")])
+    write_table(table, comments_file)
+    print(
+        f"Saved {written} comments into Parquet: {comments_file}"
+        + (f" ({table.num_rows} stored)" if stored is not None else "")
+    )
 
 
 def save_reddit_posts(posts, filename: str = "MyDatabase"):
@@ -78,20 +287,19 @@ def save_reddit_posts(posts, filename: str = "MyDatabase"):
         filename if filename.endswith("_posts.parquet") else filename + "_posts.parquet"
     )
 
-    all_posts = []
-    post_id_counter = 1
-    for post in posts:
-        all_posts.append(
-            {
-                "id": post_id_counter,
-                "game_id": post["game_id"],
-                "team_acronym": post["team_acronym"].upper(),
-                "post_title": post["title"],
-                "post_url": post["url"],
-                "created_est": post["created_est"],
-            }
-        )
-        post_id_counter += 1
-
-    pd.DataFrame(all_posts).to_parquet(posts_file, index=False, engine="pyarrow")
-    print(f"Saved {len(all_posts)} posts into Parquet: {posts_file}")
+    posts = list(posts)
+    table = build_table(
+        "posts",
+        {
+            "id": range(1, len(posts) + 1),
+            "game_id": [post["game_id"] for post in posts],
+            "team_acronym": [post["team_acronym"].upper() for post in posts],
+            "post_title": [post["title"] for post in posts],
+            "post_url": [post["url"] for post in posts],
+            "created_utc": utility.epoch_to_utc_array(
+                [post["created_utc"] for post in posts]
+            ),
+        },
+    )
+    write_table(table, posts_file)
+    print(f"Saved {table.num_rows} posts into Parquet: {posts_file}")
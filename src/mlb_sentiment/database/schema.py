@@ -0,0 +1,268 @@
+"""Schemas and versioning of the per-team Parquet files.
+
+v1 stored times as US/Eastern wall-clock strings (``created_est``, ``est``),
+which are ambiguous during the DST fall-back hour and have to be re-parsed on
+every read. v2 stores them as ``timestamp[us, UTC]`` columns (``created_utc``,
+``utc``) and tags every file with a ``schema_version`` key in its Parquet
+metadata. Files without the key are v1. v3 keys comments by their Reddit id
+(base-36 decoded into ``id``) and records the ``parent_id`` fullname, so a
+re-run can upsert into a day's comments instead of rewriting them. v4 records
+which model produced a comment's ``sentiment`` / ``sentiment_score``
+(``sentiment_model``, null when unscored) and can keep the comment body as it
+was scored (``raw_text``, with ``--store-raw``). Comments may also carry
+model-tagged score columns written by ``mlb-sentiment score``: for the model
+tag ``T``, ``sentiment_T``, ``sentiment_score_T`` and the model revision that
+produced them, ``sentiment_revision_T``.
+
+Every file is written against one of the declared Arrow schemas below:
+low-cardinality strings (teams, authors, labels, event types) are
+dictionary-encoded, sentiment scores are float32, and pages are zstd-compressed.
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCHEMA_VERSION = 4
+SCHEMA_VERSION_KEY = b"schema_version"
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+_UTC = pa.timestamp("us", tz="UTC")
+
+SCHEMAS = {
+    "comments": pa.schema(
+        [
+            ("id", pa.int64()),
+            ("game_id", _CATEGORY),
+            ("author", _CATEGORY),
+            ("text", pa.string()),
+            ("created_utc", _UTC),
+            ("sentiment", _CATEGORY),
+            ("sentiment_score", pa.float32()),
+            ("parent_id", pa.string()),
+            ("sentiment_model", _CATEGORY),
+            ("raw_text", pa.string()),
+        ]
+    ),
+    "posts": pa.schema(
+        [
+            ("id", pa.int64()),
+            ("game_id", pa.string()),
+            ("team_acronym", _CATEGORY),
+            ("post_title", pa.string()),
+            ("post_url", pa.string()),
+            ("created_utc", _UTC),
+        ]
+    ),
+    "games": pa.schema(
+        [
+            ("game_id", pa.string()),
+            ("game_date", pa.string()),
+            ("game_start_time_est", pa.string()),
+            ("home_team", _CATEGORY),
+            ("away_team", _CATEGORY),
+            ("home_score", pa.int32()),
+            ("away_score", pa.int32()),
+            ("wins", pa.int32()),
+            ("losses", pa.int32()),
+        ]
+    ),
+    "game_events": pa.schema(
+        [
+            ("event_id", pa.int64()),
+            ("game_id", _CATEGORY),
+            ("inning", pa.int32()),
+            ("halfInning", _CATEGORY),
+            ("event", _CATEGORY),
+            ("description", pa.string()),
+            ("utc", _UTC),
+            ("home_team", _CATEGORY),
+            ("visiting_team", _CATEGORY),
+            ("home_score", pa.int32()),
+            ("away_score", pa.int32()),
+            ("outs", pa.int32()),
+            ("people_on_base", pa.int32()),
+            ("captivatingIndex", pa.int32()),
+        ]
+    ),
+}
+
+# A comments column naming the revision of one model's tagged scores.
+_MODEL_REVISION_COLUMN = re.compile(r"^sentiment_revision_(\w+)$")
+
+
+def model_fields(tag):
+    """Fields of the tagged score columns for one model tag (e.g. "roberta")."""
+    return [
+        pa.field(f"sentiment_{tag}", _CATEGORY),
+        pa.field(f"sentiment_score_{tag}", pa.float32()),
+        pa.field(f"sentiment_revision_{tag}", _CATEGORY),
+    ]
+
+
+def model_tags(names):
+    """Model tags with score columns among column ``names``, sorted."""
+    return sorted(
+        match.group(1) for match in map(_MODEL_REVISION_COLUMN.match, names) if match
+    )
+
+
+def table_schema(kind, names=()):
+    """The schema of a ``kind`` file, plus tagged score columns found in ``names``."""
+    schema = SCHEMAS[kind]
+    if kind == "comments":
+        for tag in model_tags(names):
+            for field in model_fields(tag):
+                schema = schema.append(field)
+    return schema
+
+
+# Parquet writer settings. Daily files are small, so one row group each; the
+# cap only matters for compacted datasets, where ~128k-row groups keep
+# min/max statistics selective without bloating the footer.
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 6
+ROW_GROUP_SIZE = 128 * 1024
+
+# File kind -> (v1 Eastern wall-clock string column, v2 UTC timestamp column).
+TIME_COLUMNS = {
+    "comments": ("created_est", "created_utc"),
+    "posts": ("created_est", "created_utc"),
+    "game_events": ("est", "utc"),
+}
+
+# Checked in order: "_game_events" must win over "_games"-style suffixes.
+FILE_KINDS = ("game_events", "games", "comments", "posts")
+
+
+def file_kind(path):
+    """Return the kind of a data file ("comments", "games", ...) from its name."""
+    name = os.path.basename(path)
+    for kind in FILE_KINDS:
+        if name.endswith(f"_{kind}.parquet"):
+            return kind
+    raise ValueError(f"Not a recognised data file: {path}")
+
+
+def schema_version(path):
+    """Return the schema version a Parquet file was written with."""
+    metadata = pq.read_schema(path).metadata or {}
+    return int(metadata.get(SCHEMA_VERSION_KEY, b"1"))
+
+
+def _column(values, type_):
+    """Build an Arrow array of ``type_`` from a list, pandas column or Arrow array."""
+    if pa.types.is_dictionary(type_):
+        return _column(values, type_.value_type).dictionary_encode().cast(type_)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if not isinstance(values, pa.Array):
+        if pa.types.is_integer(type_) or pa.types.is_floating(type_):
+            # Stats API fields can be "" when missing; store those as null.
+            values = pd.to_numeric(
+                pd.Series(values, dtype=object).replace("", None),
+                errors="coerce",
+            )
+        elif pa.types.is_string(type_) and not isinstance(
+            values, (pd.Series, pd.Index)
+        ):
+            values = [None if v is None else str(v) for v in values]
+        values = pa.array(values, from_pandas=True)
+    return values.cast(type_)
+
+
+def build_table(kind, columns):
+    """
+    Build a table of the given file kind against its declared schema
+    (comments keep any model-tagged score columns).
+
+    Args:
+        kind (str): "comments", "posts", "games" or "game_events".
+        columns (dict): Column name -> list, pandas column or Arrow array
+            (a DataFrame or Arrow table works too).
+    """
+    names = columns.column_names if isinstance(columns, pa.Table) else columns
+    schema = table_schema(kind, list(names))
+    arrays = [_column(columns[field.name], field.type) for field in schema]
+    return pa.Table.from_arrays(arrays, schema=schema).replace_schema_metadata(
+        {SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode()}
+    )
+
+
+def concat_tables(tables):
+    """
+    Concatenate tables of one kind whose model-tagged score columns differ;
+    a column missing from some tables is null in their rows.
+    """
+    table = pa.concat_tables(tables, promote_options="default")
+    return table.unify_dictionaries().combine_chunks()
+
+
+def write_table(table, path):
+    """Write a table built by ``build_table`` to Parquet, atomically."""
+    tmp = path + ".tmp"
+    pq.write_table(
+        table,
+        tmp,
+        compression=COMPRESSION,
+        compression_level=COMPRESSION_LEVEL,
+        use_dictionary=[
+            field.name for field in table.schema if pa.types.is_dictionary(field.type)
+        ],
+        row_group_size=ROW_GROUP_SIZE,
+        write_statistics=True,
+    )
+    os.replace(tmp, path)
+
+
+def eastern_to_utc(values):
+    """
+    Convert v1 Eastern wall-clock strings to UTC timestamps.
+
+    Wall times in the DST fall-back hour are read as the first (EDT)
+    occurrence; unparseable or empty values become NaT.
+    """
+    est = pd.to_datetime(
+        pd.Series(values, dtype=object).replace("", None),
+        errors="coerce",
+        format="%Y-%m-%d %H:%M:%S",
+    )
+    utc = est.dt.tz_localize(
+        "US/Eastern",
+        ambiguous=np.ones(len(est), dtype=bool),
+        nonexistent="shift_forward",
+    ).dt.tz_convert("UTC")
+    return utc.astype("datetime64[us, UTC]")
+
+
+def upgrade_frame(df, kind):
+    """Rewrite an older DataFrame of the given kind in the current layout (in place)."""
+    if kind in TIME_COLUMNS:
+        est_col, utc_col = TIME_COLUMNS[kind]
+        if est_col in df:  # v1
+            loc = df.columns.get_loc(est_col)
+            df.insert(loc, utc_col, eastern_to_utc(df.pop(est_col)))
+    # Columns added since the file was written (e.g. v4 ``raw_text``) are null.
+    for field in SCHEMAS[kind]:
+        if field.name not in df:
+            df[field.name] = None
+    return df
+
+
+def migrate_file(path):
+    """
+    Upgrade one data file to the current schema version.
+
+    Returns:
+        bool: True if the file was rewritten, False if it was already current.
+    """
+    if schema_version(path) >= SCHEMA_VERSION:
+        return False
+    kind = file_kind(path)
+    df = upgrade_frame(pd.read_parquet(path), kind)
+    write_table(build_table(kind, df), path)
+    return True
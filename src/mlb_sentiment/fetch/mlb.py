@@ -1,24 +1,348 @@
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+
 import statsapi
-from datetime import datetime
+from datetime import datetime, timedelta
+from mlb_sentiment import config
 from mlb_sentiment import info
 from mlb_sentiment import utility
+from mlb_sentiment.scheduler import throttled
+
+
+class LeagueSnapshot:
+    """
+    Full-league schedule and standings for one date (MM/DD/YYYY).
+
+    Both statsapi responses cover every club, so one snapshot serves all
+    teams: the schedule and standings are each fetched at most once (lazily,
+    thread-safe) and per-team views are filtered from memory. Use
+    ``get_league_snapshot`` to share snapshots process-wide.
+    """
+
+    def __init__(self, date, schedule=None):
+        self.date = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
+        self._schedule = schedule
+        self._standings = None
+        self._lock = threading.Lock()
+
+    @property
+    def schedule(self):
+        """Every MLB game scheduled on the date."""
+        with self._lock:
+            if self._schedule is None:
+                self._schedule = throttled(
+                    "statsapi.schedule",
+                    statsapi.schedule,
+                    start_date=self.date,
+                    end_date=self.date,
+                )
+        return self._schedule
+
+    @property
+    def standings(self):
+        """statsapi ``standings_data`` for the date (all divisions)."""
+        with self._lock:
+            if self._standings is None:
+                self._standings = throttled(
+                    "statsapi.standings", statsapi.standings_data, date=self.date
+                )
+        return self._standings
+
+    def team_schedule(self, team_id):
+        """The date's schedule entries involving ``team_id``."""
+        return [
+            g for g in self.schedule if team_id in (g.get("home_id"), g.get("away_id"))
+        ]
+
+    def team_record(self, team_id):
+        """``team_id``'s (wins, losses) on the date, or (0, 0) if not listed."""
+        for key, league in self.standings.items():
+            for team in league.get("teams", []):
+                if team.get("team_id") == team_id:
+                    return team.get("w"), team.get("l")
+        return 0, 0
+
+
+# Process-wide LeagueSnapshot per date, shared by every team in a run.
+_LEAGUE_SNAPSHOTS = {}
+_LEAGUE_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def get_league_snapshot(date):
+    """Return the shared LeagueSnapshot for a date (MM/DD/YYYY), creating it once."""
+    date = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
+    with _LEAGUE_SNAPSHOTS_LOCK:
+        if date not in _LEAGUE_SNAPSHOTS:
+            _LEAGUE_SNAPSHOTS[date] = LeagueSnapshot(date)
+        return _LEAGUE_SNAPSHOTS[date]
 
 
-def fetch_mlb_events(team_acronym, date=None):
+def prefetch_league_snapshots(start_date, end_date):
+    """
+    Load the full-league schedule for a date range with one statsapi call and
+    seed the shared snapshot for every date in it.
+
+    Returns:
+        dict: ``{date (MM/DD/YYYY): LeagueSnapshot}`` for every date in the range.
+    """
+    start_dt = datetime.strptime(start_date, "%m/%d/%Y")
+    end_dt = datetime.strptime(end_date, "%m/%d/%Y")
+    by_date = {}
+    for g in throttled(
+        "statsapi.schedule",
+        statsapi.schedule,
+        start_date=start_date,
+        end_date=end_date,
+    ):
+        date = datetime.strptime(g["game_date"], "%Y-%m-%d").strftime("%m/%d/%Y")
+        by_date.setdefault(date, []).append(g)
+    snapshots = {}
+    with _LEAGUE_SNAPSHOTS_LOCK:
+        for offset in range((end_dt - start_dt).days + 1):
+            date = (start_dt + timedelta(days=offset)).strftime("%m/%d/%Y")
+            snapshot = _LEAGUE_SNAPSHOTS.get(date)
+            if snapshot is None:
+                snapshot = _LEAGUE_SNAPSHOTS[date] = LeagueSnapshot(date)
+            if snapshot._schedule is None:
+                snapshot._schedule = by_date.get(date, [])
+            snapshots[date] = snapshot
+    return snapshots
+
+
+class GameContext:
+    """
+    Per-run MLB state for one team on one date (MM/DD/YYYY).
+
+    Resolves the team id, the day's schedule, each game's live feed and the
+    team's record at most once, and hands them to ``fetch_mlb_games``,
+    ``fetch_mlb_events`` and ``fetch_reddit_posts`` so a single upload does
+    not repeat the same statsapi calls. Everything but the team id is loaded
+    lazily on first use. With a LeagueSnapshot, the schedule is filtered from
+    the full-league one instead of fetched per team. Every piece can also be
+    supplied up front (see ``mlb_sentiment.archive``) so no network is needed.
+    """
+
+    def __init__(
+        self,
+        team_acronym,
+        date,
+        schedule=None,
+        league=None,
+        team_id=None,
+        record=None,
+        abbreviations=None,
+        feed_loader=None,
+    ):
+        if not date:
+            raise ValueError("You must provide 'date' (MM/DD/YYYY) for a GameContext.")
+        if len(date.split("/")) != 3:
+            raise ValueError("Date must be in MM/DD/YYYY format.")
+        self.team_acronym = team_acronym
+        self.date = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
+        self.team_id = team_id or info.get_team_info(team_acronym, "team_id")
+        if schedule is None and league is not None:
+            schedule = league.team_schedule(self.team_id)
+        self._schedule = (
+            sorted(schedule, key=lambda g: g["game_date"])
+            if schedule is not None
+            else None
+        )
+        self._record = tuple(record) if record is not None else None
+        self._abbreviations = dict(abbreviations or {})
+        self._feed_loader = feed_loader or fetch_game_data
+
+    @property
+    def schedule(self):
+        """The team's statsapi schedule entries for the date, sorted by game_date."""
+        if self._schedule is None:
+            self._schedule = throttled(
+                "statsapi.schedule",
+                statsapi.schedule,
+                team=self.team_id,
+                start_date=self.date,
+                end_date=self.date,
+            )
+            # Sort games (handles double headers)
+            self._schedule.sort(key=lambda g: g["game_date"])
+        return self._schedule
+
+    @property
+    def game_ids(self):
+        """Team-prefixed game ids for the date (see ``fetch_game_ids``)."""
+        return [f"{self.team_id}{g['game_id']}" for g in self.schedule]
+
+    @property
+    def record(self):
+        """The team's (wins, losses) on the date."""
+        if self._record is None:
+            self._record = team_record_on_date(self.team_id, self.date)
+        return self._record
+
+    def abbreviation(self, team_name):
+        """Raw statsapi abbreviation for a team name (see ``get_team_abbreviation``)."""
+        if team_name not in self._abbreviations:
+            self._abbreviations[team_name] = get_team_abbreviation(team_name)
+        return self._abbreviations[team_name]
+
+    def feed(self, game_id):
+        """The statsapi live feed for one game (gamePk), via the shared feed cache."""
+        return self._feed_loader(game_id)
+
+
+def game_contexts_for_range(team_acronym, start_date, end_date, leagues=None):
+    """
+    Build a GameContext for every date in a range from one schedule call.
+
+    Args:
+        start_date (str): First date (MM/DD/YYYY), inclusive.
+        end_date (str): Last date (MM/DD/YYYY), inclusive.
+        leagues (dict, optional): ``{date: LeagueSnapshot}`` (see
+            ``prefetch_league_snapshots``); when given, no schedule call is made.
+
+    Returns:
+        dict: ``{date (MM/DD/YYYY): GameContext}`` for every date in the range;
+        off days get a context with an empty schedule.
+    """
+    start_dt = datetime.strptime(start_date, "%m/%d/%Y")
+    end_dt = datetime.strptime(end_date, "%m/%d/%Y")
+    if leagues is not None:
+        return {
+            date: GameContext(team_acronym, date, league=leagues[date])
+            for date in (
+                (start_dt + timedelta(days=offset)).strftime("%m/%d/%Y")
+                for offset in range((end_dt - start_dt).days + 1)
+            )
+        }
+    TEAM_ID = info.get_team_info(team_acronym, "team_id")
+    by_date = {}
+    for g in throttled(
+        "statsapi.schedule",
+        statsapi.schedule,
+        team=TEAM_ID,
+        start_date=start_date,
+        end_date=end_date,
+    ):
+        date = datetime.strptime(g["game_date"], "%Y-%m-%d").strftime("%m/%d/%Y")
+        by_date.setdefault(date, []).append(g)
+    contexts = {}
+    for offset in range((end_dt - start_dt).days + 1):
+        date = (start_dt + timedelta(days=offset)).strftime("%m/%d/%Y")
+        contexts[date] = GameContext(team_acronym, date, schedule=by_date.get(date, []))
+    return contexts
+
+
+def fetch_mlb_events(team_acronym, date=None, context=None):
     if not date:
         raise ValueError(
             "You must provide 'date' (MM/DD/YYYY) for fetching MLB events."
         )
-    TEAM_ID = info.get_team_info(team_acronym, "team_id")
+    context = context or GameContext(team_acronym, date)
     date_dt = datetime.strptime(date, "%m/%d/%Y")
     date_str = date_dt.strftime("%Y-%m-%d")
-    events = fetch_events(TEAM_ID, date_str)
+    events = fetch_events(context.team_id, date_str, context=context)
     return events
 
 
+class GameFeedCache:
+    """
+    Process-wide, size-bounded cache of statsapi live feeds keyed by gamePk.
+
+    Head-to-head games between two tracked clubs are requested once per team;
+    this keeps each feed to one download and one parse per run. The newest
+    ``max_entries`` feeds stay in memory (LRU). With ``disk_dir`` set, feeds of
+    finished games are also written there gzip-compressed and reused across
+    runs; live feeds are never persisted since they still change. Concurrent
+    requests for the same gamePk wait for a single download.
+    """
+
+    def __init__(self, max_entries=8, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.stats = {"hits": 0, "disk_hits": 0, "downloads": 0}
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _disk_path(self, game_id):
+        return os.path.join(self.disk_dir, f"{game_id}.json.gz")
+
+    def _read_disk(self, game_id):
+        if not self.disk_dir or not os.path.exists(self._disk_path(game_id)):
+            return None
+        with gzip.open(self._disk_path(game_id), "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def _write_disk(self, game_id, feed):
+        state = feed.get("gameData", {}).get("status", {}).get("abstractGameState")
+        if not self.disk_dir or state != "Final":
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        tmp = self._disk_path(game_id) + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+            json.dump(feed, fh)
+        os.replace(tmp, self._disk_path(game_id))
+
+    def _lookup(self, key):
+        """Return a cached feed (refreshing its LRU position), or None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key]
+        return None
+
+    def get(self, game_id):
+        """Return the live feed for ``game_id``, downloading it at most once."""
+        key = str(game_id)
+        feed = self._lookup(key)
+        if feed is not None:
+            return feed
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            feed = self._lookup(key)  # another thread may have just loaded it
+            if feed is not None:
+                return feed
+            feed = self._read_disk(key)
+            if feed is not None:
+                self.stats["disk_hits"] += 1
+            else:
+                feed = throttled(
+                    "statsapi.game", statsapi.get, "game", {"gamePk": game_id}
+                )
+                self.stats["downloads"] += 1
+                self._write_disk(key, feed)
+            with self._lock:
+                self._entries[key] = feed
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._inflight.pop(key, None)
+        return feed
+
+    def clear(self):
+        """Drop every in-memory feed (the disk tier is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_FEED_CACHE = GameFeedCache(disk_dir=config.FEED_CACHE_DIR)
+
+
+def configure_feed_cache(max_entries=None, disk_dir=None):
+    """Adjust the shared feed cache's memory bound and/or on-disk directory."""
+    if max_entries is not None:
+        _FEED_CACHE.max_entries = max_entries
+    if disk_dir is not None:
+        _FEED_CACHE.disk_dir = disk_dir
+    return _FEED_CACHE
+
+
 def fetch_game_data(game_id):
-    """Fetch game data from statsapi for a given game ID."""
-    return statsapi.get("game", {"gamePk": game_id})
+    """Fetch game data from statsapi for a given game ID (via the shared feed cache)."""
+    return _FEED_CACHE.get(game_id)
 
 
 def parse_plays(data):
@@ -38,20 +362,27 @@ def get_people_on_base(play):
     return len(unique_runners)
 
 
-def create_event_row(play, home_team, visiting_team, game_id, TEAM_ID):
-    """Create a single event row from play data."""
+def create_event_row(play, home_team, visiting_team, game_id, TEAM_ID, utc=None):
+    """
+    Create a single event row from play data.
+    ``utc`` is the play's UTC timestamp when already converted in bulk (see
+    ``fetch_events``); otherwise it is derived from the play's timestamps.
+    """
     about = play.get("about", {})
     result = play.get("result", {})
     count = play.get("count", {})
     people_on_base = get_people_on_base(play)
+    if utc is None:
+        utc = utility.iso_to_utc_array(
+            [about.get("startTime") or about.get("endTime")]
+        )[0]
     return (
         f"{TEAM_ID}{game_id}",
         about.get("inning"),
         about.get("halfInning"),
         result.get("event", ""),
         result.get("description", ""),
-        utility.iso_to_est(about.get("startTime"))
-        or utility.iso_to_est(about.get("endTime")),
+        utc,
         home_team,
         visiting_team,
         result.get("homeScore", ""),
@@ -62,25 +393,37 @@ def create_event_row(play, home_team, visiting_team, game_id, TEAM_ID):
     )
 
 
-def fetch_events(TEAM_ID, date):
+def fetch_events(TEAM_ID, date, context=None):
     """
     Fetch MLB game events for a specific team on a given date (YYYY-MM-DD).
+    A GameContext, when given, supplies the schedule and game feeds.
 
     Returns:
         list: A list of tuples containing (inning, halfInning, event, description, utc, home_team,
               visiting_team, home_score, visiting_score, outs, people_on_base, captivatingIndex, game_id).
     """
-    s = statsapi.schedule(team=TEAM_ID, start_date=date, end_date=date)
+    if context is not None:
+        s = context.schedule
+    else:
+        s = throttled(
+            "statsapi.schedule",
+            statsapi.schedule,
+            team=TEAM_ID,
+            start_date=date,
+            end_date=date,
+        )
+        s.sort(key=lambda g: g["game_date"])
     if not s:
         raise SystemExit(f"No games found for the TEAM_ID={TEAM_ID} on {date}.")
-    s.sort(key=lambda g: g["game_date"])
 
-    rows = []
+    # (play, home_team, visiting_team, game_id) per row; timestamps are
+    # converted for all plays at once below.
+    entries = []
 
     # Loop through ALL games on that date (handle double headers)
     for game in s:
         gp = game["game_id"]
-        data = fetch_game_data(gp)
+        data = context.feed(gp) if context is not None else fetch_game_data(gp)
         home_team = (
             data.get("gameData", {})
             .get("teams", {})
@@ -96,15 +439,20 @@ def fetch_events(TEAM_ID, date):
         plays = parse_plays(data)
 
         for play in plays:
-            rows.append(create_event_row(play, home_team, visiting_team, gp, TEAM_ID))
+            entries.append((play, home_team, visiting_team, gp))
 
             # Ensure the final out of the game is registered as an event
             if play.get("about", {}).get("isGameEnd"):
-                rows.append(
-                    create_event_row(play, home_team, visiting_team, gp, TEAM_ID)
-                )
+                entries.append((play, home_team, visiting_team, gp))
 
-    return rows
+    abouts = [entry[0].get("about", {}) for entry in entries]
+    starts = utility.iso_to_utc_array([a.get("startTime") for a in abouts])
+    ends = utility.iso_to_utc_array([a.get("endTime") for a in abouts])
+    utc = starts.where(starts.notna(), ends)
+    return [
+        create_event_row(play, home_team, visiting_team, gp, TEAM_ID, utc=ts)
+        for (play, home_team, visiting_team, gp), ts in zip(entries, utc)
+    ]
 
 
 def get_team_abbreviation(team_name):
@@ -114,27 +462,21 @@ def get_team_abbreviation(team_name):
     ``AZ`` to ``ARI``, so the value matches the abbreviations stored on game
     events (which come straight from the statsapi payload).
     """
-    for team in info.get_all_teams():
-        if team.get("name", "").lower() == team_name.lower():
-            return team.get("abbreviation", "")
-    return None
+    team = info.get_team_by_name(team_name)
+    return team["abbreviation"] if team else None
 
 
 def team_record_on_date(team_id, date_str):
     """
     Get a team's record (W-L) on a given date.
+    The league-wide standings are fetched once per date and shared by all teams.
     team_id: int
     date_str: str
     """
-    standings = statsapi.standings_data(date=date_str)
-    for key, league in standings.items():
-        for team in league.get("teams", []):
-            if team.get("team_id") == team_id:
-                return team.get("w"), team.get("l")
-    return 0, 0
+    return get_league_snapshot(date_str).team_record(team_id)
 
 
-def fetch_game_ids(team_acronym, date=None):
+def fetch_game_ids(team_acronym, date=None, context=None):
     """
     Fetch all game IDs for the specified team on a given date.
     NOTE: We prepend the team_id to the game_id to ensure uniqueness in team_acronym lookups
@@ -143,19 +485,34 @@ def fetch_game_ids(team_acronym, date=None):
     """
     if not date:
         raise ValueError("You must provide 'date' (MM/DD/YYYY) for fetching game ids.")
-    TEAM_ID = info.get_team_info(team_acronym, "team_id")
-    game_ids = []
-    date_str = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
-    s = statsapi.schedule(team=TEAM_ID, start_date=date_str, end_date=date_str)
-    for g in s:
-        game_ids.append(f"{TEAM_ID}{g['game_id']}")
-    return game_ids
+    context = context or GameContext(team_acronym, date)
+    return context.game_ids
+
+
+def fetch_game_ids_range(team_acronym, start_date, end_date, contexts=None):
+    """
+    Fetch game IDs for the specified team over a date range with one schedule call.
+    NOTE: We prepend the team_id to the game_id, as in ``fetch_game_ids``.
 
+    Args:
+        start_date (str): First date (MM/DD/YYYY), inclusive.
+        end_date (str): Last date (MM/DD/YYYY), inclusive.
+        contexts (dict, optional): ``{date: GameContext}`` from
+            ``game_contexts_for_range``, reused instead of a new schedule call.
 
-def fetch_mlb_games(team_acronym, date=None):
+    Returns:
+        dict: ``{date (MM/DD/YYYY): [game IDs]}`` for dates with scheduled games.
+    """
+    if contexts is None:
+        contexts = game_contexts_for_range(team_acronym, start_date, end_date)
+    return {date: ctx.game_ids for date, ctx in contexts.items() if ctx.game_ids}
+
+
+def fetch_mlb_games(team_acronym, date=None, context=None):
     """
     Fetch all game results for the specified team on a given date.
     Handles potential double headers in the statsapi response by returning a list of tuples.
+    A GameContext, when given, supplies the schedule and record.
 
     Returns:
         list of tuples in the form:
@@ -166,18 +523,15 @@ def fetch_mlb_games(team_acronym, date=None):
     if len(date.split("/")) != 3:
         raise ValueError("Date must be in MM/DD/YYYY format.")
 
-    TEAM_ID = info.get_team_info(team_acronym, "team_id")
-
-    date_str = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
+    context = context or GameContext(team_acronym, date)
+    TEAM_ID = context.team_id
+    date_str = context.date
 
-    s = statsapi.schedule(team=TEAM_ID, start_date=date_str, end_date=date_str)
+    s = context.schedule
     if not s:
         return []
 
-    # Sort games (handles double headers)
-    s.sort(key=lambda g: g["game_date"])
-
-    wins, losses = team_record_on_date(TEAM_ID, date_str)
+    wins, losses = context.record
 
     results = []
     for g in s:
@@ -191,8 +545,8 @@ def fetch_mlb_games(team_acronym, date=None):
                     f"{TEAM_ID}{g['game_id']}",
                     date_str,
                     time_str,
-                    get_team_abbreviation(g["home_name"]),
-                    get_team_abbreviation(g["away_name"]),
+                    context.abbreviation(g["home_name"]),
+                    context.abbreviation(g["away_name"]),
                     g["home_score"],
                     g["away_score"],
                     wins,
@@ -1,13 +1,26 @@
+import heapq
+import itertools
 import re
+import time
+from collections import deque
+
+from praw.endpoints import API_PATH
+from praw.models import MoreComments
 
 from mlb_sentiment import info
 from mlb_sentiment import config
 from mlb_sentiment import utility
-from mlb_sentiment.fetch.mlb import fetch_game_ids
+from mlb_sentiment.fetch.mlb import fetch_game_ids_range
 
-from mlb_sentiment.models.process import get_sentiment, SentimentModelType
+from mlb_sentiment.models.process import (
+    DEFAULT_BATCH_SIZE,
+    MODEL_TAGS,
+    SentimentModelType,
+    get_sentiments,
+    scoring_revision,
+)
 from tqdm import tqdm
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 def _is_game_thread(title):
@@ -35,8 +48,12 @@ def _subreddit_name(team_acronym):
     return info.get_team_info(team_acronym, "subreddit").split("/r/")[1].strip("/")
 
 
-def _collect_game_threads(submissions, team_acronym, date, start_dt):
-    """Pull game-thread posts for ``date`` from a newest-first submission stream."""
+def _collect_game_threads(submissions, team_acronym, start_dt, end_dt):
+    """
+    Pull game-thread posts dated ``start_dt``..``end_dt`` (inclusive, Eastern
+    calendar days) from a newest-first submission stream, stopping at the
+    first game thread older than ``start_dt``.
+    """
     posts = []
     for submission in submissions:
         if not _is_game_thread(submission.title):
@@ -45,130 +62,441 @@ def _collect_game_threads(submissions, team_acronym, date, start_dt):
         created_est_dt = datetime.strptime(created_est_str, "%Y-%m-%d %H:%M:%S")
         post_date_str = created_est_dt.strftime("%m/%d/%Y")
         post_dt = datetime.strptime(post_date_str, "%m/%d/%Y")
-        if date and post_date_str == date:
+        if start_dt <= post_dt <= end_dt:
             posts.append(
                 {
                     "title": submission.title,
                     "url": submission.url,
                     "created_est": created_est_str,
+                    "created_utc": submission.created_utc,
                     "score": submission.score,
                     "subreddit": str(submission.subreddit),
                     "team_acronym": team_acronym,
                     "num_comments": submission.num_comments,
                     "created_est_dt": created_est_dt,
+                    "post_date": post_date_str,
                     # game_id will be added later
                 }
             )
-        if start_dt and post_dt < start_dt:
+        if post_dt < start_dt:
             break
     return posts
 
 
-def fetch_reddit_posts(team_acronym, date=None):
+def fetch_reddit_posts_range(
+    team_acronym, start_date, end_date, reddit=None, contexts=None
+):
     """
-    Fetch game thread posts for a team on a specific date (MM/DD/YYYY).
+    Fetch game thread posts for a team over a date range in one listing pass.
 
-    The configured ``game_thread_user`` bot is tried first; if it isn't set or
-    hasn't posted a matching thread, the team subreddit is scanned by title as a
-    fallback. Both sources return newest-first, so the early ``break`` on older
-    posts holds either way.
+    The bot (or subreddit) listing is walked once, newest-first, until it
+    passes ``start_date``. Dates the bot has no thread for are then filled
+    from a single subreddit title scan (off days are not scanned for). Game
+    ids come from one schedule call for the whole range and are assigned
+    chronologically within each day.
 
     Args:
         team_acronym (str): Acronym of the MLB team (e.g., "NYM" for New York Mets).
-        date (str, optional): Date in MM/DD/YYYY format to filter posts.
+        start_date (str): First date (MM/DD/YYYY), inclusive.
+        end_date (str): Last date (MM/DD/YYYY), inclusive.
+        reddit (praw.Reddit, optional): Shared client; a new one is built if omitted.
+        contexts (dict, optional): ``{date: GameContext}`` supplying the schedule.
 
     Returns:
-        list: A list of dictionaries containing game thread post details for the specified date.
+        dict: ``{date (MM/DD/YYYY): [post dicts]}`` for every date in the range;
+        dates without a game thread map to an empty list.
     """
 
     MAX_LOOKUP = 1000
-    reddit = config.load_reddit_client()
-    start_dt = datetime.strptime(date, "%m/%d/%Y") if date else None
+    reddit = reddit or config.load_reddit_client()
+    start_dt = datetime.strptime(start_date, "%m/%d/%Y")
+    end_dt = datetime.strptime(end_date, "%m/%d/%Y")
+    if end_dt < start_dt:
+        raise ValueError(f"end_date {end_date} is before start_date {start_date}.")
+    dates = [
+        (start_dt + timedelta(days=i)).strftime("%m/%d/%Y")
+        for i in range((end_dt - start_dt).days + 1)
+    ]
+    by_date = {d: [] for d in dates}
+
+    # Get game_ids for the whole range at once
+    game_ids = fetch_game_ids_range(
+        team_acronym, start_date, end_date, contexts=contexts
+    )
 
-    posts = []
     bot = info.get_team_info(team_acronym, "game_thread_user")
     if bot:
-        posts = _collect_game_threads(
+        for post in _collect_game_threads(
             reddit.redditor(bot).submissions.new(limit=MAX_LOOKUP),
             team_acronym,
-            date,
             start_dt,
-        )
-    if not posts:
-        # No bot configured, or the bot had no matching thread: scan the sub.
-        posts = _collect_game_threads(
+            end_dt,
+        ):
+            by_date[post["post_date"]].append(post)
+
+    missing = [d for d in dates if not by_date[d] and d in game_ids]
+    if missing:
+        # No bot configured, or the bot had no matching thread: scan the sub
+        # once, down to the oldest date still missing.
+        for post in _collect_game_threads(
             reddit.subreddit(_subreddit_name(team_acronym)).new(limit=MAX_LOOKUP),
             team_acronym,
-            date,
-            start_dt,
-        )
+            datetime.strptime(missing[0], "%m/%d/%Y"),
+            datetime.strptime(missing[-1], "%m/%d/%Y"),
+        ):
+            if post["post_date"] in missing:
+                by_date[post["post_date"]].append(post)
 
-    # Sort posts chronologically
-    posts.sort(key=lambda p: p["created_est_dt"])
+    for date, posts in by_date.items():
+        # Assign game_id to each post (chronologically within the day)
+        posts.sort(key=lambda p: p["created_est_dt"])
+        day_ids = game_ids.get(date, [])
+        for i, post in enumerate(posts):
+            post["game_id"] = day_ids[i] if i < len(day_ids) else None
+            del post["created_est_dt"]  # Remove temp fields
+            del post["post_date"]
 
-    # Get game_ids for the date/range
-    game_ids = fetch_game_ids(team_acronym, date=date) if date else []
+    return by_date
 
-    # Assign game_id to each post (chronologically)
-    for i, post in enumerate(posts):
-        post["game_id"] = game_ids[i] if i < len(game_ids) else None
-        del post["created_est_dt"]  # Remove temp field
 
-    return posts
+def fetch_reddit_posts(team_acronym, date=None, reddit=None, context=None):
+    """
+    Fetch game thread posts for a team on a specific date (MM/DD/YYYY).
 
+    The configured ``game_thread_user`` bot is tried first; if it isn't set or
+    hasn't posted a matching thread, the team subreddit is scanned by title as a
+    fallback. Both sources return newest-first, so the early ``break`` on older
+    posts holds either way. See ``fetch_reddit_posts_range`` for multi-day
+    backfills.
 
-def fetch_reddit_comments(posts, limit=500, sentiment_model=SentimentModelType.NULL):
+    Args:
+        team_acronym (str): Acronym of the MLB team (e.g., "NYM" for New York Mets).
+        date (str, optional): Date in MM/DD/YYYY format to filter posts.
+        reddit (praw.Reddit, optional): Shared client; a new one is built if omitted.
+        context (GameContext, optional): Supplies the day's schedule for game ids.
+
+    Returns:
+        list: A list of dictionaries containing game thread post details for the specified date.
+    """
+    if not date:
+        return []
+    date = datetime.strptime(date, "%m/%d/%Y").strftime("%m/%d/%Y")
+    contexts = {date: context} if context is not None else None
+    return fetch_reddit_posts_range(
+        team_acronym, date, date, reddit=reddit, contexts=contexts
+    )[date]
+
+
+# Sort orders re-downloaded by the legacy "sorts" fetch mode.
+SORT_ORDERS = ["new", "old", "top", "controversial", "best"]
+
+# Reddit's /api/morechildren endpoint accepts at most 100 comment ids per call.
+MORECHILDREN_BATCH = 100
+
+
+def _walk_comment_tree(nodes):
+    """
+    Flatten a comment listing into (comments, MoreComments stubs).
+
+    The walk is breadth-first, so comments keep the listing's order: every
+    top-level comment in sort order, then their replies, and so on. A
+    ``limit`` cut then keeps the highest-ranked comments.
+    """
+    comments, stubs = [], []
+    queue = deque(nodes)
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, MoreComments):
+            stubs.append(node)
+            continue
+        comments.append(node)
+        queue.extend(node.replies)
+    return comments, stubs
+
+
+def _next_more_batch(pending):
+    """Pop the next group of stubs to resolve in one API request.
+
+    ``pending`` is a heap of ``(priority, order, stub)`` entries. Regular
+    stubs are packed together until their children fill one
+    ``morechildren`` call; a "continue this thread" stub (``count == 0``, no
+    children) is always resolved on its own.
+    """
+    stub = heapq.heappop(pending)[2]
+    if not stub.children:
+        return [stub], []
+    stubs, children = [stub], list(stub.children)
+    while (
+        pending
+        and pending[0][2].children
+        and len(children) + len(pending[0][2].children) <= MORECHILDREN_BATCH
+    ):
+        stub = heapq.heappop(pending)[2]
+        stubs.append(stub)
+        children.extend(stub.children)
+    return stubs, children
+
+
+def expand_comment_tree(
+    reddit, submission, max_requests=32, max_seconds=None, limit=0, since=None
+):
     """
-    Fetch comments for Reddit game threads, combining multiple sort orders
-    (old, new, top, controversial) to maximize coverage.
-    Ensures no duplicate comments are saved.
+    Flatten a submission's comment tree, expanding MoreComments under a budget.
+
+    The tree is downloaded once; collapsed branches are then resolved
+    largest-first, packing the children of several stubs into each
+    ``/api/morechildren`` request. Expansion stops when the request or time
+    budget runs out, when ``limit`` comments have been collected, or when no
+    stubs remain.
+
+    With ``since`` (for a ``comment_sort = "new"`` submission) branches are
+    resolved in listing order, newest first, and expansion also stops once a
+    download holds no comment created at or after ``since``. Late replies
+    collapsed under older comments can be missed; a full fetch finds them.
+
+    Args:
+        reddit (praw.Reddit): Client used for the ``morechildren`` requests.
+        submission (praw.models.Submission): The game thread.
+        max_requests (int, optional): Max expansion requests (None = no cap, 0 = none).
+        max_seconds (float, optional): Wall-clock budget for expansion (None = no cap).
+        limit (int): Stop once this many comments are collected (0 = all available).
+        since (float, optional): Epoch seconds; stop expanding past older comments.
+
+    Returns:
+        tuple: (list of praw Comment objects, dict of expansion stats with
+        ``requests`` made and ``pending`` stubs left unexpanded).
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    order = itertools.count()
+    pending = []
+
+    def add(stubs):
+        for stub in stubs:
+            priority = 0 if since is not None else -stub.count
+            heapq.heappush(pending, (priority, next(order), stub))
+
+    def has_late(batch):
+        return since is None or any(c.created_utc >= since for c in batch)
+
+    comments, stubs = _walk_comment_tree(submission.comments)
+    add(stubs)
+    requests = 0
+    late = has_late(comments)
+
+    while pending and late:
+        if max_requests is not None and requests >= max_requests:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if limit > 0 and len(comments) >= limit:
+            break
+
+        stubs, children = _next_more_batch(pending)
+        if children:
+            batch = reddit.post(
+                API_PATH["morechildren"],
+                data={
+                    "children": ",".join(children),
+                    "link_id": submission.fullname,
+                    "sort": submission.comment_sort,
+                },
+            )
+        else:
+            stubs[0].submission = submission
+            batch = stubs[0].comments()
+        requests += 1
+
+        new_comments, new_stubs = _walk_comment_tree(batch)
+        comments.extend(new_comments)
+        for stub in new_stubs:
+            stub.submission = submission
+        add(new_stubs)
+        late = has_late(new_comments)
+
+    if limit > 0:
+        comments = comments[:limit]
+    return comments, {"requests": requests, "pending": len(pending)}
+
+
+def _iter_sorted_comments(reddit, post_url, limit):
+    """Legacy mode: re-download the thread once per sort order."""
+    for sort in SORT_ORDERS:
+        submission = reddit.submission(url=post_url)
+        submission.comment_sort = sort
+        submission.comments.replace_more(limit=0)
+
+        # Get flattened list
+        comment_list = submission.comments.list()
+        if limit > 0:
+            comment_list = comment_list[:limit]
+        yield sort, comment_list
+
+
+def fetch_reddit_comments(
+    posts,
+    limit=500,
+    sentiment_model=SentimentModelType.NULL,
+    mode="single",
+    more_requests=32,
+    more_seconds=60.0,
+    batch_size=DEFAULT_BATCH_SIZE,
+    reddit=None,
+    since_utc=None,
+):
+    """
+    Fetch comments for Reddit game threads. Ensures no duplicate comments are saved.
+    Comment texts are collected first and then scored in bulk (see ``score_comments``).
+
+    Two fetch modes are supported:
+
+    - ``"single"``: download each thread's comment tree once and expand
+      collapsed (MoreComments) branches in batched requests, within the
+      ``more_requests`` / ``more_seconds`` budget.
+    - ``"sorts"``: the legacy mode, combining multiple sort orders (new, old,
+      top, controversial, best) without expanding collapsed branches.
 
     Args:
         posts (list): A list of post dictionaries as returned by fetch_reddit_posts.
-        limit (int): Max number of comments to pull per sort order (0 = all available).
-        sentiment_model (SentimentModelType): Sentiment model to apply.
+        limit (int): Max number of comments to pull per thread in "single" mode, or
+            per sort order in "sorts" mode (0 = all available).
+        sentiment_model (SentimentModelType): Sentiment model to apply. ``None``
+            leaves the comments unscored so a caller can score them later.
+        mode (str): "single" or "sorts".
+        more_requests (int, optional): Max MoreComments expansion requests per thread
+            in "single" mode (None = no cap).
+        more_seconds (float, optional): Max seconds spent expanding MoreComments per
+            thread in "single" mode (None = no cap).
+        batch_size (int): Comments per sentiment-model forward pass.
+        reddit (praw.Reddit, optional): Shared client; a new one is built if omitted.
+        since_utc (dict, optional): ``{game_id: epoch seconds}``; only comments
+            created at or after that time are kept (and scored) for the game.
+            Used to pick up late comments on threads already stored: the
+            thread is read newest-first and expansion stops at older comments.
 
     Returns:
         list: A list of dictionaries containing comment details (deduplicated).
     """
-    reddit = config.load_reddit_client()
+    if mode not in ("single", "sorts"):
+        raise ValueError(f"Unsupported comment fetch mode: {mode}")
+
+    reddit = reddit or config.load_reddit_client()
     comments = []
     seen_ids = set()  # track comment.id to avoid duplicates
 
-    sort_orders = ["new", "old", "top", "controversial", "best"]
-
     for post in posts:
         post_url = post["url"]
         game_id = post.get("game_id")
+        since = (since_utc or {}).get(str(game_id))
 
-        for sort in sort_orders:
+        if mode == "single":
             submission = reddit.submission(url=post_url)
-            submission.comment_sort = sort
-            submission.comments.replace_more(limit=0)
-
-            # Get flattened list
-            comment_list = submission.comments.list()
-            if limit > 0:
-                comment_list = comment_list[:limit]
+            if since is not None:
+                submission.comment_sort = "new"  # late comments come first
+            comment_list, stats = expand_comment_tree(
+                reddit,
+                submission,
+                max_requests=more_requests,
+                max_seconds=more_seconds,
+                limit=limit,
+                since=since,
+            )
+            tqdm.write(
+                f"Expanded {stats['requests']} MoreComments batch(es) for {post_url} "
+                f"({stats['pending']} left unexpanded)"
+            )
+            batches = [("single", comment_list)]
+        else:
+            batches = _iter_sorted_comments(reddit, post_url, limit)
 
+        for sort, comment_list in batches:
             for comment in tqdm(
                 comment_list, desc=f"Parsing Reddit Comments ({sort})", position=0
             ):
                 if comment.id in seen_ids:
                     continue  # skip duplicates
                 seen_ids.add(comment.id)
+                # Same-second comments are re-fetched; a merging save dedupes them.
+                if since is not None and comment.created_utc < since:
+                    continue
 
                 comments.append(
                     {
+                        "id": comment.id,
+                        "parent_id": comment.parent_id,
                         "game_id": game_id,
                         "author": str(comment.author),
                         "text": comment.body,
                         "created_utc": comment.created_utc,
-                        "sentiment": get_sentiment(comment.body, sentiment_model),
                     }
                 )
 
+    if sentiment_model is not None:
+        score_comments(comments, sentiment_model, batch_size=batch_size)
+
     # Sort final results chronologically
     comments.sort(key=lambda c: c["created_utc"])
 
     return comments
+
+
+def stream_thread_comments(reddit, post, team_acronym, pause_after=0):
+    """
+    Follow a game thread's new comments as they are posted.
+
+    Reddit only streams whole subreddits, so the team subreddit's comment
+    stream is filtered down to the thread. PRAW deduplicates the stream and
+    backs off between polls.
+
+    Args:
+        reddit (praw.Reddit): Client to stream with.
+        post (dict): The game thread, as returned by fetch_reddit_posts.
+        team_acronym (str): Team whose subreddit hosts the thread.
+        pause_after (int): Idle polls before yielding ``None`` (0 = after every
+            empty poll), so the caller can act on time between comments.
+
+    Yields:
+        dict or None: Unscored comment dictionaries (the same shape as
+        fetch_reddit_comments), or ``None`` when the stream is idle.
+    """
+    link_id = reddit.submission(url=post["url"]).fullname
+    stream = reddit.subreddit(_subreddit_name(team_acronym)).stream.comments(
+        pause_after=pause_after
+    )
+    for comment in stream:
+        if comment is None:
+            yield None
+        elif comment.link_id == link_id:
+            yield {
+                "id": comment.id,
+                "parent_id": comment.parent_id,
+                "game_id": post.get("game_id"),
+                "author": str(comment.author),
+                "text": comment.body,
+                "created_utc": comment.created_utc,
+            }
+
+
+def score_comments(comments, sentiment_model, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Score fetched comments in bulk, setting each comment's ``sentiment`` in place.
+    A real model also tags each result with its ``model`` tag and ``revision``,
+    which ``save_reddit_comments`` stores next to the scores.
+
+    Args:
+        comments (list): Comment dictionaries as returned by fetch_reddit_comments.
+        sentiment_model (SentimentModelType): Sentiment model to apply.
+        batch_size (int): Comments per sentiment-model forward pass.
+
+    Returns:
+        list: The same comment dictionaries, now carrying ``sentiment``.
+    """
+    sentiments = get_sentiments(
+        [c["text"] for c in comments], sentiment_model, batch_size=batch_size
+    )
+    tag = MODEL_TAGS.get(sentiment_model)
+    revision = scoring_revision(sentiment_model) if tag and comments else None
+    for comment, sentiment in zip(comments, sentiments):
+        if tag:
+            sentiment.update(model=tag, revision=revision)
+        comment["sentiment"] = sentiment
+    return comments
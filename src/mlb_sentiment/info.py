@@ -1,6 +1,12 @@
-import statsapi
+import json
+import os
+from datetime import datetime
 from functools import lru_cache
 
+import statsapi
+
+from mlb_sentiment.scheduler import throttled
+
 # All 30 clubs, keyed by their MLB Stats API abbreviation (Arizona is "AZ").
 #
 # "game_thread_user" is OPTIONAL. When present, that bot's submissions are read
@@ -98,10 +104,94 @@ SUBREDDIT_INFO = {
 PROCESSED_TEAMS = sorted(SUBREDDIT_INFO)
 
 
-@lru_cache(maxsize=1)
+# Bundled team registry: ids, names and abbreviations for the 30 MLB clubs, so
+# team lookups never hit the network. Regenerate with
+# ``mlb-sentiment refresh-teams`` after a rename or relocation.
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), "teams.json")
+
+
+def _load_registry(path=REGISTRY_PATH):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+_REGISTRY = _load_registry()
+TEAM_REGISTRY_VERSION = _REGISTRY["version"]
+
+# Lookup indexes, built once at import.
+_TEAMS_BY_ID = {team["id"]: team for team in _REGISTRY["teams"]}
+_TEAMS_BY_NAME = {team["name"].lower(): team for team in _REGISTRY["teams"]}
+_TEAMS_BY_ABBREVIATION = {team["abbreviation"]: team for team in _REGISTRY["teams"]}
+for _alias, _abbr in _REGISTRY.get("aliases", {}).items():
+    _TEAMS_BY_ABBREVIATION.setdefault(_alias, _TEAMS_BY_ABBREVIATION[_abbr])
+
+
 def get_all_teams():
-    """Return the raw list of MLB team records from statsapi (cached)."""
-    return statsapi.get("teams", {}).get("teams", [])
+    """Return the MLB team records from the bundled registry."""
+    return _REGISTRY["teams"]
+
+
+def get_team_by_name(team_name):
+    """Return the registry record for a full team name, or None."""
+    return _TEAMS_BY_NAME.get(team_name.lower())
+
+
+def fetch_all_teams():
+    """Return the live MLB team records from statsapi (used to refresh the registry)."""
+    teams = throttled("statsapi.teams", statsapi.get, "teams", {"sportId": 1})
+    return teams.get("teams", [])
+
+
+def refresh_team_registry(path=REGISTRY_PATH):
+    """
+    Regenerate the bundled registry from statsapi.
+
+    The registry version is bumped only when the team records change.
+
+    Returns:
+        dict: The registry that was written.
+    """
+    teams = sorted(
+        (
+            {
+                "id": t["id"],
+                "name": t["name"],
+                "abbreviation": t["abbreviation"],
+                "teamCode": t.get("teamCode"),
+                "teamName": t.get("teamName"),
+                "locationName": t.get("locationName"),
+                "shortName": t.get("shortName"),
+                "league": {
+                    "id": t.get("league", {}).get("id"),
+                    "name": t.get("league", {}).get("name"),
+                },
+                "division": {
+                    "id": t.get("division", {}).get("id"),
+                    "name": t.get("division", {}).get("name"),
+                },
+            }
+            for t in fetch_all_teams()
+            if t.get("league", {}).get("name") in ("National League", "American League")
+        ),
+        key=lambda t: t["id"],
+    )
+    current = _load_registry(path) if os.path.exists(path) else None
+    version = 1
+    if current is not None:
+        version = current["version"] + (current["teams"] != teams)
+    registry = {
+        "version": version,
+        "generated_at": datetime.now().strftime("%Y-%m-%d"),
+        "source": "statsapi teams (sportId=1)",
+        "aliases": current["aliases"] if current else {"ARI": "AZ"},
+        "teams": teams,
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(registry, fh, indent=2)
+        fh.write("\n")
+    os.replace(tmp, path)
+    return registry
 
 
 # Safe access of TEAM_INFO
@@ -117,13 +207,9 @@ def get_team_info(team_acronym, key):
         # Optional: teams without a bot fall back to a subreddit title scan.
         return SUBREDDIT_INFO.get(team_acronym, {}).get("game_thread_user")
 
-    team_name = get_team_name_from_team_acronym(team_acronym)
-    if team_name is None:
-        raise ValueError(f"Invalid team acronym: {team_acronym}")
-    team_info = statsapi.lookup_team(team_name)
-    if not team_info:
+    team_info = _TEAMS_BY_ABBREVIATION.get(team_acronym)
+    if team_info is None:
         raise ValueError(f"Invalid team acronym: {team_acronym}")
-    team_info = team_info[0]  # lookup_team returns a list
 
     if key == "team_id":
         key = "id"  # statsapi uses 'id' instead of 'team_id'
@@ -134,30 +220,34 @@ def get_team_info(team_acronym, key):
 
 # Get team acronym from game id
 def get_team_acronym_from_game_id(game_id):
-    first_three = game_id[:3]
-    team_info = statsapi.get("team", {"teamId": first_three})
-    if team_info and "teams" in team_info and len(team_info["teams"]) > 0:
-        return team_info["teams"][0].get("abbreviation")
-    return None
+    try:
+        team_info = _TEAMS_BY_ID.get(int(str(game_id)[:3]))
+    except ValueError:
+        return None
+    return team_info["abbreviation"] if team_info else None
+
+
+# Get the statsapi gamePk from a team-prefixed game id
+def get_game_pk_from_game_id(game_id):
+    """Strip the 3-digit team id that ``fetch_game_ids`` prepends to a gamePk."""
+    return int(str(game_id)[3:])
 
 
 # Get team acronym from team name
 def get_team_acronym_from_team_name(team_name):
-    for team in get_all_teams():
-        if team.get("name", "").lower() == team_name.lower():
-            abbr = team.get("abbreviation", None)
-            if abbr == "AZ":
-                abbr = "ARI"
-            return abbr
-    return None
+    team = get_team_by_name(team_name)
+    if team is None:
+        return None
+    abbr = team["abbreviation"]
+    if abbr == "AZ":
+        abbr = "ARI"
+    return abbr
 
 
 # Get team name from team acronym
 def get_team_name_from_team_acronym(team_acronym):
-    for team in get_all_teams():
-        if team.get("abbreviation", "") == team_acronym:
-            return team.get("name", "")
-    return None
+    team = _TEAMS_BY_ABBREVIATION.get(team_acronym)
+    return team["name"] if team else None
 
 
 # Return list of all team acronyms
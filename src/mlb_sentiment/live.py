@@ -0,0 +1,148 @@
+"""Live in-game ingestion.
+
+``mlb-sentiment live`` follows the active game thread while the game is on,
+scores new comments in micro-batches and writes them as small rolling Parquet
+segments (schema v4, like the daily files)::
+
+    <data>/live/<TEAM>/<TEAM>_<YYYY-MM-DD>_<gamePk>_<seq>_comments.parquet
+
+A segment is flushed every ``flush_seconds`` or ``flush_comments`` comments,
+whichever comes first, so at most one segment's worth of comments is held in
+memory. The segments live outside ``<data>/<TEAM>/``, so the nightly build
+never counts them next to the day's regular files;
+``pipeline/build_site_data.py --live`` reads them to refresh the game's
+``per_game`` sentiment series in place.
+"""
+
+import os
+import time
+
+import statsapi
+
+from mlb_sentiment.database.reddit import save_reddit_comments
+from mlb_sentiment.fetch.reddit import score_comments, stream_thread_comments
+from mlb_sentiment.models.process import DEFAULT_BATCH_SIZE
+from mlb_sentiment.scheduler import throttled
+
+LIVE_DIR = "live"
+
+# statsapi ``schedule`` statuses after which the thread is no longer followed.
+FINISHED_STATUSES = {"Final", "Game Over", "Completed Early", "Postponed", "Cancelled"}
+
+
+def segment_path(data_dir, team_acronym, day, game_id, seq):
+    """Return the path of a game's ``seq``-th live segment."""
+    return os.path.join(
+        data_dir,
+        LIVE_DIR,
+        team_acronym,
+        f"{team_acronym}_{day:%Y-%m-%d}_{game_id}_{seq:05d}_comments.parquet",
+    )
+
+
+def game_finished(game_id):
+    """
+    True once statsapi reports the game as over (or called off). ``game_id``
+    is the raw gamePk, not the team-prefixed id posts and comments carry.
+    """
+    games = throttled("statsapi.schedule", statsapi.schedule, game_id=game_id)
+    return bool(games) and games[0].get("status") in FINISHED_STATUSES
+
+
+class SegmentWriter:
+    """
+    Buffer streamed comments and flush them, scored, as rolling segments.
+
+    Args:
+        data_dir (str): Root directory for per-team Parquet output.
+        team_acronym (str): Team being followed.
+        day (datetime.date): Game day, used in segment names.
+        game_id: gamePk of the followed game.
+        sentiment_model (SentimentModelType): Model for the micro-batches.
+        flush_seconds (float): Max age of the oldest buffered comment.
+        flush_comments (int): Max buffered comments.
+        batch_size (int): Comments per sentiment-model forward pass.
+    """
+
+    def __init__(
+        self,
+        data_dir,
+        team_acronym,
+        day,
+        game_id,
+        sentiment_model,
+        flush_seconds=30.0,
+        flush_comments=200,
+        batch_size=DEFAULT_BATCH_SIZE,
+        clock=time.monotonic,
+    ):
+        self.data_dir = data_dir
+        self.team_acronym = team_acronym
+        self.day = day
+        self.game_id = game_id
+        self.sentiment_model = sentiment_model
+        self.flush_seconds = flush_seconds
+        self.flush_comments = max(1, flush_comments)
+        self.batch_size = batch_size
+        self._clock = clock
+        self._buffer = []
+        self._since = None
+        self.stats = {"comments": 0, "segments": 0}
+        # Resume numbering after an interrupted run instead of overwriting.
+        while os.path.exists(self._path(self.stats["segments"])):
+            self.stats["segments"] += 1
+
+    def _path(self, seq):
+        return segment_path(
+            self.data_dir, self.team_acronym, self.day, self.game_id, seq
+        )
+
+    def add(self, comment):
+        """Buffer one comment, flushing if a size or age limit is reached."""
+        if not self._buffer:
+            self._since = self._clock()
+        self._buffer.append(comment)
+        self.tick()
+
+    def tick(self):
+        """Flush if the buffer is full or its oldest comment is too old."""
+        if len(self._buffer) >= self.flush_comments or (
+            self._buffer and self._clock() - self._since >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self):
+        """Score the buffered comments in one batch and write them as a segment."""
+        if not self._buffer:
+            return None
+        comments, self._buffer = self._buffer, []
+        score_comments(comments, self.sentiment_model, batch_size=self.batch_size)
+        path = self._path(self.stats["segments"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        save_reddit_comments(comments, filename=path)
+        self.stats["comments"] += len(comments)
+        self.stats["segments"] += 1
+        return path
+
+
+def follow_game(reddit, post, team_acronym, writer, status_seconds=120.0):
+    """
+    Stream a game thread into ``writer`` until the game is over.
+
+    The game status is polled every ``status_seconds``; the buffer is flushed
+    one last time on exit, including on Ctrl-C.
+    """
+    next_status = time.monotonic() + status_seconds
+    try:
+        for comment in stream_thread_comments(reddit, post, team_acronym):
+            if comment is None:
+                writer.tick()
+            else:
+                writer.add(comment)
+            if time.monotonic() >= next_status:
+                if game_finished(writer.game_id):
+                    break
+                next_status = time.monotonic() + status_seconds
+    finally:
+        writer.flush()
+    return writer.stats
@@ -0,0 +1,206 @@
+"""Content-addressed cache of sentiment results, shared across runs and models.
+
+Results are keyed by (model id, model revision, SHA-1 of the scored text), so
+a repeated comment ("LFGM", "lol") costs one lookup instead of a forward pass,
+and a model upgrade never serves stale scores. Two tiers sit in front of the
+models: an in-memory LRU, and an optional SQLite file that persists across
+runs and is trimmed back under ``max_bytes`` by evicting the least recently
+used entries. ``get_sentiments`` in ``process.py`` consults the process-wide
+cache (see ``configure_sentiment_cache``).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Result = Tuple[str, float]
+
+# Digests per SQL statement (SQLite caps bound parameters per query).
+_SQL_CHUNK = 500
+
+
+def text_digest(text: str) -> bytes:
+    """SHA-1 of a text as scored."""
+    return hashlib.sha1(text.encode("utf-8")).digest()
+
+
+class SentimentCache:
+    """
+    Two-tier (memory LRU + optional SQLite file) cache of (emotion, score).
+
+    Args:
+        path (str, optional): SQLite file for the persistent tier (None = memory only).
+        max_entries (int): Results kept in the in-memory LRU.
+        max_bytes (int): Size the SQLite file is trimmed back under.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 100_000,
+        max_bytes: int = 256 * 2**20,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evicted": 0}
+        self._entries: "OrderedDict[Tuple[str, str, bytes], Result]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Several processes (e.g. `score` workers) may share the file.
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS sentiment (
+                    model TEXT NOT NULL,
+                    revision TEXT NOT NULL,
+                    digest BLOB NOT NULL,
+                    emotion TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    used REAL NOT NULL,
+                    PRIMARY KEY (model, revision, digest)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS sentiment_used ON sentiment (used);
+                """)
+
+    def _remember(self, key: Tuple[str, str, bytes], result: Result) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(
+        self, model: str, revision: str, digests: Sequence[bytes]
+    ) -> List[Optional[Result]]:
+        """Cached results for ``digests`` (None where missing), counting hits."""
+        results: List[Optional[Result]] = [None] * len(digests)
+        missing: Dict[bytes, List[int]] = {}
+        with self._lock:
+            for i, digest in enumerate(digests):
+                key = (model, revision, digest)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    results[i] = self._entries[key]
+                    self.stats["hits"] += 1
+                else:
+                    missing.setdefault(digest, []).append(i)
+            if self._db is not None and missing:
+                found = self._read(model, revision, list(missing))
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE sentiment SET used = ? "
+                    "WHERE model = ? AND revision = ? AND digest = ?",
+                    [(now, model, revision, digest) for digest in found],
+                )
+                self._db.commit()
+                for digest, result in found.items():
+                    self._remember((model, revision, digest), result)
+                    for i in missing.pop(digest):
+                        results[i] = result
+                        self.stats["disk_hits"] += 1
+            self.stats["misses"] += sum(len(idx) for idx in missing.values())
+        return results
+
+    def _read(
+        self, model: str, revision: str, digests: List[bytes]
+    ) -> Dict[bytes, Result]:
+        found = {}
+        for start in range(0, len(digests), _SQL_CHUNK):
+            chunk = digests[start : start + _SQL_CHUNK]
+            rows = self._db.execute(
+                "SELECT digest, emotion, score FROM sentiment "
+                f"WHERE model = ? AND revision = ? AND digest IN "
+                f"({','.join('?' * len(chunk))})",
+                [model, revision, *chunk],
+            )
+            for digest, emotion, score in rows:
+                found[bytes(digest)] = (emotion, score)
+        return found
+
+    def put_many(
+        self, model: str, revision: str, items: Sequence[Tuple[bytes, Result]]
+    ) -> None:
+        """Store freshly scored ``(digest, (emotion, score))`` pairs in both tiers."""
+        with self._lock:
+            for digest, result in items:
+                self._remember((model, revision, digest), result)
+            if self._db is None or not items:
+                return
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (model, revision, digest, emotion, score, now)
+                    for digest, (emotion, score) in items
+                ],
+            )
+            self._db.commit()
+            self._evict()
+
+    def disk_bytes(self) -> int:
+        """Bytes of the SQLite file in use (free pages excluded)."""
+        if self._db is None:
+            return 0
+        page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+        free = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until the file fits ``max_bytes``."""
+        while self.disk_bytes() > self.max_bytes:
+            total = self._db.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+            if not total:
+                return
+            drop = max(1, total // 4)
+            self._db.execute(
+                "DELETE FROM sentiment WHERE (model, revision, digest) IN ("
+                "SELECT model, revision, digest FROM sentiment ORDER BY used LIMIT ?)",
+                (drop,),
+            )
+            self._db.commit()
+            self.stats["evicted"] += drop
+
+    def hit_rate(self) -> Optional[float]:
+        """Share of lookups answered from either tier (None before any lookup)."""
+        hits = self.stats["hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else None
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_SENTIMENT_CACHE = SentimentCache(path=os.getenv("MLB_SENTIMENT_CACHE"))
+
+
+def get_sentiment_cache() -> SentimentCache:
+    """Return the process-wide sentiment cache."""
+    return _SENTIMENT_CACHE
+
+
+def configure_sentiment_cache(
+    path: Optional[str] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> SentimentCache:
+    """
+    Replace the process-wide cache; ``path`` adds (or moves) the SQLite tier.
+    Unset sizes keep their current values.
+    """
+    global _SENTIMENT_CACHE
+    previous = _SENTIMENT_CACHE
+    _SENTIMENT_CACHE = SentimentCache(
+        path=path,
+        max_entries=max_entries or previous.max_entries,
+        max_bytes=max_bytes or previous.max_bytes,
+    )
+    previous.close()
+    return _SENTIMENT_CACHE
@@ -0,0 +1,258 @@
+"""Quantized ONNX Runtime backend for the Hugging Face sentiment models.
+
+``export_model`` converts a model in ``HUGGING_FACE_MODELS`` to ONNX once
+(torch is needed for this step only). It then applies dynamic int8
+quantization to the weights of the linear layers and saves the graph next to
+the tokenizer and config. ``OnnxSentimentPipeline`` serves that export through
+onnxruntime on the CPU and is called like a transformers
+``sentiment-analysis`` pipeline, so ``process.py`` scores it the same way. No
+torch is imported when serving.
+
+``compare`` scores the same texts with both backends and reports label
+agreement, the largest score difference and texts per second for each.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Where exports live unless MLB_ONNX_DIR / --onnx-dir says otherwise.
+DEFAULT_ONNX_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "mlb-sentiment", "onnx"
+)
+
+QUANTIZED_MODEL = "model.int8.onnx"
+EXPORT_INFO = "export.json"
+
+# Suffix on the model revision, so the sentiment cache keeps int8 results
+# apart from full-precision ones.
+REVISION_SUFFIX = "+onnx-int8"
+
+INPUT_NAMES = ("input_ids", "attention_mask")
+
+
+def export_dir(model_id: str, onnx_dir: Optional[str] = None) -> str:
+    """Folder holding the export of ``model_id``."""
+    return os.path.join(onnx_dir or DEFAULT_ONNX_DIR, model_id.replace("/", "--"))
+
+
+def exported_revision(model_id: str, onnx_dir: Optional[str] = None) -> Optional[str]:
+    """Cache revision of an existing export (None when not exported yet)."""
+    path = os.path.join(export_dir(model_id, onnx_dir), EXPORT_INFO)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["revision"] + REVISION_SUFFIX
+
+
+def export_model(model_id: str, onnx_dir: Optional[str] = None, opset: int = 14) -> str:
+    """
+    Export ``model_id`` to ONNX and quantize it to int8.
+
+    The export is written to a temporary folder and renamed into place, so a
+    failed or concurrent export never leaves a partial model behind.
+
+    Args:
+        model_id (str): Hugging Face model id (a ``SentimentModelType`` value).
+        onnx_dir (str, optional): Root folder of the exports.
+        opset (int): ONNX opset to export with.
+
+    Returns:
+        str: The export folder.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    target = export_dir(model_id, onnx_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id).eval()
+    sample = tokenizer(["Let's go Mets!"], return_tensors="pt")
+
+    staging = tempfile.mkdtemp(dir=os.path.dirname(target))
+    try:
+        full_precision = os.path.join(staging, "model.onnx")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in INPUT_NAMES),
+                full_precision,
+                input_names=list(INPUT_NAMES),
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=opset,
+            )
+        quantize_dynamic(
+            full_precision,
+            os.path.join(staging, QUANTIZED_MODEL),
+            weight_type=QuantType.QInt8,
+        )
+        os.remove(full_precision)
+        tokenizer.save_pretrained(staging)
+        model.config.save_pretrained(staging)
+        with open(os.path.join(staging, EXPORT_INFO), "w") as f:
+            json.dump(
+                {
+                    "model": model_id,
+                    "revision": getattr(model.config, "_commit_hash", None) or "main",
+                    "opset": opset,
+                    "quantization": "dynamic-int8",
+                },
+                f,
+                indent=2,
+            )
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def logits_to_results(
+    logits: np.ndarray, id2label: Dict[int, str]
+) -> List[Dict[str, Any]]:
+    """Top label and its probability per row, as a transformers pipeline returns."""
+    probabilities = _softmax(np.asarray(logits, dtype=np.float32))
+    best = probabilities.argmax(axis=-1)
+    return [
+        {"label": id2label[int(i)], "score": float(row[i])}
+        for i, row in zip(best, probabilities)
+    ]
+
+
+class OnnxSentimentPipeline:
+    """
+    A quantized export served by onnxruntime, callable like a transformers
+    ``sentiment-analysis`` pipeline.
+
+    Args:
+        path (str): Export folder written by ``export_model``.
+        threads (int, optional): Intra-op threads (default: ``OMP_NUM_THREADS``
+            when set, as in scoring pool workers, else onnxruntime's default).
+    """
+
+    def __init__(self, path: str, threads: Optional[int] = None):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        with open(os.path.join(path, "config.json")) as f:
+            id2label = json.load(f)["id2label"]
+        self.id2label = {int(i): label for i, label in id2label.items()}
+        with open(os.path.join(path, EXPORT_INFO)) as f:
+            self.revision = json.load(f)["revision"] + REVISION_SUFFIX
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        threads = threads or int(os.environ.get("OMP_NUM_THREADS", 0))
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, QUANTIZED_MODEL),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+
+    def __call__(
+        self,
+        texts: Sequence[str],
+        batch_size: int = 32,
+        max_length: int = 512,
+        truncation: bool = True,
+        padding: bool = True,
+        **_: Any,
+    ) -> List[Dict[str, Any]]:
+        texts = list(texts)
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=padding,
+                truncation=truncation,
+                max_length=max_length,
+                return_tensors="np",
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in INPUT_NAMES}
+            (logits,) = self.session.run(["logits"], feeds)
+            results.extend(logits_to_results(logits, self.id2label))
+        return results
+
+
+def load_pipeline(
+    model_id: str, onnx_dir: Optional[str] = None
+) -> OnnxSentimentPipeline:
+    """The ONNX pipeline for ``model_id``, exporting it first if needed."""
+    path = export_dir(model_id, onnx_dir)
+    if not os.path.exists(os.path.join(path, EXPORT_INFO)):
+        export_model(model_id, onnx_dir)
+    return OnnxSentimentPipeline(path)
+
+
+def _timed(pipeline: Any, texts: List[str], batch_size: int) -> tuple:
+    start = time.perf_counter()
+    results = pipeline(
+        texts, batch_size=batch_size, max_length=512, truncation=True, padding=True
+    )
+    return time.perf_counter() - start, results
+
+
+def compare(
+    model_id: str,
+    texts: Sequence[str],
+    onnx_dir: Optional[str] = None,
+    batch_size: int = 32,
+) -> Dict[str, Any]:
+    """
+    Score ``texts`` with the PyTorch pipeline and the int8 export.
+
+    Returns:
+        dict: ``texts``, ``agreement`` (share of identical labels),
+        ``max_score_diff``, ``torch_per_second``, ``onnx_per_second`` and
+        up to ten ``disagreements`` as (text, torch label, onnx label).
+    """
+    from transformers import pipeline
+
+    texts = list(texts)
+    reference = pipeline("sentiment-analysis", model=model_id)
+    quantized = load_pipeline(model_id, onnx_dir)
+    # One warm-up batch each, so one-off initialisation is not timed.
+    _timed(reference, texts[:batch_size], batch_size)
+    _timed(quantized, texts[:batch_size], batch_size)
+    torch_s, expected = _timed(reference, texts, batch_size)
+    onnx_s, actual = _timed(quantized, texts, batch_size)
+
+    disagreements = [
+        (text, e["label"], a["label"])
+        for text, e, a in zip(texts, expected, actual)
+        if e["label"] != a["label"]
+    ]
+    return {
+        "texts": len(texts),
+        "agreement": 1 - len(disagreements) / len(texts) if texts else 1.0,
+        "max_score_diff": max(
+            (abs(e["score"] - a["score"]) for e, a in zip(expected, actual)),
+            default=0.0,
+        ),
+        "torch_per_second": len(texts) / torch_s if torch_s else float("inf"),
+        "onnx_per_second": len(texts) / onnx_s if onnx_s else float("inf"),
+        "disagreements": disagreements[:10],
+    }
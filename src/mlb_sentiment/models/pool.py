@@ -0,0 +1,164 @@
+"""Multi-core sentiment scoring on a pool of worker processes.
+
+Scoring in the fetch process uses one core (VADER is pure Python, and torch
+inference for one small batch at a time barely scales). ``ScoringPool``
+starts ``workers`` processes per model; each loads the model once, with its
+torch/BLAS thread count capped at ``threads`` so the pool does not
+oversubscribe the machine. Texts are sent in chunks of ``chunk_size`` and
+the results come back in input order. ``get_sentiments`` uses the
+process-wide pool once ``configure_scoring_pool(workers > 1)`` has been
+called; the sentiment cache still runs in the parent, so only cache misses
+are sent to the workers.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Texts per task sent to a worker (a few forward passes' worth).
+DEFAULT_CHUNK_SIZE = 256
+
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+)
+
+
+def _init_worker(
+    model_value: str, threads: int, backend: Tuple[str, Optional[str]]
+) -> None:
+    """Cap the worker's thread pools, then load the model once."""
+    for name in _THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    # Each worker already is one of N parallel tokenizers.
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+    except ImportError:
+        torch = None
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+    from mlb_sentiment.models import process
+
+    process.set_backend(*backend)
+    model_type = process.SentimentModelType(model_value)
+    if model_type in process.HUGGING_FACE_MODELS:
+        process._get_hugging_face_pipeline(model_type)
+    elif model_type == process.SentimentModelType.VADER:
+        process._get_vader_sentiment("")
+
+
+def _score_chunk(
+    model_value: str, texts: List[str], batch_size: int
+) -> List[Tuple[str, float]]:
+    from mlb_sentiment.models import process
+
+    return process._score_uncached(
+        texts, process.SentimentModelType(model_value), batch_size
+    )
+
+
+def _revision(model_value: str) -> str:
+    from mlb_sentiment.models import process
+
+    return process.model_revision(process.SentimentModelType(model_value))
+
+
+class ScoringPool:
+    """
+    Per-model pools of worker processes that each hold one loaded model.
+
+    Args:
+        workers (int): Worker processes per model.
+        threads (int, optional): Torch/BLAS threads per worker
+            (default: CPU count // workers, at least 1).
+        chunk_size (int): Texts per task.
+        mp_context (str): multiprocessing start method; "spawn" keeps the
+            workers clear of the parent's threads and locks.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threads: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        mp_context: str = "spawn",
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.workers = workers
+        self.threads = threads or max(1, (os.cpu_count() or 1) // workers)
+        self.chunk_size = chunk_size
+        self._context = multiprocessing.get_context(mp_context)
+        self._executors: Dict[Any, ProcessPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, model_type: Any) -> ProcessPoolExecutor:
+        from mlb_sentiment.models.process import get_backend
+
+        with self._lock:
+            if model_type not in self._executors:
+                self._executors[model_type] = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                    initargs=(model_type.value, self.threads, get_backend()),
+                )
+            return self._executors[model_type]
+
+    def score(
+        self, texts: Sequence[str], model_type: Any, batch_size: int
+    ) -> List[Tuple[str, float]]:
+        """Score ``texts`` across the workers; results keep the input order."""
+        texts = list(texts)
+        chunks = [
+            texts[start : start + self.chunk_size]
+            for start in range(0, len(texts), self.chunk_size)
+        ]
+        executor = self._executor(model_type)
+        results: List[Tuple[str, float]] = []
+        for scored in executor.map(
+            _score_chunk,
+            [model_type.value] * len(chunks),
+            chunks,
+            [batch_size] * len(chunks),
+        ):
+            results.extend(scored)
+        return results
+
+    def revision(self, model_type: Any) -> str:
+        """The model revision a worker loaded (so the parent need not load it)."""
+        return self._executor(model_type).submit(_revision, model_type.value).result()
+
+    def close(self) -> None:
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown()
+
+
+_SCORING_POOL: Optional[ScoringPool] = None
+
+
+def get_scoring_pool() -> Optional[ScoringPool]:
+    """Return the process-wide scoring pool, or None when scoring in process."""
+    return _SCORING_POOL
+
+
+def configure_scoring_pool(workers: int = 1, **kwargs: Any) -> Optional[ScoringPool]:
+    """
+    Replace the process-wide scoring pool. ``workers <= 1`` scores in the
+    calling process; extra keyword arguments go to ``ScoringPool``. An
+    identical pool is kept, so its workers' loaded models are reused.
+    """
+    global _SCORING_POOL
+    if _SCORING_POOL is not None and not kwargs and _SCORING_POOL.workers == workers:
+        return _SCORING_POOL
+    if _SCORING_POOL is not None:
+        _SCORING_POOL.close()
+    _SCORING_POOL = ScoringPool(workers, **kwargs) if workers > 1 else None
+    return _SCORING_POOL
@@ -1,5 +1,11 @@
+import os
 from enum import Enum
-from typing import Any, Tuple, Dict
+from importlib import metadata
+from typing import Any, Callable, Tuple, Dict, List, Optional, Sequence
+
+from mlb_sentiment.models.cache import get_sentiment_cache, text_digest
+from mlb_sentiment.models.pool import get_scoring_pool
+from mlb_sentiment.models.server import get_scoring_client, scoring_client_failed
 
 # NOTE: vaderSentiment and transformers are imported lazily inside the scoring
 # helpers so that importing this module (and the fetch pipeline that depends on
@@ -24,12 +30,41 @@ HUGGING_FACE_MODELS = [
     SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT,
 ]
 
+# Short names of the models in stored column names (``sentiment_roberta``, ...).
+MODEL_TAGS = {
+    SentimentModelType.VADER: "vader",
+    SentimentModelType.DISTILBERT_BASE_UNCASED_FINETUNED_SST_2_ENGLISH: "distilbert",
+    SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT: "roberta",
+}
+
 # ----------------------------
 # Cached analyzers/pipelines (initialized on first use)
 # ----------------------------
 _vader_analyzer = None
 _hf_pipelines: Dict[SentimentModelType, Any] = {}
 
+# How Hugging Face models run: "torch" (transformers pipelines) or "onnx"
+# (int8-quantized exports on onnxruntime, see models/onnx_backend.py).
+HUGGING_FACE_BACKENDS = ("torch", "onnx")
+_backend = {
+    "name": os.getenv("MLB_SENTIMENT_BACKEND", "torch"),
+    "onnx_dir": os.getenv("MLB_ONNX_DIR"),
+}
+
+# Texts per forward pass when scoring in bulk with get_sentiments.
+DEFAULT_BATCH_SIZE = 32
+
+# Map cardiffnlp/twitter-roberta-base-sentiment labels to general emotions.
+ROBERTA_LABELS = {"LABEL_0": "negative", "LABEL_1": "neutral", "LABEL_2": "positive"}
+
+# Models that split on whitespace before scoring, so texts differing only in
+# whitespace share a cache entry. Roberta's byte-level BPE encodes spaces, so
+# its texts are cached verbatim.
+WHITESPACE_INSENSITIVE_MODELS = {
+    SentimentModelType.VADER,
+    SentimentModelType.DISTILBERT_BASE_UNCASED_FINETUNED_SST_2_ENGLISH,
+}
+
 
 # ----------------------------
 # Helpers
@@ -72,46 +107,286 @@ def _get_vader_sentiment(comment: str) -> Tuple[str, float]:
     return emotion, compound_score
 
 
-def _get_hugging_face_sentiment(
-    comment: str, model_type: SentimentModelType
-) -> Tuple[str, float]:
+def set_backend(name: str, onnx_dir: Optional[str] = None) -> None:
     """
-    Analyzes sentiment using a Hugging Face model.
-    Returns (label, score).
+    Choose how Hugging Face models run ("torch" or "onnx"); ``onnx_dir`` is
+    where the ONNX exports are kept. Pipelines already loaded are dropped.
     """
-    if model_type not in _hf_pipelines:
+    if name not in HUGGING_FACE_BACKENDS:
+        raise ValueError(f"Unsupported sentiment backend: {name}")
+    if (name, onnx_dir) != (_backend["name"], _backend["onnx_dir"]):
+        _hf_pipelines.clear()
+    _backend.update(name=name, onnx_dir=onnx_dir)
+
+
+def get_backend() -> Tuple[str, Optional[str]]:
+    """The current (backend name, ONNX export folder)."""
+    return _backend["name"], _backend["onnx_dir"]
+
+
+def _get_hugging_face_pipeline(model_type: SentimentModelType) -> Any:
+    """Return the (cached) pipeline for a Hugging Face model on the current backend."""
+    if model_type not in _hf_pipelines and _backend["name"] == "onnx":
+        from mlb_sentiment.models.onnx_backend import load_pipeline
+
+        _hf_pipelines[model_type] = load_pipeline(
+            model_type.value, _backend["onnx_dir"]
+        )
+    elif model_type not in _hf_pipelines:
         from transformers import pipeline
 
         _hf_pipelines[model_type] = pipeline(
             "sentiment-analysis", model=model_type.value
         )
-    sentiment_pipeline = _hf_pipelines[model_type]
-    results = sentiment_pipeline(
-        [comment], max_length=512, truncation=True, padding=True
-    )
+    return _hf_pipelines[model_type]
+
+
+def _hugging_face_label(
+    result: Dict[str, Any], model_type: SentimentModelType
+) -> Tuple[str, float]:
+    """Convert one pipeline result into (label, score)."""
     if model_type == SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT:
-        # Map labels to more general emotions
-        label_map = {"LABEL_0": "negative", "LABEL_1": "neutral", "LABEL_2": "positive"}
-        label = label_map.get(results[0]["label"], "neutral")
-        return label, results[0]["score"]
+        return ROBERTA_LABELS.get(result["label"], "neutral"), result["score"]
+    return result["label"], result["score"]
+
+
+def _length_sorted_order(comments: Sequence[str], tokenizer: Any) -> List[int]:
+    """
+    Indices of ``comments`` ordered by token length, so each batch holds texts
+    of similar length and padding stays low. Falls back to character length
+    when the pipeline exposes no tokenizer.
+    """
+    if tokenizer is not None:
+        lengths = [
+            len(ids)
+            for ids in tokenizer(list(comments), truncation=True, max_length=512)[
+                "input_ids"
+            ]
+        ]
+    else:
+        lengths = [len(c) for c in comments]
+    return sorted(range(len(comments)), key=lengths.__getitem__)
+
+
+def _get_hugging_face_sentiments(
+    comments: Sequence[str], model_type: SentimentModelType, batch_size: int
+) -> List[Tuple[str, float]]:
+    """
+    Analyzes sentiment for many comments using a Hugging Face model.
+
+    Comments are bucketed by token length into batches of ``batch_size`` and
+    each bucket is scored in one forward pass. Results come back in input order
+    as (label, score) tuples.
+    """
+    sentiment_pipeline = _get_hugging_face_pipeline(model_type)
+    order = _length_sorted_order(
+        comments, getattr(sentiment_pipeline, "tokenizer", None)
+    )
+
+    results: List[Tuple[str, float]] = [("neutral", 0.0)] * len(comments)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start : start + batch_size]
+        outputs = sentiment_pipeline(
+            [comments[i] for i in bucket],
+            batch_size=len(bucket),
+            max_length=512,
+            truncation=True,
+            padding=True,
+        )
+        for i, output in zip(bucket, outputs):
+            results[i] = _hugging_face_label(output, model_type)
+    return results
+
+
+def _get_hugging_face_sentiment(
+    comment: str, model_type: SentimentModelType
+) -> Tuple[str, float]:
+    """
+    Analyzes sentiment using a Hugging Face model.
+    Returns (label, score).
+    """
+    return _get_hugging_face_sentiments([comment], model_type, batch_size=1)[0]
+
+
+def _local_hub_revision(model_id: str) -> Optional[str]:
+    """Commit hash of a model already in the local Hugging Face cache, if any."""
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return None
+    path = try_to_load_from_cache(model_id, "config.json")
+    if not isinstance(path, str):
+        return None
+    return os.path.basename(os.path.dirname(path))
+
+
+def model_revision(model_type: SentimentModelType) -> str:
+    """
+    Revision the model's results are cached under: the vaderSentiment release,
+    or the Hugging Face commit the pipeline loaded (tagged "+onnx-int8" on the
+    ONNX backend). Read from the local hub cache or the ONNX export when
+    possible, so fully cached texts never load the model.
+    """
+    if model_type == SentimentModelType.VADER:
+        try:
+            return "vaderSentiment-" + metadata.version("vaderSentiment")
+        except metadata.PackageNotFoundError:
+            return "vaderSentiment"
+    pipeline = _hf_pipelines.get(model_type)
+    if pipeline is None:
+        if _backend["name"] == "onnx":
+            from mlb_sentiment.models.onnx_backend import exported_revision
+
+            revision = exported_revision(model_type.value, _backend["onnx_dir"])
+        else:
+            revision = _local_hub_revision(model_type.value)
+        if revision:
+            return revision
+        pool = get_scoring_pool()
+        if pool is not None:
+            return pool.revision(model_type)  # keep the model out of this process
+        pipeline = _get_hugging_face_pipeline(model_type)
+    if getattr(pipeline, "revision", None):
+        return pipeline.revision
+    config = getattr(getattr(pipeline, "model", None), "config", None)
+    return getattr(config, "_commit_hash", None) or "main"
+
+
+def _score_uncached(
+    texts: Sequence[str], model_type: SentimentModelType, batch_size: int
+) -> List[Tuple[str, float]]:
+    if model_type == SentimentModelType.VADER:
+        return [_get_vader_sentiment(text) for text in texts]
+    if model_type in HUGGING_FACE_MODELS:
+        return _get_hugging_face_sentiments(texts, model_type, batch_size)
+    raise ValueError(f"Unsupported sentiment model type: {model_type}")
+
+
+def _score_local(
+    texts: Sequence[str], model_type: SentimentModelType, batch_size: int
+) -> List[Tuple[str, float]]:
+    """Score on the scoring pool's workers when one is configured, else here."""
+    pool = get_scoring_pool()
+    if pool is not None:
+        return pool.score(texts, model_type, batch_size)
+    return _score_uncached(texts, model_type, batch_size)
+
+
+def _score_through_cache(
+    texts: Sequence[str],
+    model_type: SentimentModelType,
+    batch_size: int,
+    revision: str,
+    score: Callable[..., List[Tuple[str, float]]],
+) -> List[Tuple[str, float]]:
+    """
+    Score ``texts`` through the sentiment cache: each distinct text missing
+    from it is passed to ``score`` once, and the new results are stored.
+    """
+    if model_type in WHITESPACE_INSENSITIVE_MODELS:
+        keys = [" ".join(text.split()) for text in texts]
     else:
-        return results[0]["label"], results[0]["score"]
+        keys = list(texts)
+    digests = [text_digest(key) for key in keys]
+    cache = get_sentiment_cache()
+    results = cache.get_many(model_type.value, revision, digests)
+
+    pending: Dict[bytes, str] = {}
+    for text, digest, result in zip(texts, digests, results):
+        if result is None:
+            pending.setdefault(digest, text)
+    if pending:
+        scored = score(list(pending.values()), model_type, batch_size)
+        fresh = dict(zip(pending, scored))
+        cache.put_many(model_type.value, revision, list(fresh.items()))
+        results = [fresh[d] if r is None else r for d, r in zip(digests, results)]
+    return results
+
+
+def scoring_revision(model_type: SentimentModelType) -> str:
+    """
+    Revision results for ``model_type`` are scored and cached under here: the
+    scoring server's when one answers (``models/server.py``), else
+    ``model_revision``.
+    """
+    client = get_scoring_client()
+    if client is not None:
+        try:
+            return client.revision(model_type)
+        except (OSError, RuntimeError):  # server gone, or failed to score
+            scoring_client_failed()
+    return model_revision(model_type)
+
+
+def _score_cached(
+    texts: Sequence[str], model_type: SentimentModelType, batch_size: int
+) -> List[Tuple[str, float]]:
+    """
+    Score ``texts`` through the sentiment cache, sending the misses to the
+    scoring server when one answers (``models/server.py``). Results are then
+    cached under the revision the server reports. If the server goes away
+    or reports an error, the misses are scored in this process instead.
+    """
+    client = get_scoring_client()
+    if client is not None:
+        try:
+            return _score_through_cache(
+                texts,
+                model_type,
+                batch_size,
+                client.revision(model_type),
+                client.score,
+            )
+        except (OSError, RuntimeError):  # server gone, or failed to score
+            scoring_client_failed()
+    return _score_here(texts, model_type, batch_size)
+
+
+def _score_here(
+    texts: Sequence[str], model_type: SentimentModelType, batch_size: int
+) -> List[Tuple[str, float]]:
+    """Score through the cache in this process, never via the scoring server."""
+    if model_type == SentimentModelType.NULL:
+        return [("neutral", 0.0)] * len(texts)
+    return _score_through_cache(
+        texts, model_type, batch_size, model_revision(model_type), _score_local
+    )
 
 
 # ----------------------------
 # Public API
 # ----------------------------
-def get_sentiment(comment: str, model_type: SentimentModelType) -> Dict[str, float]:
+def get_sentiments(
+    texts: Sequence[str],
+    model_type: SentimentModelType,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Dict[str, float]]:
     """
-    Gets the sentiment (emotion and score) for a comment based on model type.
+    Gets the sentiment (emotion and score) for many comments at once.
+
+    Hugging Face models score length-bucketed batches of ``batch_size`` texts
+    per forward pass; results are returned in the same order as ``texts``.
+    Texts already in the sentiment cache (see ``models/cache.py``) for this
+    model and revision are not rescored. The rest go to the local scoring
+    server when one is running (``models/server.py``), else to the worker
+    processes of the scoring pool when one is configured (``models/pool.py``),
+    else are scored in this process.
     """
-    if model_type == SentimentModelType.VADER:
-        emotion, score = _get_vader_sentiment(comment)
-    elif model_type in HUGGING_FACE_MODELS:
-        emotion, score = _get_hugging_face_sentiment(comment, model_type)
-    elif model_type == SentimentModelType.NULL:
-        emotion, score = "neutral", 0.0
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    if not texts:
+        return []
+
+    if model_type == SentimentModelType.NULL:
+        scored = [("neutral", 0.0)] * len(texts)
     else:
-        raise ValueError(f"Unsupported sentiment model type: {model_type}")
+        scored = _score_cached(texts, model_type, batch_size)
+
+    return [{"emotion": emotion, "score": score} for emotion, score in scored]
 
-    return {"emotion": emotion, "score": score}
+
+def get_sentiment(comment: str, model_type: SentimentModelType) -> Dict[str, float]:
+    """
+    Gets the sentiment (emotion and score) for a comment based on model type.
+    """
+    return get_sentiments([comment], model_type, batch_size=1)[0]
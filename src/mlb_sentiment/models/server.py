@@ -0,0 +1,402 @@
+"""Long-lived local scoring daemon, reached over a Unix socket.
+
+Every ``upload`` run loads its model again, which dominates short runs such
+as one team's refresh. ``ScoringServer`` (``mlb-sentiment score-server``)
+loads the chosen models once and keeps them warm. It scores batches sent by
+any number of local processes. Requests that arrive together for the same
+model are coalesced: one thread per model drains them into one scoring call
+of up to ``max_batch`` texts, so concurrent uploads share full forward
+passes.
+
+``get_sentiments`` in ``process.py`` sends its cache misses to the server
+whenever its socket answers (see ``get_scoring_client``), and scores them in
+process otherwise. Messages are JSON objects framed by a 4-byte big-endian
+length.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_HEADER = struct.Struct(">I")
+
+# Seconds a client waits to connect, and before retrying a socket that did
+# not answer (so a missing server costs one failed connect per interval).
+CONNECT_TIMEOUT = 1.0
+RETRY_INTERVAL = 30.0
+
+# Pause between connects refused with EAGAIN (the server's backlog is full).
+CONNECT_BACKOFF = 0.01
+
+
+def default_socket_path() -> str:
+    """$MLB_SCORE_SOCKET, else a per-user socket in the runtime/temp folder."""
+    if os.getenv("MLB_SCORE_SOCKET"):
+        return os.environ["MLB_SCORE_SOCKET"]
+    folder = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(folder, f"mlb-sentiment-{os.getuid()}.sock")
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("scoring server connection closed")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+# ----------------------------
+# Server
+# ----------------------------
+class _Coalescer:
+    """
+    Queue of scoring requests for one model, drained by one thread.
+
+    The thread takes the oldest request, then whatever else is already
+    waiting (up to ``max_batch`` texts, or ``max_wait`` seconds), and scores
+    all of it in one call before splitting the results back per request.
+    """
+
+    def __init__(self, model_type: Any, max_batch: int, max_wait: float):
+        self.model_type = model_type
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str], batch_size: int) -> Future:
+        future: Future = Future()
+        self._queue.put((texts, batch_size, future))
+        return future
+
+    def _gather(self) -> List[Tuple[List[str], int, Future]]:
+        group = [self._queue.get()]
+        size = len(group[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            group.append(item)
+            size += len(item[0])
+        return group
+
+    def _run(self) -> None:
+        from mlb_sentiment.models import process
+
+        while True:
+            group = self._gather()
+            texts = [text for item in group for text in item[0]]
+            batch_size = max(item[1] for item in group)
+            try:
+                scored = process._score_here(texts, self.model_type, batch_size)
+            except Exception as e:  # noqa: BLE001 - report to every caller
+                for _, _, future in group:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            start = 0
+            for item_texts, _, future in group:
+                future.set_result(scored[start : start + len(item_texts)])
+                start += len(item_texts)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server._connections.add(self.connection)
+
+    def finish(self) -> None:
+        with self.server._lock:
+            self.server._connections.discard(self.connection)
+        super().finish()
+
+    def handle(self) -> None:
+        while True:
+            try:
+                message = _recv(self.connection)
+            except (OSError, struct.error):
+                return
+            try:
+                reply = self.server.dispatch(message)
+            except Exception as e:  # noqa: BLE001 - keep serving this client
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            _send(self.connection, reply)
+
+
+class ScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Scores batches for local clients with models kept loaded.
+
+    Args:
+        path (str, optional): Socket path (default: ``default_socket_path()``).
+        models (list): ``SentimentModelType`` values loaded at start; other
+            models are loaded on their first request.
+        max_batch (int): Texts per coalesced scoring call.
+        max_wait (float): Seconds a request waits for others to join its call.
+    """
+
+    daemon_threads = True
+    # Many pool workers connect at once when an upload starts; the default
+    # backlog of 5 refuses the rest with EAGAIN.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        models: Sequence[Any] = (),
+        max_batch: int = 1024,
+        max_wait: float = 0.005,
+    ):
+        from mlb_sentiment.models import process
+
+        self.path = path or default_socket_path()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._stats = {"requests": 0, "texts": 0}
+        self._coalescers: Dict[Any, _Coalescer] = {}
+        self._connections: set = set()
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            if ScoringClient(self.path).ping():
+                raise RuntimeError(f"A scoring server already runs on {self.path}")
+            os.unlink(self.path)  # stale socket of a server that died
+        for model_type in models:
+            # Loads the model here, or on the scoring pool's workers.
+            process._score_here(["warm up"], model_type, 1)
+        super().__init__(self.path, _Handler)
+        os.chmod(self.path, 0o600)
+
+    def _coalescer(self, model_type: Any) -> _Coalescer:
+        with self._lock:
+            if model_type not in self._coalescers:
+                self._coalescers[model_type] = _Coalescer(
+                    model_type, self.max_batch, self.max_wait
+                )
+            return self._coalescers[model_type]
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        from mlb_sentiment.models import process
+
+        op = message.get("op", "score")
+        if op == "ping":
+            return {"ok": True}
+        if op == "stats":
+            return self.stats()
+        model_type = process.SentimentModelType(message["model"])
+        if op == "revision":
+            return {"revision": process.model_revision(model_type)}
+        if op != "score":
+            raise ValueError(f"Unknown op: {op}")
+        texts = message["texts"]
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["texts"] += len(texts)
+        future = self._coalescer(model_type).submit(
+            texts, message.get("batch_size", process.DEFAULT_BATCH_SIZE)
+        )
+        return {"results": future.result()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests and texts received, and the coalesced calls that scored them."""
+        from mlb_sentiment.models.cache import get_sentiment_cache
+
+        with self._lock:
+            batches = sum(c.batches for c in self._coalescers.values())
+            return dict(
+                self._stats, batches=batches, cache=dict(get_sentiment_cache().stats)
+            )
+
+    def server_close(self) -> None:
+        """Stop listening, hang up on connected clients and remove the socket."""
+        super().server_close()
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+# ----------------------------
+# Client
+# ----------------------------
+class ScoringClient:
+    """
+    Connections to a ``ScoringServer``, one per thread of a process, so
+    threads scoring at the same time are coalesced by the server rather than
+    queued behind each other here.
+
+    Args:
+        path (str): Socket path.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._socks: set = set()
+        self._revisions: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(self.path)
+                break
+            except BlockingIOError:
+                sock.close()
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(CONNECT_BACKOFF)
+            except OSError:
+                sock.close()
+                raise
+        sock.settimeout(None)  # scoring a large batch can take a while
+        with self._lock:
+            self._socks.add(sock)
+            self._revisions.clear()  # the server may have restarted
+        return sock
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one message and return the reply; OSError if the server is gone."""
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            try:
+                _send(sock, message)
+                reply = _recv(sock)
+                break
+            except OSError:
+                self._close(sock)
+                if attempt:
+                    raise
+        if "error" in reply:
+            raise RuntimeError(f"scoring server: {reply['error']}")
+        return reply
+
+    def ping(self) -> bool:
+        try:
+            return bool(self.request({"op": "ping"}).get("ok"))
+        except (OSError, RuntimeError):
+            return False
+
+    def score(
+        self, texts: Sequence[str], model_type: Any, batch_size: int
+    ) -> List[Tuple[str, float]]:
+        reply = self.request(
+            {
+                "model": model_type.value,
+                "texts": list(texts),
+                "batch_size": batch_size,
+            }
+        )
+        return [(emotion, score) for emotion, score in reply["results"]]
+
+    def revision(self, model_type: Any) -> str:
+        """The revision the server caches ``model_type`` under (asked once)."""
+        with self._lock:
+            revision = self._revisions.get(model_type)
+        if revision is None:
+            reply = self.request({"op": "revision", "model": model_type.value})
+            revision = reply["revision"]
+            with self._lock:
+                self._revisions[model_type] = revision
+        return revision
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({"op": "stats"})
+
+    def _close(self, sock: socket.socket) -> None:
+        if getattr(self._local, "sock", None) is sock:
+            self._local.sock = None
+        with self._lock:
+            self._socks.discard(sock)
+        sock.close()
+
+    def close(self) -> None:
+        """Close the connections of every thread."""
+        with self._lock:
+            socks, self._socks = self._socks, set()
+        for sock in socks:
+            sock.close()
+
+
+_CLIENT = {
+    "enabled": os.getenv("MLB_SCORE_SERVER", "1") != "0",
+    "path": None,
+    "client": None,
+    "retry_at": 0.0,
+}
+_CLIENT_LOCK = threading.Lock()
+
+
+def configure_scoring_client(path: Optional[str] = None, enabled: bool = True) -> None:
+    """
+    Point this process at the server on ``path`` (default:
+    ``default_socket_path()``), or stop using one with ``enabled=False``.
+    """
+    with _CLIENT_LOCK:
+        if _CLIENT["client"] is not None:
+            _CLIENT["client"].close()
+        _CLIENT.update(enabled=enabled, path=path, client=None, retry_at=0.0)
+
+
+def get_scoring_client() -> Optional[ScoringClient]:
+    """
+    The connected scoring server client, or None when no server answers on
+    the socket (checked again after ``RETRY_INTERVAL`` seconds).
+    """
+    with _CLIENT_LOCK:
+        if not _CLIENT["enabled"]:
+            return None
+        if _CLIENT["client"] is not None:
+            return _CLIENT["client"]
+        if time.monotonic() < _CLIENT["retry_at"]:
+            return None
+        path = _CLIENT["path"] or default_socket_path()
+        client = ScoringClient(path)
+        if os.path.exists(path) and client.ping():
+            _CLIENT["client"] = client
+            return client
+        _CLIENT["retry_at"] = time.monotonic() + RETRY_INTERVAL
+        return None
+
+
+def scoring_client_failed() -> None:
+    """Forget a client whose server went away; scoring falls back in process."""
+    with _CLIENT_LOCK:
+        if _CLIENT["client"] is not None:
+            _CLIENT["client"].close()
+        _CLIENT.update(client=None, retry_at=time.monotonic() + RETRY_INTERVAL)
@@ -0,0 +1,271 @@
+"""Rate-limit-aware scheduling of outbound Reddit and Stats API requests.
+
+Every network call goes through one process-wide ``RequestScheduler``. Each
+service (Reddit, the Stats API) has a token bucket (sustained rate + burst)
+and a cap on calls in flight, and every call gets the same retry policy:
+connection errors, timeouts, 429s and 5xx responses are retried with
+exponential backoff and full jitter. Reddit's ``X-Ratelimit-Remaining`` and
+``X-Ratelimit-Reset`` headers retune the bucket after every response, so a
+backfill slows down as the window is spent instead of hitting the limit, and
+pauses until the reset once it is exhausted.
+
+Reddit traffic is routed through ``RateLimitedRequestor`` (installed by
+``config.load_reddit_client``); Stats API calls are wrapped with
+``throttled``. ``scheduler.report()`` gives calls, retries, time spent waiting
+and throughput per endpoint, for sizing backfills.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import prawcore
+import requests
+
+# service -> (requests per second, burst, max concurrent calls). Reddit's
+# OAuth limit is 100 requests/minute averaged over a 10 minute window; the
+# Stats API publishes no limit, so stay polite.
+DEFAULT_LIMITS = {
+    "reddit": (1.5, 10, 4),
+    "statsapi": (5.0, 10, 4),
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._stamp
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._stamp = now
+
+    def reserve(self):
+        """Take one token, returning how long to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def retune(self, rate, tokens=None):
+        """Set a new refill rate and, optionally, the tokens available now."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(rate, 1e-3)
+            if tokens is not None:
+                self._tokens = min(self._tokens, tokens)
+
+
+class _Service:
+    """Bucket and concurrency cap shared by every endpoint of one service."""
+
+    def __init__(self, rate, burst, concurrency, clock=time.monotonic):
+        self.bucket = TokenBucket(rate, burst, clock=clock)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.default_rate = rate
+
+
+def _retry_after(exc):
+    """Seconds a retryable error asks us to wait (0 if unspecified), or None."""
+    response = getattr(exc, "response", None)
+    if isinstance(exc, requests.HTTPError):
+        if response is None or response.status_code not in RETRY_STATUSES:
+            return None
+        return float(response.headers.get("retry-after") or 0)
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return 0.0
+    if isinstance(
+        exc,
+        (prawcore.exceptions.RequestException, prawcore.exceptions.ServerError),
+    ):
+        return 0.0
+    return None
+
+
+class RequestScheduler:
+    """
+    Token-bucket scheduler with per-service concurrency caps and retries.
+
+    Endpoints are named ``"<service>.<call>"`` (e.g. ``"statsapi.schedule"``).
+    Each endpoint gets its own stats, but shares its service's bucket and
+    concurrency cap, since the limits are per service.
+
+    Args:
+        limits (dict): Service -> (rate per second, burst, max concurrent calls).
+        max_retries (int): Retries after the first attempt.
+        backoff (float): Base backoff in seconds, doubled per retry (full jitter).
+        max_backoff (float): Cap on a single backoff sleep.
+    """
+
+    def __init__(
+        self,
+        limits=None,
+        max_retries=4,
+        backoff=1.0,
+        max_backoff=60.0,
+        sleep=time.sleep,
+        clock=time.monotonic,
+    ):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._clock = clock
+        self._services = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, endpoint):
+        """Return (service, stats dict) for an endpoint, creating them once."""
+        name = endpoint.split(".", 1)[0]
+        with self._lock:
+            if name not in self._services:
+                rate, burst, concurrency = self.limits.get(name, (5.0, 10, 4))
+                self._services[name] = _Service(
+                    rate, burst, concurrency, clock=self._clock
+                )
+            stats = self._stats.setdefault(
+                endpoint,
+                {
+                    "calls": 0,
+                    "retries": 0,
+                    "errors": 0,
+                    "wait_seconds": 0.0,
+                    "first": None,
+                    "last": None,
+                },
+            )
+            return self._services[name], stats
+
+    def _count(self, stats, key, amount=1):
+        with self._lock:
+            stats[key] += amount
+
+    def _wait(self, stats, seconds):
+        if seconds > 0:
+            self._count(stats, "wait_seconds", seconds)
+            self._sleep(seconds)
+
+    def call(self, endpoint, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` under ``endpoint``'s limits, retrying."""
+        service, stats = self._lookup(endpoint)
+        attempt = 0
+        while True:
+            self._wait(stats, service.bucket.reserve())
+            with service.slots:
+                with self._lock:
+                    stats["calls"] += 1
+                    if stats["first"] is None:
+                        stats["first"] = self._clock()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as exc:  # noqa: BLE001 - classified below
+                    retry_after = _retry_after(exc)
+                    if retry_after is None or attempt >= self.max_retries:
+                        self._count(stats, "errors")
+                        raise
+                finally:
+                    with self._lock:
+                        stats["last"] = self._clock()
+            self._count(stats, "retries")
+            cap = min(self.max_backoff, self.backoff * 2**attempt)
+            self._wait(stats, max(random.uniform(0, cap), retry_after))
+            attempt += 1
+
+    def observe(self, endpoint, headers):
+        """
+        Retune ``endpoint``'s service from Reddit-style rate-limit headers:
+        spread the remaining requests over the time left in the window, and
+        hold every caller until the reset once none are left.
+        """
+        service, _ = self._lookup(endpoint)
+        try:
+            remaining = float(headers["x-ratelimit-remaining"])
+            reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        rate = service.default_rate
+        if remaining < 1:
+            service.bucket.retune(rate, tokens=-reset * rate)
+        else:
+            service.bucket.retune(
+                min(rate, remaining / max(reset, 1.0)), tokens=remaining
+            )
+
+    def report(self):
+        """Per-endpoint calls, retries, errors, seconds waited and calls/second."""
+        with self._lock:
+            stats = {endpoint: dict(s) for endpoint, s in self._stats.items()}
+        report = {}
+        for endpoint, s in sorted(stats.items()):
+            elapsed = (s["last"] or 0) - (s["first"] or 0)
+            report[endpoint] = {
+                "calls": s["calls"],
+                "retries": s["retries"],
+                "errors": s["errors"],
+                "wait_seconds": round(s["wait_seconds"], 3),
+                "per_second": round(s["calls"] / elapsed, 3) if elapsed > 0 else None,
+            }
+        return report
+
+
+_SCHEDULER = RequestScheduler()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler."""
+    return _SCHEDULER
+
+
+def configure_scheduler(**kwargs):
+    """Replace the process-wide scheduler (e.g. with different limits)."""
+    global _SCHEDULER
+    _SCHEDULER = RequestScheduler(**kwargs)
+    return _SCHEDULER
+
+
+def throttled(endpoint, fn, *args, **kwargs):
+    """Call ``fn(*args, **kwargs)`` through the process-wide scheduler."""
+    return _SCHEDULER.call(endpoint, fn, *args, **kwargs)
+
+
+def _reddit_endpoint(url):
+    """Name a Reddit URL's endpoint: /api/morechildren -> reddit.morechildren."""
+    parts = [p for p in urlparse(str(url)).path.split("/") if p]
+    if parts[:1] == ["api"] and len(parts) > 1:
+        parts = parts[1:]
+    return "reddit." + (parts[0] if parts else "root")
+
+
+class RateLimitedRequestor(prawcore.Requestor):
+    """prawcore Requestor that sends every Reddit HTTP request via the scheduler."""
+
+    def request(self, method, url, *args, **kwargs):
+        scheduler = get_scheduler()
+        endpoint = _reddit_endpoint(url)
+
+        def send():
+            response = super(RateLimitedRequestor, self).request(
+                method, url, *args, **kwargs
+            )
+            scheduler.observe(endpoint, response.headers)
+            if response.status_code in RETRY_STATUSES:
+                raise requests.HTTPError(response=response)
+            return response
+
+        try:
+            return scheduler.call(endpoint, send)
+        except requests.HTTPError as exc:
+            # Out of retries: hand the response to prawcore to raise as usual.
+            return exc.response
@@ -0,0 +1,167 @@
+"""Decoupled scoring stage: (re)score stored comments with any model.
+
+``upload`` scores comments while fetching them, so trying another model used
+to mean fetching everything from Reddit again. ``mlb-sentiment score`` reads
+the stored comments instead (daily files and compacted partitions). For each
+model it writes model-tagged columns next to the comments::
+
+    sentiment_<tag>            label (e.g. sentiment_roberta)
+    sentiment_score_<tag>      score
+    sentiment_revision_<tag>   model revision that produced them
+
+Only rows without a result for the model's current revision are scored, so
+re-running is cheap and a model upgrade rescores everything. Rows fetched
+with ``--store-raw`` are scored on their body as fetched (``raw_text``); the
+others on the stored, cleaned ``text``. ``set_primary`` also copies the
+results into ``sentiment`` / ``sentiment_score``, the columns the site build
+reads, and records the model in ``sentiment_model``.
+"""
+
+import glob
+import os
+import re
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from mlb_sentiment.database.compact import (
+    COMPACTED_DIR,
+    _read_partition,
+    daily_files,
+)
+from mlb_sentiment.database.reddit import load_reddit_comments
+from mlb_sentiment.database.schema import build_table, write_table
+from mlb_sentiment.models import pool, process
+from mlb_sentiment.models.cache import configure_sentiment_cache
+from mlb_sentiment.models.server import get_scoring_client
+
+_PARTITION = re.compile(r"season=(\d{4})[\\/]month=(\d{2})[\\/]part-\d+\.parquet$")
+
+
+def comment_files(data_dir, teams, since=None):
+    """
+    List the stored comments of ``teams``: daily files dated ``since`` or
+    later, then compacted partitions of ``since``'s month or later.
+
+    Args:
+        since (datetime.date, optional): First day to include (None = all).
+    """
+    files = []
+    for team in teams:
+        files.extend(
+            path
+            for day, kind, path in daily_files(data_dir, team)
+            if kind == "comments" and (since is None or day >= since)
+        )
+        pattern = os.path.join(
+            data_dir, COMPACTED_DIR, "comments", f"team={team}", "*", "*", "*.parquet"
+        )
+        for path in sorted(glob.glob(pattern)):
+            match = _PARTITION.search(path)
+            if match and (
+                since is None
+                or (int(match.group(1)), int(match.group(2)))
+                >= (since.year, since.month)
+            ):
+                files.append(path)
+    return files
+
+
+def _load(path):
+    """A comments file as a table; compacted partitions keep their ``day``."""
+    if os.path.basename(os.path.dirname(path)).startswith("month="):
+        return _read_partition(path, "comments")
+    return load_reddit_comments(path)
+
+
+def _column(table, name):
+    if name in table.column_names:
+        return table[name].cast(pa.string()).to_pylist()
+    return [None] * table.num_rows
+
+
+def score_file(path, model_type, batch_size, since=None, set_primary=False):
+    """
+    Score the rows of one comments file that lack a ``model_type`` result
+    for its current revision, and write the tagged columns back in place.
+
+    Args:
+        path (str): Daily comments file or compacted partition.
+        model_type (SentimentModelType): Model to score with.
+        batch_size (int): Comments per sentiment-model forward pass.
+        since (datetime.date, optional): In partitions, leave earlier days alone.
+        set_primary (bool): Also make these results the comments' ``sentiment``.
+
+    Returns:
+        tuple: (rows scored, rows in the file).
+    """
+    tag = process.MODEL_TAGS[model_type]
+    label_col = f"sentiment_{tag}"
+    score_col = f"sentiment_score_{tag}"
+    revision_col = f"sentiment_revision_{tag}"
+    table = _load(path)
+    revision = process.scoring_revision(model_type)
+
+    revisions = _column(table, revision_col)
+    todo = np.array([r != revision for r in revisions], dtype=bool)
+    if since is not None and "day" in table.column_names:
+        todo &= pc.greater_equal(table["day"], pa.scalar(since, pa.date32())).to_numpy(
+            zero_copy_only=False
+        )
+    rows = np.flatnonzero(todo)
+    if not len(rows) and not set_primary:
+        return 0, table.num_rows
+
+    texts = pc.coalesce(table["raw_text"], table["text"]).to_pylist()
+    results = process.get_sentiments(
+        [texts[i] or "" for i in rows], model_type, batch_size=batch_size
+    )
+    labels = _column(table, label_col)
+    scores = (
+        table[score_col].to_pylist()
+        if score_col in table.column_names
+        else [None] * table.num_rows
+    )
+    for i, result in zip(rows, results):
+        labels[i], scores[i] = result["emotion"], result["score"]
+        revisions[i] = revision
+
+    columns = {name: table[name] for name in table.column_names}
+    columns.update({label_col: labels, score_col: scores, revision_col: revisions})
+    if set_primary:
+        scored = pa.array([label is not None for label in labels])
+        columns["sentiment"] = pc.if_else(
+            scored,
+            pa.array(labels, pa.string()),
+            pa.array(_column(table, "sentiment"), pa.string()),
+        )
+        columns["sentiment_score"] = pc.if_else(
+            scored,
+            pa.array(scores, pa.float32()),
+            table["sentiment_score"].combine_chunks(),
+        )
+        columns["sentiment_model"] = pc.if_else(
+            scored,
+            pa.scalar(tag),
+            pa.array(_column(table, "sentiment_model"), pa.string()),
+        )
+    day = columns.pop("day", None)
+    out = build_table("comments", columns)
+    if day is not None:
+        out = out.append_column("day", day)
+    write_table(out, path)
+    return len(rows), table.num_rows
+
+
+def init_worker(model_value, threads, backend, cache_path):
+    """
+    Prepare a ``score`` worker process: its share of the CPU threads, the
+    shared sentiment cache file and the model, loaded once. The model is
+    not loaded when a scoring server answers, since it scores the texts.
+    """
+    configure_sentiment_cache(path=cache_path)
+    if get_scoring_client() is None:
+        pool._init_worker(model_value, threads, backend)
+    else:
+        process.set_backend(*backend)
@@ -0,0 +1,721 @@
+"""Local stand-in for the Reddit and MLB Stats API endpoints the fetchers use.
+
+``StubServer`` speaks just enough of Reddit's OAuth, listing, comment-tree and
+``/api/morechildren`` endpoints, and of the Stats API's schedule, standings,
+teams and live-feed endpoints, to run ``mlb-sentiment upload`` end to end with
+no credentials or network. Every club plays every configured night; each game
+thread gets a synthetic comment tree of ``comments`` comments, shaped like a
+real one: the first download carries a few hundred comments, collapsed
+siblings sit behind MoreComments stubs, and replies nested past ``max_depth``
+sit behind "continue this thread" stubs. All data is derived from ``seed``, so
+runs are repeatable, and comment trees are built lazily per thread.
+
+Reddit is served at the root and the Stats API under ``/statsapi/api/``; point
+the clients at it with::
+
+    REDDIT_BASE_URL=http://127.0.0.1:8765 \\
+    MLB_STATSAPI_URL=http://127.0.0.1:8765/statsapi/api/ \\
+        mlb-sentiment upload --team-acronym NYM --date 06/15/2025
+
+``GET /__stats`` returns the number of requests served per endpoint.
+"""
+
+import json
+import multiprocessing
+import random
+import re
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from mlb_sentiment import info
+
+STATSAPI_PREFIX = "/statsapi/api/"
+
+# Comment ids pack the thread key above the comment's index in its thread.
+_INDEX_BITS = 24
+# Keeps synthetic thread ids the length of real ones.
+_THREAD_ID_BASE = 36**5
+# Comments in a thread's first download; Reddit sends a few hundred.
+_INITIAL_COMMENTS = 500
+# Comments rendered per morechildren response.
+_MORE_COMMENTS = 500
+# Replies shown under a nested comment before the rest collapse into a stub.
+_SHOWN_REPLIES = 5
+# Hours of the evening (UTC) the synthetic games start.
+_FIRST_PITCH_HOURS = (17, 20, 23)
+_GAME_SECONDS = 3 * 3600 + 30 * 60
+
+_BODIES = (
+    "LETS GO!!! what a swing",
+    "that ball is outta here",
+    "pitching change incoming",
+    "full count here",
+    "this bullpen is going to be the death of me",
+    "can we get a hit with runners on for once",
+    "clutch hit when we needed it most",
+    "ump has been squeezing us all night",
+    "huge insurance run, breathe easy now",
+    "another 1-2-3 inning, the bats are asleep",
+)
+# (event, is an out, weight)
+_EVENTS = (
+    ("Strikeout", True, 22),
+    ("Groundout", True, 20),
+    ("Flyout", True, 18),
+    ("Lineout", True, 8),
+    ("Single", False, 15),
+    ("Walk", False, 9),
+    ("Double", False, 5),
+    ("Home Run", False, 3),
+)
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def to_base36(number):
+    """Encode a non-negative int the way Reddit writes ids."""
+    digits = ""
+    while True:
+        number, rem = divmod(number, 36)
+        digits = _BASE36[rem] + digits
+        if not number:
+            return digits
+
+
+def _listing(children, after=None):
+    return {
+        "kind": "Listing",
+        "data": {
+            "after": after,
+            "before": None,
+            "dist": len(children),
+            "modhash": "",
+            "children": children,
+        },
+    }
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _Tree:
+    """Shape of one synthetic comment tree (parents, replies, subtree sizes)."""
+
+    def __init__(self, size, seed):
+        rng = random.Random(seed)
+        self.parents = []
+        self.depths = []
+        self.replies = [[] for _ in range(size)]
+        self.roots = []
+        for i in range(size):
+            roll = rng.random()
+            if i == 0 or roll < 0.35:
+                parent = -1
+            elif roll < 0.55:
+                parent = i - 1  # back-and-forth chains make the tree deep
+            else:
+                parent = rng.randrange(max(0, i - 500), i)
+            self.parents.append(parent)
+            if parent < 0:
+                self.depths.append(0)
+                self.roots.append(i)
+            else:
+                self.depths.append(self.depths[parent] + 1)
+                self.replies[parent].append(i)
+        # Parents precede their replies, so one backwards pass sizes every subtree.
+        self.sizes = [1] * size
+        for i in range(size - 1, -1, -1):
+            if self.parents[i] >= 0:
+                self.sizes[self.parents[i]] += self.sizes[i]
+        self.offsets = sorted(rng.uniform(0, _GAME_SECONDS) for _ in range(size))
+
+
+class SyntheticLeague:
+    """
+    Deterministic schedule, standings, game feeds and game threads for a set
+    of nights (MM/DD/YYYY). Clubs are paired off at random each night.
+
+    Args:
+        dates (list): Nights the league plays; other dates are off days.
+        comments (int): Comments per game thread.
+        max_depth (int): Reply depth rendered before "continue this thread".
+        seed (int): Seed every generated value derives from.
+    """
+
+    def __init__(self, dates, comments=2000, max_depth=10, seed=0):
+        self.comments = comments
+        self.max_depth = max_depth
+        self.seed = seed
+        self.teams = sorted(
+            (
+                t
+                for t in info.get_all_teams()
+                if t["league"].get("name") in ("National League", "American League")
+            ),
+            key=lambda t: t["id"],
+        )
+        self.games = {}  # YYYY-MM-DD -> [game]
+        self.threads = {}  # thread key -> thread
+        self._posts = {}  # lower-cased bot or subreddit -> [thread]
+        # Trees are rebuilt on demand; only the threads being fetched stay alive.
+        self._tree = lru_cache(maxsize=8)(self._build_tree)
+        for date in sorted(datetime.strptime(d, "%m/%d/%Y") for d in dates):
+            self._add_night(date)
+
+    def _add_night(self, date):
+        day = date.strftime("%Y-%m-%d")
+        rng = random.Random(f"{self.seed}:{day}")
+        teams = list(self.teams)
+        rng.shuffle(teams)
+        games = []
+        for number in range(len(teams) // 2):
+            away, home = teams[2 * number], teams[2 * number + 1]
+            start = date.replace(
+                hour=rng.choice(_FIRST_PITCH_HOURS), minute=5, tzinfo=timezone.utc
+            ).timestamp()
+            game = {
+                "gamePk": 700000 + date.toordinal() % 10000 * 20 + number,
+                "date": day,
+                "start": start,
+                "away": away,
+                "home": home,
+            }
+            game["plays"] = self._plays(game)
+            game["away_score"] = game["plays"][-1]["result"]["awayScore"]
+            game["home_score"] = game["plays"][-1]["result"]["homeScore"]
+            games.append(game)
+            for team in (away, home):
+                self._add_thread(game, team)
+        self.games[day] = games
+
+    def _add_thread(self, game, team):
+        acronym = team["abbreviation"]
+        if acronym not in info.SUBREDDIT_INFO:
+            return
+        key = len(self.threads) + 1
+        subreddit = info.get_team_info(acronym, "subreddit").split("/r/")[1].strip("/")
+        thread_id = to_base36(_THREAD_ID_BASE + key)
+        thread = {
+            "key": key,
+            "id": thread_id,
+            "game": game,
+            "subreddit": subreddit,
+            "author": info.get_team_info(acronym, "game_thread_user") or "stub_mod",
+            "title": (
+                f"Game Thread: {game['away']['name']} @ {game['home']['name']} "
+                f"- {game['date']}"
+            ),
+            "created_utc": game["start"] - 3600,
+        }
+        thread["permalink"] = f"/r/{subreddit}/comments/{thread_id}/game_thread/"
+        self.threads[key] = thread
+        for owner in {thread["author"].lower(), subreddit.lower()}:
+            self._posts.setdefault(owner, []).append(thread)
+
+    def _plays(self, game):
+        """Nine full innings of plays, with scores that add up."""
+        rng = random.Random(f"{self.seed}:{game['gamePk']}")
+        events = []
+        score = {"top": 0, "bottom": 0}
+        for inning, half in (
+            (inning, half) for inning in range(1, 10) for half in ("top", "bottom")
+        ):
+            outs, on_base = 0, []
+            while outs < 3:
+                event, is_out, _ = rng.choices(
+                    _EVENTS, weights=[e[2] for e in _EVENTS]
+                )[0]
+                if is_out:
+                    outs += 1
+                elif event == "Home Run":
+                    score[half] += len(on_base) + 1
+                    on_base = []
+                elif len(on_base) < 3:
+                    on_base.append(f"Runner {inning}{half[0]}{len(on_base)}")
+                else:
+                    score[half] += 1  # bases loaded: one run forced home
+                events.append((inning, half, event, outs, list(on_base), dict(score)))
+        step = _GAME_SECONDS / len(events)
+        plays = []
+        for number, (inning, half, event, outs, on_base, runs) in enumerate(events):
+            plays.append(
+                {
+                    "about": {
+                        "inning": inning,
+                        "halfInning": half,
+                        "startTime": _iso(game["start"] + number * step),
+                        "endTime": _iso(game["start"] + (number + 1) * step),
+                        "isGameEnd": number == len(events) - 1,
+                        "captivatingIndex": rng.randint(0, 100),
+                    },
+                    "result": {
+                        "event": event,
+                        "description": f"{event} in the {half} of the {inning}.",
+                        "awayScore": runs["top"],
+                        "homeScore": runs["bottom"],
+                    },
+                    "count": {"outs": outs},
+                    "runners": [
+                        {
+                            "movement": {"isOut": False, "end": "1B"},
+                            "details": {"runner": {"fullName": name}},
+                        }
+                        for name in on_base
+                    ],
+                }
+            )
+        return plays
+
+    # -- Stats API ----------------------------------------------------------
+
+    def schedule(self, start, end, team_id=None, game_pks=None):
+        """Schedule response for ``start``..``end`` (YYYY-MM-DD, inclusive)."""
+        dates = []
+        for day in sorted(self.games):
+            if not start <= day <= end:
+                continue
+            games = [
+                self._schedule_game(g)
+                for g in self.games[day]
+                if team_id is None or team_id in (g["away"]["id"], g["home"]["id"])
+                if game_pks is None or g["gamePk"] in game_pks
+            ]
+            if games:
+                dates.append({"date": day, "games": games})
+        total = sum(len(d["games"]) for d in dates)
+        return {"totalItems": total, "dates": dates}
+
+    def _schedule_game(self, game):
+        side = {}
+        for name in ("away", "home"):
+            team = game[name]
+            other = "home" if name == "away" else "away"
+            side[name] = {
+                "team": {"id": team["id"], "name": team["name"]},
+                "score": game[f"{name}_score"],
+                "isWinner": game[f"{name}_score"] > game[f"{other}_score"],
+            }
+        return {
+            "gamePk": game["gamePk"],
+            "gameDate": _iso(game["start"]),
+            "gameType": "R",
+            "status": {"detailedState": "Final", "abstractGameState": "Final"},
+            "teams": side,
+            "doubleHeader": "N",
+            "gameNumber": 1,
+            "content": {},
+            "linescore": {"currentInning": 9, "inningState": "End"},
+        }
+
+    def games_by_pk(self):
+        return {g["gamePk"]: g for games in self.games.values() for g in games}
+
+    def feed(self, game_pk):
+        """Live-feed response for one game, or None if it is not scheduled."""
+        game = self.games_by_pk().get(game_pk)
+        if game is None:
+            return None
+        return {
+            "gamePk": game_pk,
+            "gameData": {
+                "status": {"abstractGameState": "Final", "detailedState": "Final"},
+                "teams": {
+                    "away": {"abbreviation": game["away"]["abbreviation"]},
+                    "home": {"abbreviation": game["home"]["abbreviation"]},
+                },
+            },
+            "liveData": {"plays": {"allPlays": game["plays"]}},
+        }
+
+    def standings(self, date):
+        """Standings response: a made-up record per club, grouped by division."""
+        rng = random.Random(f"{self.seed}:standings:{date}")
+        divisions = {}
+        for team in self.teams:
+            wins = rng.randint(55, 85)
+            divisions.setdefault(team["division"]["id"], []).append(
+                {
+                    "team": {
+                        "id": team["id"],
+                        "name": team["name"],
+                        "division": {
+                            "id": team["division"]["id"],
+                            "name": team["division"]["name"],
+                            "abbreviation": team["division"]["name"][:3],
+                        },
+                    },
+                    "wins": wins,
+                    "losses": 140 - wins,
+                }
+            )
+        records = []
+        for teams in divisions.values():
+            teams.sort(key=lambda t: -t["wins"])
+            for rank, record in enumerate(teams, start=1):
+                record["divisionRank"] = str(rank)
+                record["gamesBack"] = str(teams[0]["wins"] - record["wins"])
+            records.append({"teamRecords": teams})
+        return {"records": records}
+
+    # -- Reddit -------------------------------------------------------------
+
+    def posts(self, owner):
+        """A bot's or subreddit's game threads, newest first."""
+        threads = self._posts.get(owner.lower(), [])
+        return _listing(
+            [self._submission(t) for t in sorted(threads, key=lambda t: -t["key"])]
+        )
+
+    def _submission(self, thread):
+        return {
+            "kind": "t3",
+            "data": {
+                "id": thread["id"],
+                "name": f"t3_{thread['id']}",
+                "title": thread["title"],
+                "author": thread["author"],
+                "subreddit": thread["subreddit"],
+                "created_utc": thread["created_utc"],
+                "score": 1,
+                "num_comments": self.comments,
+                "is_self": True,
+                "selftext": "",
+                "permalink": thread["permalink"],
+                "url": "https://www.reddit.com" + thread["permalink"],
+            },
+        }
+
+    def thread(self, thread_id):
+        """The thread for a Reddit submission id, or None."""
+        try:
+            key = int(thread_id, 36) - _THREAD_ID_BASE
+        except ValueError:
+            return None
+        return self.threads.get(key)
+
+    def _build_tree(self, key):
+        return _Tree(self.comments, f"{self.seed}:{key}")
+
+    def _comment(self, thread, tree, index):
+        key = thread["key"]
+        parent = tree.parents[index]
+        return {
+            "kind": "t1",
+            "data": {
+                "id": to_base36((key << _INDEX_BITS) | index),
+                "name": f"t1_{to_base36((key << _INDEX_BITS) | index)}",
+                "parent_id": (
+                    f"t3_{thread['id']}"
+                    if parent < 0
+                    else f"t1_{to_base36((key << _INDEX_BITS) | parent)}"
+                ),
+                "link_id": f"t3_{thread['id']}",
+                "author": f"fan_{(index * 7919 + key) % 4099}",
+                "body": _BODIES[(index * 31 + key) % len(_BODIES)],
+                "created_utc": thread["game"]["start"] + tree.offsets[index],
+                "score": 1,
+                "depth": tree.depths[index],
+                "subreddit": thread["subreddit"],
+                "replies": "",
+            },
+        }
+
+    def _stub(self, thread, tree, parent, indexes, depth):
+        key = thread["key"]
+        parent_id = (
+            f"t3_{thread['id']}"
+            if parent < 0
+            else f"t1_{to_base36((key << _INDEX_BITS) | parent)}"
+        )
+        if not indexes:  # "continue this thread"
+            return {
+                "kind": "more",
+                "data": {
+                    "count": 0,
+                    "name": "t1__",
+                    "id": "_",
+                    "parent_id": parent_id,
+                    "depth": depth,
+                    "children": [],
+                },
+            }
+        children = [to_base36((key << _INDEX_BITS) | i) for i in indexes]
+        return {
+            "kind": "more",
+            "data": {
+                "count": sum(tree.sizes[i] for i in indexes),
+                "name": f"t1_{children[0]}",
+                "id": children[0],
+                "parent_id": parent_id,
+                "depth": depth,
+                "children": children,
+            },
+        }
+
+    def _render(self, thread, tree, parent, indexes, budget, stop_depth, shown=None):
+        """
+        Render comments ``indexes`` (siblings under ``parent``) and their
+        replies as a nested forest, spending ``budget[0]`` comments. Siblings
+        past ``shown`` or the budget collapse into a MoreComments stub, and
+        replies at ``stop_depth`` into a "continue this thread" stub.
+        """
+        things = []
+        for position, index in enumerate(indexes):
+            if budget[0] <= 0 or (shown is not None and position >= shown):
+                things.append(
+                    self._stub(
+                        thread, tree, parent, indexes[position:], tree.depths[index]
+                    )
+                )
+                break
+            budget[0] -= 1
+            comment = self._comment(thread, tree, index)
+            replies = tree.replies[index]
+            if replies:
+                depth = tree.depths[index] + 1
+                if depth >= stop_depth:
+                    nested = [self._stub(thread, tree, index, [], depth)]
+                else:
+                    nested = self._render(
+                        thread, tree, index, replies, budget, stop_depth, _SHOWN_REPLIES
+                    )
+                comment["data"]["replies"] = _listing(nested)
+            things.append(comment)
+        return things
+
+    def comment_tree(self, thread, limit=_INITIAL_COMMENTS):
+        """Response for ``GET /comments/<id>``: [submission, comment forest]."""
+        tree = self._tree(thread["key"])
+        budget = [min(limit, _INITIAL_COMMENTS)]
+        forest = self._render(thread, tree, -1, tree.roots, budget, self.max_depth)
+        return [_listing([self._submission(thread)]), _listing(forest)]
+
+    def continue_thread(self, thread, comment_id):
+        """Response for ``GET /comments/<id>/_/<comment>``: one comment's subtree."""
+        tree = self._tree(thread["key"])
+        index = int(comment_id, 36) & ((1 << _INDEX_BITS) - 1)
+        forest = self._render(
+            thread,
+            tree,
+            tree.parents[index],
+            [index],
+            [_INITIAL_COMMENTS],
+            tree.depths[index] + self.max_depth,
+        )
+        return [_listing([self._submission(thread)]), _listing(forest)]
+
+    def more_children(self, thread, children):
+        """Response for ``POST /api/morechildren``: a flat list of things."""
+        tree = self._tree(thread["key"])
+        budget = [_MORE_COMMENTS]
+        things = []
+        by_parent = {}
+        for child in children:
+            index = int(child, 36) & ((1 << _INDEX_BITS) - 1)
+            by_parent.setdefault(tree.parents[index], []).append(index)
+        for parent, indexes in by_parent.items():
+            stop = max(self.max_depth, tree.depths[indexes[0]] + 1)
+            things.extend(self._render(thread, tree, parent, indexes, budget, stop))
+        # Reddit answers with the requested comments and their replies flattened.
+        flat, stack = [], list(reversed(things))
+        while stack:
+            thing = stack.pop()
+            flat.append(thing)
+            replies = thing["data"].get("replies")
+            if replies:
+                stack.extend(reversed(replies["data"]["children"]))
+                thing["data"]["replies"] = ""
+        return {"json": {"errors": [], "data": {"things": flat}}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, endpoint, body, status=200):
+        payload = json.dumps(body).encode("utf-8")
+        self.server.count(endpoint, len(payload))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _not_found(self):
+        self._send("not_found", {"message": "Not Found", "error": 404}, status=404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/__stats":
+            return self._send("stats", self.server.stats())
+        if url.path.startswith(STATSAPI_PREFIX):
+            return self._statsapi(url.path[len(STATSAPI_PREFIX) :], query)
+        return self._reddit_get(url.path, query)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {k: v[-1] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        path = urlparse(self.path).path.rstrip("/")
+        league = self.server.league
+        if path == "/api/v1/access_token":
+            return self._send(
+                "reddit.access_token",
+                {
+                    "access_token": "stub-token",
+                    "token_type": "bearer",
+                    "expires_in": 86400,
+                    "scope": "*",
+                },
+            )
+        if path == "/api/morechildren":
+            thread = league.thread(form.get("link_id", "")[len("t3_") :])
+            if thread is None:
+                return self._not_found()
+            children = [c for c in form.get("children", "").split(",") if c]
+            return self._send(
+                "reddit.morechildren", league.more_children(thread, children)
+            )
+        return self._not_found()
+
+    def _reddit_get(self, path, query):
+        league = self.server.league
+        parts = [p for p in path.split("/") if p]
+        if len(parts) >= 3 and parts[0] == "user" and parts[2] == "submitted":
+            return self._send("reddit.user", league.posts(parts[1]))
+        if len(parts) >= 3 and parts[0] == "r" and parts[2] == "new":
+            return self._send("reddit.subreddit", league.posts(parts[1]))
+        if len(parts) >= 2 and parts[0] == "comments":
+            thread = league.thread(parts[1])
+            if thread is None:
+                return self._not_found()
+            if len(parts) >= 4 and parts[2] == "_":
+                return self._send(
+                    "reddit.continue", league.continue_thread(thread, parts[3])
+                )
+            limit = int(query.get("limit") or _INITIAL_COMMENTS)
+            return self._send("reddit.comments", league.comment_tree(thread, limit))
+        return self._not_found()
+
+    def _statsapi(self, path, query):
+        league = self.server.league
+        parts = [p for p in path.split("/") if p]
+        resource = parts[1] if len(parts) > 1 else ""
+        if resource == "schedule":
+            start = _api_date(query.get("startDate") or query.get("date"))
+            end = _api_date(query.get("endDate") or query.get("date"))
+            team_id = int(query["teamId"]) if query.get("teamId") else None
+            game_pks = (
+                {int(pk) for pk in query["gamePks"].split(",")}
+                if query.get("gamePks")
+                else None
+            )
+            if game_pks is not None and start is None:
+                start, end = "0000-00-00", "9999-99-99"
+            return self._send(
+                "statsapi.schedule", league.schedule(start, end, team_id, game_pks)
+            )
+        if resource == "standings":
+            return self._send("statsapi.standings", league.standings(query.get("date")))
+        if resource == "teams":
+            return self._send("statsapi.teams", {"teams": league.teams})
+        if resource == "game" and len(parts) > 2 and parts[2].isdigit():
+            feed = league.feed(int(parts[2]))
+            if feed is None:
+                return self._not_found()
+            return self._send("statsapi.game", feed)
+        return self._not_found()
+
+
+def _api_date(value):
+    """Stats API dates arrive as MM/DD/YYYY or YYYY-MM-DD; return the latter."""
+    if not value:
+        return None
+    if re.match(r"\d{4}-\d{2}-\d{2}$", value):
+        return value
+    return datetime.strptime(value, "%m/%d/%Y").strftime("%Y-%m-%d")
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server for a ``SyntheticLeague``, counting requests and
+    response bytes per endpoint. ``start()`` serves from a daemon thread;
+    ``serve_forever()`` blocks as usual.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, league, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.league = league
+        self._counts = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def statsapi_url(self):
+        return self.url + STATSAPI_PREFIX
+
+    def count(self, endpoint, size):
+        with self._lock:
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            self._bytes += size
+
+    def stats(self):
+        """Requests served per endpoint and total response bytes."""
+        with self._lock:
+            counts = dict(sorted(self._counts.items()))
+            return {"requests": counts, "bytes": self._bytes}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _serve(conn, host, port, league_kwargs):
+    server = StubServer(SyntheticLeague(**league_kwargs), host=host, port=port)
+    conn.send(server.url)
+    conn.close()
+    server.serve_forever()
+
+
+def spawn_stub_server(host="127.0.0.1", port=0, **league_kwargs):
+    """
+    Run a ``StubServer`` in a child process, so synthetic data and request
+    handling stay out of the caller's memory and CPU measurements.
+
+    Returns:
+        tuple: (multiprocessing.Process, base URL); terminate the process
+        when done.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    process = ctx.Process(
+        target=_serve, args=(child, host, port, league_kwargs), daemon=True
+    )
+    process.start()
+    url = parent.recv()
+    return process, url
@@ -1,6 +1,10 @@
 from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
 import pytz
 
+EST_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 def utc_to_est(utc_timestamp):
     """
@@ -78,3 +82,70 @@ def iso_to_est(iso):
     if iso.endswith("Z"):
         iso = iso[:-1] + "+00:00"
     return utc_to_est(datetime.fromisoformat(iso).timestamp())
+
+
+def _eastern_strings(utc_index):
+    """Format a tz-aware UTC DatetimeIndex as Eastern wall-clock strings ("" for NaT)."""
+    est = utc_index.tz_convert("US/Eastern").strftime(EST_FORMAT)
+    return np.asarray(pd.Index(est).fillna(""), dtype=object)
+
+
+def epoch_to_utc_array(utc_timestamps):
+    """
+    Convert epoch seconds to UTC timestamps in one pass.
+
+    Args:
+        utc_timestamps: Epoch seconds as a list, NumPy array, or pandas/Arrow column.
+
+    Returns:
+        pandas.DatetimeIndex: UTC timestamps at microsecond precision, NaT for
+        missing values.
+    """
+    seconds = pd.to_numeric(pd.Series(np.asarray(utc_timestamps)), errors="coerce")
+    utc = pd.to_datetime(seconds.to_numpy(dtype="float64") * 1e6, unit="us", utc=True)
+    return pd.DatetimeIndex(utc).as_unit("us")
+
+
+def iso_to_utc_array(isos):
+    """
+    Convert ISO 8601 strings to UTC timestamps in one pass.
+
+    Args:
+        isos: ISO 8601 strings as a list, NumPy array, or pandas/Arrow column.
+
+    Returns:
+        pandas.DatetimeIndex: UTC timestamps at microsecond precision, NaT for
+        empty or missing values.
+    """
+    values = pd.Series(np.asarray(isos, dtype=object)).replace("", None)
+    utc = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+    return pd.DatetimeIndex(utc).as_unit("us")
+
+
+def utc_to_est_array(utc_timestamps):
+    """
+    Vectorized ``utc_to_est``.
+
+    Args:
+        utc_timestamps: Epoch seconds as a list, NumPy array, or pandas/Arrow column.
+
+    Returns:
+        numpy.ndarray: Object array of "YYYY-MM-DD HH:MM:SS" Eastern strings,
+        with "" for missing values.
+    """
+    # Truncate to whole seconds like ``strftime`` on a ``fromtimestamp`` value.
+    return _eastern_strings(epoch_to_utc_array(utc_timestamps).floor("s"))
+
+
+def iso_to_est_array(isos):
+    """
+    Vectorized ``iso_to_est``.
+
+    Args:
+        isos: ISO 8601 strings as a list, NumPy array, or pandas/Arrow column.
+
+    Returns:
+        numpy.ndarray: Object array of "YYYY-MM-DD HH:MM:SS" Eastern strings,
+        with "" for empty or missing values.
+    """
+    return _eastern_strings(iso_to_utc_array(isos))
@@ -0,0 +1,81 @@
+"""Hermetic tests for the raw Stats API archive (no network)."""
+
+import pandas as pd
+
+from mlb_sentiment import archive
+from mlb_sentiment.fetch.mlb import GameContext
+
+GAME = {
+    "game_id": 776001,
+    "game_date": "2026-07-01",
+    "game_datetime": "2026-07-01T23:10:00Z",
+    "status": "Final",
+    "home_name": "New York Mets",
+    "away_name": "Atlanta Braves",
+    "home_score": 1,
+    "away_score": 0,
+}
+FEED = {
+    "gameData": {
+        "status": {"abstractGameState": "Final"},
+        "teams": {"home": {"abbreviation": "NYM"}, "away": {"abbreviation": "ATL"}},
+    },
+    "liveData": {
+        "plays": {
+            "allPlays": [
+                {
+                    "about": {
+                        "inning": 1,
+                        "halfInning": "bottom",
+                        "startTime": "2026-07-01T23:15:00Z",
+                        "isGameEnd": True,
+                    },
+                    "result": {
+                        "event": "Home Run",
+                        "description": "Pete Alonso homers.",
+                        "homeScore": 1,
+                        "awayScore": 0,
+                    },
+                    "count": {"outs": 0},
+                    "runners": [],
+                }
+            ]
+        }
+    },
+}
+
+
+def test_archive_round_trip_reprocesses_offline(tmp_path):
+    archive_dir = str(tmp_path / "raw")
+    data_dir = str(tmp_path / "data")
+    context = GameContext(
+        "NYM",
+        "07/01/2026",
+        schedule=[GAME],
+        team_id=121,
+        record=(50, 40),
+        abbreviations={"New York Mets": "NYM", "Atlanta Braves": "ATL"},
+        feed_loader=lambda game_id: FEED,
+    )
+    archive.archive_game_context(context, archive_dir)
+
+    assert archive.archived_team_days(
+        archive_dir, ["NYM", "ATL"], "06/30/2026", "07/02/2026"
+    ) == [("NYM", "07/01/2026")]
+    assert (
+        archive.read_json_zst(str(tmp_path / "raw" / "feeds" / "776001.json.zst"))
+        == FEED
+    )
+
+    assert archive.reprocess_team_day(archive_dir, data_dir, "NYM", "07/01/2026") == (
+        1,
+        2,  # the game-ending play is registered twice
+    )
+    games = pd.read_parquet(tmp_path / "data" / "NYM" / "NYM_2026-07-01_games.parquet")
+    events = pd.read_parquet(
+        tmp_path / "data" / "NYM" / "NYM_2026-07-01_game_events.parquet"
+    )
+    assert games.iloc[0]["game_id"] == "121776001"
+    assert (games.iloc[0]["wins"], games.iloc[0]["losses"]) == (50, 40)
+    assert list(events["event"]) == ["Home Run", "Home Run"]
+    assert events.iloc[0]["utc"] == pd.Timestamp("2026-07-01 23:15:00", tz="UTC")
@@ -0,0 +1,82 @@
+"""Hermetic tests for Reddit record/replay cassettes (no network)."""
+
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from mlb_sentiment import cassette
+
+
+class _CannedAdapter(BaseAdapter):
+    """Answers every request from a list of (status, headers, body)."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        status, headers, body = self.responses.pop(0)
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body.encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = str(tmp_path / "nym.json.zst")
+    limits = {"x-ratelimit-remaining": "99", "x-ratelimit-reset": "300"}
+    adapter = _CannedAdapter(
+        [
+            (200, {}, json.dumps({"access_token": "secret", "expires_in": 86400})),
+            (200, limits, '{"page": 1}'),
+            (200, limits, '{"page": 2}'),
+        ]
+    )
+    recorder = cassette.cassette_session(path, "record")
+    recorder.mount("https://", adapter)
+    recorder.request(
+        "POST",
+        "https://www.reddit.com/api/v1/access_token",
+        data=[("grant_type", "client_credentials")],
+    )
+    for _ in range(2):
+        recorder.request(
+            "GET",
+            "https://oauth.reddit.com/r/NewYorkMets/new",
+            params={"raw_json": 1, "limit": 100},
+        )
+    recorder.save()
+
+    replay = cassette.cassette_session(path, "replay")
+    token = replay.request(
+        "POST",
+        "https://www.reddit.com/api/v1/access_token",
+        data={"grant_type": "client_credentials"},
+    )
+    assert token.json()["access_token"] == "REDACTED"
+    # Same request again, params in another order: recordings come back in order.
+    pages = [
+        replay.request(
+            "GET",
+            "https://oauth.reddit.com/r/NewYorkMets/new",
+            params={"limit": 100, "raw_json": 1},
+        )
+        for _ in range(3)
+    ]
+    assert [p.json()["page"] for p in pages] == [1, 2, 2]
+    assert "x-ratelimit-remaining" not in pages[0].headers
+    assert adapter.sent == 3  # replay never reached the network
+
+    with pytest.raises(cassette.CassetteMiss):
+        replay.request("GET", "https://oauth.reddit.com/comments/abc")
@@ -18,3 +18,48 @@ def test_cli_fetch():
     result = subprocess.run(command, capture_output=True, text=True)
 
     assert result.returncode == 0
+
+
+def test_upload_all_exits_nonzero_when_a_team_fails(monkeypatch, tmp_path):
+    """A team that fails makes upload-all fail, after the others are written."""
+    from click.testing import CliRunner
+
+    from mlb_sentiment import cli
+
+    def fetch(team, dates, *args, **kwargs):
+        if team == "ATL":
+            raise RuntimeError("Reddit is down")
+        return [(dates[0], None, f"No MLB games found for {team}.")]
+
+    monkeypatch.setattr(cli.config, "load_reddit_client", lambda: None)
+    monkeypatch.setattr(cli, "prefetch_league_snapshots", lambda *args: {})
+    monkeypatch.setattr(cli, "_fetch_team_days", fetch)
+    result = CliRunner().invoke(
+        cli.cli,
+        ["upload-all", "--teams", "NYM,ATL", "--date", "07/01/2026"]
+        + ["--data-dir", str(tmp_path)],
+    )
+    assert result.exit_code == 1
+    assert "ATL: failed (Reddit is down)" in result.output
+    assert "No MLB games found for NYM." in result.output
+    assert "1 team/date(s) failed to upload." in result.output
+
+
+def test_team_pool_workers_get_their_own_reddit_client(monkeypatch):
+    """PRAW is not thread-safe: each worker thread builds and keeps its own."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mlb_sentiment import cli
+
+    monkeypatch.setattr(cli.config, "load_reddit_client", object)
+    both_running = threading.Barrier(2)
+
+    def clients(_):
+        both_running.wait()
+        return cli._thread_reddit_client(), cli._thread_reddit_client()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first, second = pool.map(clients, range(2))
+    assert first[0] is first[1]
+    assert first[0] is not second[0]
@@ -0,0 +1,191 @@
+import os
+import re
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from mlb_sentiment.database import compact, schema
+from mlb_sentiment.database.mlb import save_mlb_events
+from mlb_sentiment.database.reddit import (
+    comment_delta,
+    format_reddit_text,
+    format_reddit_text_column,
+    keep_comment_mask,
+    save_reddit_comments,
+)
+
+
+def test_columnar_cleaner_matches_scalar():
+    """The Arrow cleaner is byte-for-byte identical to format_reddit_text."""
+    texts = [
+        "LETS GO METS!!!\n\nwhat a *swing*, #LGM",
+        "see https://reddit.com/r/NewYorkMets\tand\x0bhttp://x.co/a\x1cb",
+        "café \U0001f600 　 wow \u0085",
+        "x" * 254 + "é,*#" + "y" * 10,
+        "  \x1f\x1e padded \r\n",
+        "",
+        None,
+        42,
+    ]
+    expected = [format_reddit_text(t) for t in texts]
+    for column in (texts, pa.array(texts[:-1] + ["42"])):
+        assert format_reddit_text_column(column).to_pylist() == expected
+
+    keep = keep_comment_mask(format_reddit_text_column(texts)).to_pylist()
+    assert keep == [len(re.findall(r"[A-Za-z0-9]", t)) > 3 for t in expected]
+
+
+def test_writers_use_declared_schemas(tmp_path):
+    """Writers emit v2, dictionary-encoded, zstd Parquet without stringifying."""
+    base = str(tmp_path / "NYM_2026-07-01")
+    save_reddit_comments(
+        [
+            {
+                "game_id": "121776001",
+                "author": "amazinfan",
+                "text": "LETS GO METS, what a swing",
+                "created_utc": 1782947700.5,
+                "sentiment": {"emotion": "positive", "score": 0.9},
+            },
+            {
+                "game_id": "121776001",
+                "author": "amazinfan",
+                "text": "ok",  # too short: dropped
+                "created_utc": 1782947701.0,
+                "sentiment": {"emotion": "neutral", "score": 0.5},
+            },
+        ],
+        filename=base,
+    )
+    save_mlb_events(
+        [
+            (
+                "121776001",
+                1,
+                "top",
+                "Home Run",
+                "Alonso homers, to left.",
+                pd.Timestamp("2026-07-01 23:15:00", tz="UTC"),
+                "NYM",
+                "ATL",
+                "",  # missing score stays null, not "None"/""
+                1,
+                0,
+                None,
+                90,
+            )
+        ],
+        filename=base,
+    )
+
+    comments_file = base + "_comments.parquet"
+    events_file = base + "_game_events.parquet"
+    assert schema.schema_version(comments_file) == schema.SCHEMA_VERSION
+    assert (
+        pq.read_schema(comments_file)
+        .remove_metadata()
+        .equals(schema.SCHEMAS["comments"])
+    )
+    column = pq.ParquetFile(comments_file).metadata.row_group(0).column(6)
+    assert column.compression == "ZSTD"
+
+    comments = pq.read_table(comments_file).to_pylist()
+    assert len(comments) == 1
+    assert comments[0]["text"] == "LETS GO METS what a swing"
+    assert comments[0]["created_utc"] == pd.Timestamp("2026-07-01 23:15:00.5", tz="UTC")
+
+    events = pq.read_table(events_file).to_pylist()
+    assert events[0]["description"] == "Alonso homers... to left."
+    assert events[0]["home_score"] is None
+    assert events[0]["people_on_base"] is None
+    assert events[0]["utc"] == pd.Timestamp("2026-07-01 23:15:00", tz="UTC")
+
+
+def test_compact_team_folds_daily_files(tmp_path):
+    """Old daily files fold into month partitions; re-folding a day replaces it."""
+    data_dir = str(tmp_path)
+    os.makedirs(tmp_path / "NYM")
+
+    def write_day(day, text):
+        save_reddit_comments(
+            [
+                {
+                    "game_id": "121776001",
+                    "author": "amazinfan",
+                    "text": text,
+                    "created_utc": pd.Timestamp(f"{day} 23:15", tz="UTC").timestamp(),
+                    "sentiment": {"emotion": "positive", "score": 0.9},
+                }
+            ],
+            filename=os.path.join(data_dir, "NYM", f"NYM_{day}"),
+        )
+
+    write_day("2026-07-01", "LETS GO METS first")
+    write_day("2026-07-02", "LETS GO METS second")
+    write_day("2026-07-09", "LETS GO METS still hot")
+
+    assert compact.compact_team(data_dir, "NYM", date(2026, 7, 5)) == (2, 1)
+    assert sorted(os.listdir(tmp_path / "NYM")) == ["NYM_2026-07-09_comments.parquet"]
+
+    target = compact.partition_path(data_dir, "comments", "NYM", date(2026, 7, 1))
+    assert target.endswith(
+        os.path.join(
+            "comments", "team=NYM", "season=2026", "month=07", "part-0.parquet"
+        )
+    )
+    rows = pq.read_table(target).to_pylist()
+    assert [r["text"] for r in rows] == ["LETS GO METS first", "LETS GO METS second"]
+    assert [r["day"] for r in rows] == [date(2026, 7, 1), date(2026, 7, 2)]
+
+    write_day("2026-07-01", "LETS GO METS refetched")
+    assert compact.compact_team(data_dir, "NYM", date(2026, 7, 5)) == (1, 1)
+    rows = pq.read_table(target).to_pylist()
+    assert [r["text"] for r in rows] == [
+        "LETS GO METS refetched",
+        "LETS GO METS second",
+    ]
+
+
+def test_merge_upserts_comments_by_reddit_id(tmp_path):
+    """A merging save keeps stored comments and replaces re-fetched ones by id."""
+    base = str(tmp_path / "NYM_2026-07-01")
+
+    def comment(cid, text, second, score=0.9):
+        return {
+            "id": cid,
+            "parent_id": "t3_1abcde",
+            "game_id": "121776001",
+            "author": "amazinfan",
+            "text": text,
+            "created_utc": 1782947700.0 + second,
+            "sentiment": {"emotion": "positive", "score": score},
+        }
+
+    save_reddit_comments(
+        [comment("k3x9ab", "LETS GO METS", 0), comment("k3x9ac", "what a swing", 1)],
+        filename=base,
+    )
+    fetched = [
+        comment("k3x9ab", "LETS GO METS", 0),  # unchanged
+        comment("k3x9ac", "what a swing edit: grand slam", 1),  # edited
+        comment("k3x9ad", "walk it off Pete", 2),  # new
+        comment("k3x9ae", "ok", 3),  # too short to store
+    ]
+    delta = comment_delta(fetched, base)
+    assert [c["id"] for c in delta] == ["k3x9ac", "k3x9ad"]
+
+    save_reddit_comments(
+        [dict(c, sentiment={"emotion": "negative", "score": 0.5}) for c in delta],
+        filename=base,
+        merge=True,
+    )
+    rows = pq.read_table(base + "_comments.parquet").to_pylist()
+    assert [r["id"] for r in rows] == [
+        int(c, 36) for c in ("k3x9ab", "k3x9ac", "k3x9ad")
+    ]
+    assert [r["sentiment"] for r in rows] == ["positive", "negative", "negative"]
+    assert rows[1]["text"] == "what a swing edit: grand slam"
+    assert rows[2]["parent_id"] == "t3_1abcde"
+    assert comment_delta(fetched, base) == []
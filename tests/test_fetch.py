@@ -1,3 +1,5 @@
+import os
+
 from mlb_sentiment.fetch.reddit import fetch_reddit_comments, fetch_reddit_posts
 from mlb_sentiment.fetch.mlb import fetch_mlb_events, fetch_mlb_games
 
@@ -39,3 +41,348 @@ def test_fetch_mlb_games_sample():
     assert isinstance(games, list)
     if games:
         assert len(games[0]) > 0
+
+
+class _FakeComment:
+    def __init__(self, cid, replies=()):
+        self.id = cid
+        self.replies = list(replies)
+
+
+class _FakeReddit:
+    """Answers /api/morechildren from a {comment_id: node} table."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.calls = []
+
+    def post(self, path, data=None):
+        children = data["children"].split(",")
+        self.calls.append(children)
+        return [self.nodes[c] for c in children]
+
+
+class _FakeSubmission:
+    fullname = "t3_abc"
+    comment_sort = "confidence"
+
+    def __init__(self, comments):
+        self.comments = comments
+
+
+def _stub(children):
+    from praw.models import MoreComments
+
+    return MoreComments(None, {"count": len(children), "children": children})
+
+
+def test_expand_comment_tree_batches_stubs_under_budget():
+    from mlb_sentiment.fetch.reddit import expand_comment_tree
+
+    nodes = {f"c{i}": _FakeComment(f"c{i}") for i in range(6)}
+    nodes["c5"].replies = [_stub(["c4"])]  # nested stub, discovered later
+    tree = [
+        _FakeComment("root", [_stub(["c0", "c1", "c2"])]),
+        _stub(["c3"]),
+        _stub(["c5"]),
+    ]
+
+    reddit = _FakeReddit(nodes)
+    comments, stats = expand_comment_tree(reddit, _FakeSubmission(tree))
+    assert sorted(c.id for c in comments) == [
+        "c0",
+        "c1",
+        "c2",
+        "c3",
+        "c4",
+        "c5",
+        "root",
+    ]
+    # Three top-level stubs share one request; the nested one needs a second.
+    assert len(reddit.calls) == 2
+    assert stats == {"requests": 2, "pending": 0}
+
+    reddit = _FakeReddit(nodes)
+    comments, stats = expand_comment_tree(reddit, _FakeSubmission(tree), max_requests=0)
+    assert [c.id for c in comments] == ["root"]
+    assert reddit.calls == []
+    assert stats == {"requests": 0, "pending": 3}
+
+
+def test_expand_comment_tree_limit_keeps_listing_order():
+    """A ``limit`` keeps the top-level comments in sort order, not a deep chain."""
+    from mlb_sentiment.fetch.reddit import expand_comment_tree
+
+    tree = [
+        _FakeComment("top1", [_FakeComment("reply1", [_FakeComment("reply1a")])]),
+        _FakeComment("top2", [_FakeComment("reply2")]),
+        _FakeComment("top3"),
+    ]
+    comments, _ = expand_comment_tree(_FakeReddit({}), _FakeSubmission(tree), limit=3)
+    assert [c.id for c in comments] == ["top1", "top2", "top3"]
+
+    comments, _ = expand_comment_tree(_FakeReddit({}), _FakeSubmission(tree))
+    assert [c.id for c in comments] == [
+        "top1",
+        "top2",
+        "top3",
+        "reply1",
+        "reply2",
+        "reply1a",
+    ]
+
+
+def test_expand_comment_tree_since_stops_at_older_comments():
+    """A refresh stops expanding after a download of only older comments."""
+    from mlb_sentiment.fetch.reddit import expand_comment_tree
+
+    def comment(cid, created_utc, replies=()):
+        node = _FakeComment(cid, replies)
+        node.created_utc = created_utc
+        return node
+
+    nodes = {
+        "m": comment("m", 250.0, [_stub(["o"])]),
+        "o": comment("o", 100.0, [_stub(["p"])]),
+        "p": comment("p", 50.0),
+    }
+    tree = [comment("n", 300.0), _stub(["m"])]
+    reddit = _FakeReddit(nodes)
+    comments, stats = expand_comment_tree(
+        reddit, _FakeSubmission(tree), max_requests=None, since=200.0
+    )
+    assert [c.id for c in comments] == ["n", "m", "o"]
+    assert reddit.calls == [["m"], ["o"]]
+    assert stats == {"requests": 2, "pending": 1}
+
+    # Nothing late in the first download: no expansion at all.
+    reddit = _FakeReddit(nodes)
+    comments, stats = expand_comment_tree(
+        reddit, _FakeSubmission(tree), max_requests=None, since=400.0
+    )
+    assert reddit.calls == []
+    assert stats == {"requests": 0, "pending": 1}
+
+
+def test_fetch_reddit_comments_since_keeps_only_late_comments():
+    """With ``since_utc`` only comments at or after the game's cutoff are kept."""
+
+    def comment(cid, created_utc):
+        node = _FakeComment(cid)
+        node.author, node.body = "amazinfan", f"comment {cid}"
+        node.created_utc, node.parent_id = created_utc, "t3_abc"
+        return node
+
+    submission = _FakeSubmission(
+        [comment("a", 100.0), comment("b", 200.0), comment("c", 300.0)]
+    )
+
+    class _Reddit(_FakeReddit):
+        def submission(self, url):
+            return submission
+
+    comments = fetch_reddit_comments(
+        [{"url": "https://www.reddit.com/r/NewYorkMets/comments/abc/", "game_id": 7}],
+        sentiment_model=None,
+        reddit=_Reddit({}),
+        since_utc={"7": 200.0},
+    )
+    assert [c["id"] for c in comments] == ["b", "c"]
+    assert submission.comment_sort == "new"
+
+
+class _FakePost:
+    def __init__(self, title, created_utc):
+        self.title = title
+        self.created_utc = created_utc
+        self.url = f"https://www.reddit.com/r/NewYorkMets/comments/{int(created_utc)}/"
+        self.score = 1
+        self.subreddit = "NewYorkMets"
+        self.num_comments = 10
+
+
+class _FakeListing:
+    """Newest-first submission listing that counts how far it was read."""
+
+    def __init__(self, posts):
+        self.posts = posts
+        self.read = 0
+
+    def new(self, limit=None):
+        for post in self.posts:
+            self.read += 1
+            yield post
+
+
+def test_fetch_reddit_posts_range_walks_listing_once(monkeypatch):
+    from types import SimpleNamespace
+
+    from mlb_sentiment.fetch import reddit as fetch_reddit
+
+    # 7pm Eastern (EDT) on Jul 3, 2, 1 and Jun 30, 2026, plus a doubleheader.
+    day = 86400
+    jul3 = 1783119600
+    listing = _FakeListing(
+        [
+            _FakePost("GAME THREAD: Mets @ Braves", jul3),
+            _FakePost("POSTGAME THREAD: Mets win", jul3 - 3600),
+            _FakePost("GAME THREAD: Mets @ Braves (Game 2)", jul3 - day),
+            _FakePost("GAME THREAD: Mets @ Braves (Game 1)", jul3 - day - 14400),
+            _FakePost("GAME THREAD: Phillies @ Mets", jul3 - 3 * day),
+            _FakePost("GAME THREAD: Phillies @ Mets", jul3 - 4 * day),
+        ]
+    )
+    fake_reddit = SimpleNamespace(
+        redditor=lambda name: SimpleNamespace(submissions=listing),
+        subreddit=lambda name: listing,
+    )
+    monkeypatch.setattr(
+        fetch_reddit.info,
+        "get_team_info",
+        lambda team, key: "NewYorkMetsBot2" if key == "game_thread_user" else None,
+    )
+    monkeypatch.setattr(
+        fetch_reddit,
+        "fetch_game_ids_range",
+        lambda team, start, end, contexts=None: {
+            "07/02/2026": ["121001", "121002"],
+            "07/03/2026": ["121003"],
+        },
+    )
+
+    by_date = fetch_reddit.fetch_reddit_posts_range(
+        "NYM", "07/01/2026", "07/03/2026", reddit=fake_reddit
+    )
+
+    assert sorted(by_date) == ["07/01/2026", "07/02/2026", "07/03/2026"]
+    assert by_date["07/01/2026"] == []  # off day: no fallback scan
+    assert [p["game_id"] for p in by_date["07/02/2026"]] == ["121001", "121002"]
+    assert "Game 1" in by_date["07/02/2026"][0]["title"]
+    assert [p["game_id"] for p in by_date["07/03/2026"]] == ["121003"]
+    # Stopped at the first thread older than the range: one pass, no rescans.
+    assert listing.read == 5
+
+
+def test_game_context_resolves_schedule_feed_and_record_once(monkeypatch):
+    from mlb_sentiment.fetch import mlb
+
+    calls = []
+    game = {
+        "game_id": 776001,
+        "game_date": "2026-07-01",
+        "game_datetime": "2026-07-01T23:10:00Z",
+        "status": "Final",
+        "home_name": "New York Mets",
+        "away_name": "Atlanta Braves",
+        "home_score": 5,
+        "away_score": 3,
+    }
+    feed = {
+        "gameData": {
+            "teams": {"home": {"abbreviation": "NYM"}, "away": {"abbreviation": "ATL"}}
+        },
+        "liveData": {"plays": {"allPlays": []}},
+    }
+
+    def schedule(**kwargs):
+        calls.append("schedule")
+        return [dict(game)]
+
+    def standings_data(date):
+        calls.append("standings")
+        return {"204": {"teams": [{"team_id": 121, "w": 50, "l": 40}]}}
+
+    def get(endpoint, params):
+        calls.append(endpoint)
+        return feed
+
+    monkeypatch.setattr(mlb, "_LEAGUE_SNAPSHOTS", {})
+    monkeypatch.setattr(mlb, "_FEED_CACHE", mlb.GameFeedCache())
+    monkeypatch.setattr(mlb.statsapi, "schedule", schedule)
+    monkeypatch.setattr(mlb.statsapi, "standings_data", standings_data)
+    monkeypatch.setattr(mlb.statsapi, "get", get)
+    monkeypatch.setattr(mlb.info, "get_team_info", lambda team, key: 121)
+
+    context = mlb.GameContext("NYM", "07/01/2026")
+    games = mlb.fetch_mlb_games("NYM", date="07/01/2026", context=context)
+    events = mlb.fetch_mlb_events("NYM", date="07/01/2026", context=context)
+    game_ids = mlb.fetch_game_ids("NYM", date="07/01/2026", context=context)
+
+    assert games == [
+        ("121776001", "07/01/2026", "19:10:00", "NYM", "ATL", 5, 3, 50, 40)
+    ]
+    assert events == []
+    assert game_ids == ["121776001"]
+    assert calls == ["schedule", "standings", "game"]
+
+
+def test_league_snapshot_serves_every_team_from_two_calls(monkeypatch):
+    from mlb_sentiment.fetch import mlb
+
+    calls = []
+    games = [
+        {"game_id": 1, "game_date": "2026-07-01", "home_id": 121, "away_id": 144},
+        {"game_id": 2, "game_date": "2026-07-01", "home_id": 147, "away_id": 111},
+        {"game_id": 3, "game_date": "2026-07-02", "home_id": 144, "away_id": 121},
+    ]
+    standings = {
+        "204": {"teams": [{"team_id": 121, "w": 50, "l": 40}]},
+        "201": {"teams": [{"team_id": 147, "w": 55, "l": 35}]},
+    }
+
+    def schedule(**kwargs):
+        calls.append(("schedule", kwargs.get("team")))
+        return [g for g in games]
+
+    def standings_data(date):
+        calls.append(("standings", date))
+        return standings
+
+    monkeypatch.setattr(mlb, "_LEAGUE_SNAPSHOTS", {})
+    monkeypatch.setattr(mlb.statsapi, "schedule", schedule)
+    monkeypatch.setattr(mlb.statsapi, "standings_data", standings_data)
+    team_ids = {"NYM": 121, "ATL": 144, "NYY": 147, "BOS": 111}
+    monkeypatch.setattr(mlb.info, "get_team_info", lambda team, key: team_ids[team])
+
+    leagues = mlb.prefetch_league_snapshots("07/01/2026", "07/02/2026")
+    contexts = {
+        team: mlb.game_contexts_for_range(team, "07/01/2026", "07/02/2026", leagues)
+        for team in team_ids
+    }
+
+    assert contexts["NYM"]["07/01/2026"].game_ids == ["1211"]
+    assert contexts["NYM"]["07/02/2026"].game_ids == ["1213"]
+    assert contexts["BOS"]["07/02/2026"].game_ids == []
+    assert contexts["NYM"]["07/01/2026"].record == (50, 40)
+    assert contexts["NYY"]["07/01/2026"].record == (55, 35)
+    assert mlb.team_record_on_date(111, "07/01/2026") == (0, 0)
+    assert calls == [("schedule", None), ("standings", "07/01/2026")]
+
+
+def test_game_feed_cache_downloads_each_feed_once(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mlb_sentiment.fetch import mlb
+
+    downloads = []
+
+    def get(endpoint, params):
+        downloads.append(params["gamePk"])
+        state = "Final" if params["gamePk"] != 3 else "Live"
+        return {"gameData": {"status": {"abstractGameState": state}}}
+
+    monkeypatch.setattr(mlb.statsapi, "get", get)
+    cache = mlb.GameFeedCache(max_entries=2, disk_dir=str(tmp_path))
+
+    # Both clubs of a head-to-head game ask for the feed at the same time.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        feeds = list(pool.map(cache.get, [1, 1, 1, 1]))
+    assert downloads == [1]
+    assert all(f is feeds[0] for f in feeds)
+
+    cache.get(2)
+    cache.get(3)  # evicts game 1 from memory (LRU, two entries)
+    assert cache.get(1) == feeds[0]  # ...but the finished game is on disk
+    assert downloads == [1, 2, 3]
+    assert cache.stats["disk_hits"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["1.json.gz", "2.json.gz"]  # not live 3
@@ -1,3 +1,5 @@
+from mlb_sentiment import info
+from mlb_sentiment.fetch.mlb import get_team_abbreviation
 from mlb_sentiment.info import SUBREDDIT_INFO, get_team_info
 from mlb_sentiment.config import load_reddit_client
 
@@ -11,6 +13,27 @@ def test_subreddit_info_shape():
         assert user is None or (isinstance(user, str) and len(user) > 0)
 
 
+def test_team_registry_lookups_are_offline(monkeypatch):
+    """Team lookups are served from the bundled registry, never statsapi."""
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("statsapi should not be called")
+
+    monkeypatch.setattr(info.statsapi, "get", no_network)
+    monkeypatch.setattr(info.statsapi, "lookup_team", no_network)
+
+    assert len(info.get_all_team_acronyms()) == 30
+    assert set(info.PROCESSED_TEAMS) <= set(info.get_all_team_acronyms())
+    assert get_team_info("NYM", "team_id") == 121
+    assert get_team_info("AZ", "name") == "Arizona Diamondbacks"
+    assert get_team_info("ARI", "team_id") == 109
+    assert info.get_team_name_from_team_acronym("LAD") == "Los Angeles Dodgers"
+    assert info.get_team_acronym_from_team_name("arizona diamondbacks") == "ARI"
+    assert get_team_abbreviation("Arizona Diamondbacks") == "AZ"
+    assert info.get_team_acronym_from_game_id("147") == "NYY"
+    assert info.get_team_acronym_from_game_id("abc") is None
+
+
 def test_subreddit_and_users_exist_on_reddit():
     """Each subreddit (and any configured bot) must resolve on Reddit."""
     reddit = load_reddit_client()
@@ -0,0 +1,82 @@
+"""Hermetic tests for live in-game ingestion (no network)."""
+
+from datetime import date
+
+import pyarrow.parquet as pq
+
+from mlb_sentiment import info, live
+from mlb_sentiment.models.process import SentimentModelType
+
+# Posts and comments carry the Mets' team id (121) in front of the gamePk.
+GAME_ID = "121776001"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _comment(i):
+    return {
+        "id": f"k3x{i:03d}",
+        "parent_id": "t3_1abcde",
+        "game_id": GAME_ID,
+        "author": "amazinfan",
+        "text": f"LETS GO METS number {i}",
+        "created_utc": 1782947700.0 + i,
+    }
+
+
+def test_segment_writer_flushes_by_size_and_age(tmp_path):
+    """Segments roll over at the comment cap or the age limit, never holding more."""
+    clock = _Clock()
+    game_pk = info.get_game_pk_from_game_id(GAME_ID)
+    writer = live.SegmentWriter(
+        str(tmp_path),
+        "NYM",
+        date(2026, 7, 1),
+        game_pk,
+        SentimentModelType.NULL,
+        flush_seconds=30,
+        flush_comments=3,
+        clock=clock,
+    )
+    for i in range(4):
+        writer.add(_comment(i))
+    assert writer.stats == {"comments": 3, "segments": 1}
+
+    writer.tick()  # the fourth comment is still fresh
+    assert writer.stats["segments"] == 1
+    clock.now = 31
+    writer.tick()
+    assert writer.stats == {"comments": 4, "segments": 2}
+    assert writer.flush() is None
+
+    first = live.segment_path(str(tmp_path), "NYM", date(2026, 7, 1), game_pk, 0)
+    assert first.endswith("NYM_2026-07-01_776001_00000_comments.parquet")
+    rows = pq.read_table(first).to_pylist()
+    assert [r["id"] for r in rows] == [int(f"k3x{i:03d}", 36) for i in range(3)]
+    assert {r["sentiment"] for r in rows} == {"neutral"}
+
+    # A restarted writer continues the numbering.
+    again = live.SegmentWriter(
+        str(tmp_path), "NYM", date(2026, 7, 1), game_pk, SentimentModelType.NULL
+    )
+    again.add(_comment(9))
+    assert again.flush().endswith("_00002_comments.parquet")
+
+
+def test_game_finished_asks_statsapi_for_the_game_pk(monkeypatch):
+    """The status check uses the gamePk split off the team-prefixed id."""
+    calls = []
+
+    def schedule(game_id):
+        calls.append(game_id)
+        return [{"status": "Final"}] if game_id == 776001 else []
+
+    monkeypatch.setattr(live.statsapi, "schedule", schedule)
+    assert live.game_finished(info.get_game_pk_from_game_id(GAME_ID))
+    assert calls == [776001]
@@ -1,14 +1,17 @@
 """Hermetic tests for the DuckDB -> JSON build (no network, no credentials)."""
 
+import json
 import os
 import sys
 
 import duckdb
+import pandas as pd
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
 from pipeline import sample_data, build_site_data  # noqa: E402
+from mlb_sentiment.database import schema  # noqa: E402
 
 
 def test_build_team_from_sample(tmp_path):
@@ -78,3 +81,127 @@ def test_full_build_writes_manifest(tmp_path):
 
     (out / "NYM.json").write_text(json.dumps(payload))
     assert (out / "NYM.json").stat().st_size > 0
+
+
+def test_build_reads_v1_and_v2_files_alike(tmp_path):
+    """Migrating some files to the current schema leaves the built payload unchanged."""
+    data_root = tmp_path / "data"
+    sample_data.main(out_root=str(data_root), team="NYM")
+    team_dir = data_root / "NYM"
+    con = duckdb.connect()
+    before = build_site_data.build_team(con, "NYM", str(team_dir))
+
+    # Split the comments so one glob mixes v1 and v2 files, then upgrade half
+    # of them plus the events.
+    comments = pd.read_parquet(team_dir / "sample_comments.parquet")
+    (team_dir / "sample_comments.parquet").unlink()
+    half = len(comments) // 2
+    comments.iloc[:half].to_parquet(team_dir / "a_comments.parquet", index=False)
+    comments.iloc[half:].to_parquet(team_dir / "b_comments.parquet", index=False)
+    assert schema.migrate_file(str(team_dir / "b_comments.parquet"))
+    assert schema.migrate_file(str(team_dir / "sample_game_events.parquet"))
+    assert not schema.migrate_file(str(team_dir / "b_comments.parquet"))
+
+    assert schema.schema_version(str(team_dir / "a_comments.parquet")) == 1
+    assert (
+        schema.schema_version(str(team_dir / "b_comments.parquet"))
+        == schema.SCHEMA_VERSION
+    )
+    events = pd.read_parquet(team_dir / "sample_game_events.parquet")
+    assert "est" not in events and str(events["utc"].dtype) == "datetime64[us, UTC]"
+
+    after = build_site_data.build_team(con, "NYM", str(team_dir))
+    before.pop("generated_at")
+    after.pop("generated_at")
+    assert after == before
+
+
+def test_legacy_float64_scores_are_not_rounded(tmp_path):
+    """Only float32 (v2+) scores are rounded; v1 float64 scores stay as stored."""
+    data_root = tmp_path / "data"
+    sample_data.main(out_root=str(data_root), team="NYM")
+    team_dir = data_root / "NYM"
+    comments = pd.read_parquet(team_dir / "sample_comments.parquet")
+    comments["sentiment_score"] = 0.123456789
+    comments.to_parquet(team_dir / "sample_comments.parquet", index=False)
+
+    con = duckdb.connect()
+    signed = build_site_data._signed_comments(con, str(team_dir))
+    assert set(signed["sentiment_score"].abs()) <= {0.0, 0.123456789}
+
+    assert schema.migrate_file(str(team_dir / "sample_comments.parquet"))
+    signed = build_site_data._signed_comments(con, str(team_dir))
+    assert set(signed["sentiment_score"].abs()) <= {0.0, 0.123457}
+
+
+def test_build_is_the_same_from_daily_files_and_partitions(tmp_path):
+    """Compacting a team's daily files leaves the built payload unchanged."""
+    from datetime import date
+
+    from mlb_sentiment.database import compact
+
+    data_root = tmp_path / "data"
+    sample_data.main(out_root=str(data_root), team="NYM")
+    team_dir = data_root / "NYM"
+
+    # Re-shape the sample into dated daily files, one per game day and kind,
+    # in reverse order and with comment times cut to the minute, so rows tie
+    # on time and compaction (which sorts) changes their physical order.
+    games = pd.read_parquet(team_dir / "sample_games.parquet")
+    days = dict(zip(games["game_id"], pd.to_datetime(games["game_date"]).dt.date))
+    for kind in ("games", "game_events", "comments", "posts"):
+        frame = pd.read_parquet(team_dir / f"sample_{kind}.parquet")[::-1]
+        (team_dir / f"sample_{kind}.parquet").unlink()
+        if kind == "comments":
+            frame["created_est"] = frame["created_est"].str[:16] + ":00"
+        for day, rows in frame.groupby(frame["game_id"].map(days)):
+            path = team_dir / f"NYM_{day}_{kind}.parquet"
+            rows.to_parquet(path, index=False)
+            schema.migrate_file(str(path))
+
+    con = duckdb.connect()
+    before = build_site_data.build_team(con, "NYM", str(team_dir))
+    assert compact.compact_team(str(data_root), "NYM", date(2100, 1, 1))[0] > 0
+    assert not list(team_dir.iterdir())
+    after = build_site_data.build_team(con, "NYM", str(team_dir))
+    before.pop("generated_at")
+    after.pop("generated_at")
+    assert after == before
+
+
+def test_update_live_game_refreshes_one_series(tmp_path):
+    """Live segments replace one game's series without touching the rest."""
+    data_root = tmp_path / "data"
+    out = tmp_path / "out"
+    out.mkdir()
+    sample_data.main(out_root=str(data_root), team="NYM")
+    con = duckdb.connect()
+    payload = build_site_data.build_team(con, "NYM", str(data_root / "NYM"))
+    (out / "NYM.json").write_text(json.dumps(payload))
+    game_id = payload["games"][0]["game_id"]
+
+    missing = build_site_data.update_live_game(con, "NYM", 1, str(data_root), str(out))
+    assert missing is None
+
+    comments = pd.read_parquet(data_root / "NYM" / "sample_comments.parquet")
+    live_dir = data_root / build_site_data.LIVE_DIR / "NYM"
+    live_dir.mkdir(parents=True)
+    # Segments are named by the raw gamePk; their comments keep the team-
+    # prefixed id the payload is keyed by.
+    game_pk = int(str(game_id)[3:])
+    comments[comments["game_id"].astype(int) == game_id].head(40).to_parquet(
+        live_dir / f"NYM_2026-07-01_{game_pk}_00000_comments.parquet", index=False
+    )
+
+    entry = build_site_data.update_live_game(
+        con, "NYM", game_pk, str(data_root), str(out)
+    )
+    assert entry["live"]["comments"] == 40
+    after = json.loads((out / "NYM.json").read_text())
+    assert after["per_game"][str(game_id)]["sentiment_ts"] == entry["sentiment_ts"]
+    assert entry["sentiment_ts"] and entry["comments"]["top"]
+    assert entry["run_diff_ts"] == payload["per_game"][str(game_id)]["run_diff_ts"]
+    assert after["games"] == payload["games"]
+    # The full build never reads live segments.
+    rebuilt = build_site_data.build_team(con, "NYM", str(data_root / "NYM"))
+    assert rebuilt["totals"] == payload["totals"]
@@ -0,0 +1,173 @@
+import pytest
+
+from mlb_sentiment.models import cache, process
+from mlb_sentiment.models.process import SentimentModelType, get_sentiments
+
+ROBERTA = SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT
+DISTILBERT = SentimentModelType.DISTILBERT_BASE_UNCASED_FINETUNED_SST_2_ENGLISH
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    yield cache.configure_sentiment_cache()
+    cache.configure_sentiment_cache()
+
+
+class _FakePipeline:
+    """Stands in for a transformers pipeline; labels by word count."""
+
+    tokenizer = None
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        return [{"label": f"LABEL_{len(t.split()) % 3}", "score": 0.9} for t in texts]
+
+
+def test_get_sentiments_buckets_by_length_and_keeps_order(monkeypatch):
+    fake = _FakePipeline()
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, fake)
+    texts = ["a b c d e f", "a", "a b c d e", "a b", "a b c d", "a b c"]
+
+    results = get_sentiments(texts, ROBERTA, batch_size=2)
+
+    assert [r["emotion"] for r in results] == [
+        "negative",
+        "neutral",
+        "positive",
+        "positive",
+        "neutral",
+        "negative",
+    ]
+    # Similar-length texts share a batch, shortest first.
+    assert fake.batches == [
+        ["a", "a b"],
+        ["a b c", "a b c d"],
+        ["a b c d e", "a b c d e f"],
+    ]
+
+
+def test_get_sentiment_matches_bulk_api():
+    texts = ["what a swing", "bullpen blowing it AGAIN"]
+    bulk = get_sentiments(texts, SentimentModelType.NULL)
+    single = [process.get_sentiment(t, SentimentModelType.NULL) for t in texts]
+    assert bulk == single == [{"emotion": "neutral", "score": 0.0}] * 2
+    assert get_sentiments([], SentimentModelType.VADER) == []
+
+
+def test_repeated_texts_are_scored_once(monkeypatch, fresh_cache):
+    fake = _FakePipeline()
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, fake)
+    texts = ["LFGM", "lol", "LFGM", "ugh", "lol", "LFGM"]
+
+    first = get_sentiments(texts, ROBERTA)
+    assert sorted(t for batch in fake.batches for t in batch) == ["LFGM", "lol", "ugh"]
+    assert first[0] == first[2] == first[5]
+
+    fake.batches.clear()
+    assert get_sentiments(texts, ROBERTA) == first
+    assert fake.batches == []
+    assert fresh_cache.stats["misses"] == 6
+    assert fresh_cache.stats["hits"] == 6
+    assert fresh_cache.hit_rate() == 0.5
+
+
+def test_disk_tier_survives_restart(monkeypatch, tmp_path):
+    path = str(tmp_path / "sentiment.sqlite")
+    fake = _FakePipeline()
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, fake)
+    cache.configure_sentiment_cache(path=path)
+    scored = get_sentiments(["what a swing", "bullpen blowing it AGAIN"], ROBERTA)
+
+    restarted = cache.configure_sentiment_cache(path=path)
+    fake.batches.clear()
+    assert get_sentiments(["bullpen blowing it AGAIN"], ROBERTA) == scored[1:]
+    assert fake.batches == []
+    assert restarted.stats["disk_hits"] == 1
+
+    # Another revision of the model never sees these results.
+    monkeypatch.setattr(process, "model_revision", lambda model_type: "v2")
+    get_sentiments(["what a swing"], ROBERTA)
+    assert fake.batches == [["what a swing"]]
+
+
+def test_whitespace_only_matters_to_roberta(monkeypatch, fresh_cache):
+    for model in (ROBERTA, DISTILBERT):
+        monkeypatch.setitem(process._hf_pipelines, model, _FakePipeline())
+    get_sentiments(["lets go", " lets   go "], DISTILBERT)
+    get_sentiments(["lets go", " lets   go "], ROBERTA)
+    assert process._hf_pipelines[DISTILBERT].batches == [["lets go"]]
+    assert len(process._hf_pipelines[ROBERTA].batches[0]) == 2
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    store = cache.SentimentCache(
+        path=str(tmp_path / "sentiment.sqlite"), max_entries=1, max_bytes=64 * 1024
+    )
+    for batch in range(20):
+        store.put_many(
+            "m",
+            "r",
+            [(cache.text_digest(f"{batch}-{i}"), ("neutral", 0.0)) for i in range(200)],
+        )
+    assert store.stats["evicted"] > 0
+    assert store.disk_bytes() <= 64 * 1024
+    newest = [cache.text_digest(f"19-{i}") for i in range(200)]
+    assert all(store.get_many("m", "r", newest))
+    assert store.get_many("m", "r", [cache.text_digest("0-0")]) == [None]
+
+
+def test_scoring_pool_keeps_order_across_workers(monkeypatch, fresh_cache):
+    from mlb_sentiment.models import pool
+
+    # Forked workers inherit the fake pipeline instead of loading a model.
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, _FakePipeline())
+    texts = [" ".join(["w"] * (i % 7 + 1)) + f" #{i}" for i in range(50)]
+    expected = get_sentiments(texts, ROBERTA)
+
+    cache.configure_sentiment_cache()
+    local_batches = len(process._hf_pipelines[ROBERTA].batches)
+    scoring = pool.configure_scoring_pool(workers=2, chunk_size=8, mp_context="fork")
+    try:
+        assert pool.configure_scoring_pool(workers=2) is scoring
+        assert get_sentiments(texts, ROBERTA, batch_size=4) == expected
+        # Every chunk was scored in a worker, not here.
+        assert len(process._hf_pipelines[ROBERTA].batches) == local_batches
+    finally:
+        pool.configure_scoring_pool(workers=1)
+    assert pool.get_scoring_pool() is None
+
+
+def test_onnx_logits_map_to_pipeline_results():
+    import numpy as np
+
+    from mlb_sentiment.models.onnx_backend import logits_to_results
+
+    results = logits_to_results(
+        np.array([[2.0, 0.0, -2.0], [0.0, 0.0, 3.0]]),
+        {0: "LABEL_0", 1: "LABEL_1", 2: "LABEL_2"},
+    )
+    assert [r["label"] for r in results] == ["LABEL_0", "LABEL_2"]
+    assert results[0]["score"] == pytest.approx(0.8668, abs=1e-4)
+    assert process._hugging_face_label(results[1], ROBERTA)[0] == "positive"
+
+
+def test_onnx_backend_caches_under_its_own_revision(tmp_path, monkeypatch):
+    from mlb_sentiment.models import onnx_backend
+
+    export = tmp_path / ROBERTA.value.replace("/", "--")
+    export.mkdir()
+    (export / onnx_backend.EXPORT_INFO).write_text('{"revision": "abc123"}')
+    monkeypatch.setattr(process, "_local_hub_revision", lambda model_id: "abc123")
+
+    assert process.model_revision(ROBERTA) == "abc123"
+    process.set_backend("onnx", str(tmp_path))
+    try:
+        # The int8 export's results never mix with full-precision ones.
+        assert process.model_revision(ROBERTA) == "abc123+onnx-int8"
+    finally:
+        process.set_backend("torch")
+    with pytest.raises(ValueError):
+        process.set_backend("tensorrt")
@@ -0,0 +1,105 @@
+"""Hermetic tests for the request scheduler (fake clock, no network)."""
+
+import pytest
+import requests
+
+from mlb_sentiment import scheduler
+
+
+class _Clock:
+    """Fake monotonic clock that ``sleep`` advances."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _http_error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["retry-after"] = str(retry_after)
+    return requests.HTTPError(response=response)
+
+
+def _scheduler(clock, **kwargs):
+    return scheduler.RequestScheduler(
+        limits={"statsapi": (2.0, 2, 1)}, sleep=clock.sleep, clock=clock, **kwargs
+    )
+
+
+def test_bucket_spaces_calls_past_the_burst():
+    clock = _Clock()
+    s = _scheduler(clock)
+    for _ in range(4):
+        s.call("statsapi.schedule", lambda: None)
+    # Two calls ride the burst; the next two wait half a second each at 2/s.
+    assert clock.slept == [0.5, 0.5]
+    report = s.report()["statsapi.schedule"]
+    assert report["calls"] == 4 and report["wait_seconds"] == 1.0
+    assert report["per_second"] == 4.0
+
+
+def test_retries_transient_errors_and_honours_retry_after():
+    clock = _Clock()
+    s = _scheduler(clock, backoff=0.0)
+    outcomes = [_http_error(429, retry_after=7), requests.ConnectionError(), "ok"]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert s.call("statsapi.game", flaky) == "ok"
+    assert 7.0 in clock.slept
+    report = s.report()["statsapi.game"]
+    assert (report["calls"], report["retries"], report["errors"]) == (3, 2, 0)
+
+
+def test_client_errors_and_exhausted_retries_raise():
+    clock = _Clock()
+    s = _scheduler(clock, max_retries=2, backoff=0.0)
+
+    def not_found():
+        raise _http_error(404)
+
+    def down():
+        raise _http_error(503)
+
+    with pytest.raises(requests.HTTPError):
+        s.call("statsapi.game", not_found)
+    with pytest.raises(requests.HTTPError):
+        s.call("statsapi.schedule", down)
+    report = s.report()
+    assert report["statsapi.game"]["calls"] == 1
+    assert report["statsapi.schedule"]["calls"] == 3
+    assert report["statsapi.schedule"]["errors"] == 1
+
+
+def test_rate_limit_headers_hold_callers_until_reset():
+    clock = _Clock()
+    s = scheduler.RequestScheduler(
+        limits={"reddit": (1.0, 10, 2)}, sleep=clock.sleep, clock=clock
+    )
+    s.call("reddit.comments", lambda: None)
+    s.observe("reddit.comments", {"x-ratelimit-remaining": 0, "x-ratelimit-reset": 30})
+    s.call("reddit.morechildren", lambda: None)
+    assert clock.slept == [pytest.approx(31.0)]
+
+    # Plenty left: the bucket refills at remaining / reset, capped at the default.
+    s.observe("reddit.comments", {"x-ratelimit-remaining": 5, "x-ratelimit-reset": 50})
+    assert s._lookup("reddit")[0].bucket.rate == pytest.approx(0.1)
+
+
+def test_reddit_endpoint_names():
+    name = scheduler._reddit_endpoint
+    assert name("https://oauth.reddit.com/api/morechildren") == "reddit.morechildren"
+    assert name("https://oauth.reddit.com/r/NewYorkMets/new") == "reddit.r"
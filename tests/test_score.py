@@ -0,0 +1,112 @@
+"""Hermetic tests for the decoupled `score` stage (fake model, tmp data dir)."""
+
+from datetime import date
+
+import pyarrow.parquet as pq
+import pytest
+
+from mlb_sentiment.database import compact
+from mlb_sentiment.database.reddit import save_reddit_comments
+from mlb_sentiment.fetch.reddit import score_comments
+from mlb_sentiment.models import cache, process
+from mlb_sentiment.models.process import SentimentModelType
+from mlb_sentiment.score import comment_files, score_file
+
+ROBERTA = SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT
+NULL = {"emotion": "neutral", "score": 0.0}
+
+
+class _FakePipeline:
+    """Stands in for a transformers pipeline; labels by word count."""
+
+    tokenizer = None
+
+    def __call__(self, texts, **kwargs):
+        return [{"label": f"LABEL_{len(t.split()) % 3}", "score": 0.9} for t in texts]
+
+
+def _comment(reddit_id, text, minute):
+    return {
+        "id": reddit_id,
+        "game_id": "121776001",
+        "author": "amazinfan",
+        "text": text,
+        "created_utc": 1782947700.0 + 60 * minute,
+        "sentiment": dict(NULL),
+    }
+
+
+@pytest.fixture
+def revision(monkeypatch):
+    cache.configure_sentiment_cache()
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, _FakePipeline())
+    current = {"revision": "rev1"}
+    monkeypatch.setattr(process, "model_revision", lambda model: current["revision"])
+    yield current
+    cache.configure_sentiment_cache()
+
+
+def test_score_fills_only_missing_results(tmp_path, revision):
+    base = str(tmp_path / "NYM" / "NYM_2026-07-01")
+    (tmp_path / "NYM").mkdir()
+    save_reddit_comments(
+        [
+            _comment("a1", "Lets go Mets", 0),
+            _comment("a2", "What a swing\nby Pete", 1),
+        ],
+        filename=base,
+        store_raw=True,
+    )
+    path = base + "_comments.parquet"
+    stored = pq.read_table(path)
+    assert stored["sentiment_model"].to_pylist() == [None, None]
+    # The body is scored as fetched, not the cleaned text.
+    assert stored["raw_text"].to_pylist()[1] == "What a swing\nby Pete"
+
+    assert comment_files(str(tmp_path), ["NYM"], date(2026, 7, 1)) == [path]
+    assert comment_files(str(tmp_path), ["NYM"], date(2026, 7, 2)) == []
+    assert score_file(path, ROBERTA, 32) == (2, 2)
+    assert score_file(path, ROBERTA, 32) == (0, 2)
+
+    stored = pq.read_table(path)
+    assert stored["sentiment_roberta"].to_pylist() == ["negative", "positive"]
+    assert stored["sentiment_revision_roberta"].to_pylist() == ["rev1", "rev1"]
+    assert stored["sentiment"].to_pylist() == ["neutral", "neutral"]
+
+    # A merge adds a row without a result; only it is scored.
+    save_reddit_comments(
+        [_comment("a3", "Bullpen blows it", 2)], filename=base, merge=True
+    )
+    assert pq.read_table(path)["sentiment_roberta"].to_pylist()[2] is None
+    assert score_file(path, ROBERTA, 32) == (1, 3)
+
+    # A new revision rescores everything; --set-primary promotes the results.
+    revision["revision"] = "rev2"
+    assert score_file(path, ROBERTA, 32, set_primary=True) == (3, 3)
+    stored = pq.read_table(path)
+    assert stored["sentiment"].to_pylist() == ["negative", "positive", "negative"]
+    assert stored["sentiment_score"].to_pylist() == pytest.approx([0.9] * 3)
+    assert stored["sentiment_model"].to_pylist() == ["roberta"] * 3
+
+
+def test_fetch_time_scores_are_tagged_and_survive_compaction(tmp_path, revision):
+    team_dir = tmp_path / "NYM"
+    team_dir.mkdir()
+    for day in (1, 2):
+        comments = [_comment(f"b{day}", "Lets go Mets", day)]
+        if day == 1:
+            score_comments(comments, ROBERTA)
+        save_reddit_comments(comments, filename=str(team_dir / f"NYM_2026-07-0{day}"))
+
+    assert compact.compact_team(str(tmp_path), "NYM", date(2026, 7, 3)) == (2, 1)
+    (partition,) = comment_files(str(tmp_path), ["NYM"], date(2026, 7, 2))
+    table = pq.read_table(partition)
+    assert table["sentiment_model"].to_pylist() == ["roberta", None]
+    assert table["sentiment_revision_roberta"].to_pylist() == ["rev1", None]
+
+    # Only the day from --since on is scored inside the partition.
+    revision["revision"] = "rev2"
+    assert score_file(partition, ROBERTA, 32, since=date(2026, 7, 2)) == (1, 2)
+    table = pq.read_table(partition)
+    assert table["sentiment_revision_roberta"].to_pylist() == ["rev1", "rev2"]
+    assert table["day"].to_pylist() == [date(2026, 7, 1), date(2026, 7, 2)]
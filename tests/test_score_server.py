@@ -0,0 +1,104 @@
+"""Hermetic tests for the local scoring daemon (Unix socket in tmp_path)."""
+
+import threading
+
+import pytest
+
+from mlb_sentiment.models import cache, process
+from mlb_sentiment.models.process import SentimentModelType, get_sentiments
+from mlb_sentiment.models.server import ScoringServer, configure_scoring_client
+
+ROBERTA = SentimentModelType.TWITTER_ROBERTA_BASE_SENTIMENT
+
+
+class _CountingPipeline:
+    """Stands in for a transformers pipeline; labels by word count."""
+
+    tokenizer = None
+
+    def __init__(self):
+        self.texts = 0
+
+    def __call__(self, texts, **kwargs):
+        self.texts += len(texts)
+        return [{"label": f"LABEL_{len(t.split()) % 3}", "score": 0.9} for t in texts]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    cache.configure_sentiment_cache()
+    monkeypatch.setitem(process._hf_pipelines, ROBERTA, _CountingPipeline())
+    monkeypatch.setattr(process, "model_revision", lambda model_type: "test")
+    scoring = ScoringServer(str(tmp_path / "score.sock"), max_wait=0.05)
+    thread = threading.Thread(target=scoring.serve_forever, daemon=True)
+    thread.start()
+    configure_scoring_client(path=scoring.path)
+    try:
+        yield scoring
+    finally:
+        configure_scoring_client()
+        scoring.shutdown()
+        scoring.server_close()
+        cache.configure_sentiment_cache()
+
+
+def test_get_sentiments_uses_the_server(server):
+    texts = ["a", "a b", "a b c"]
+    results = get_sentiments(texts, ROBERTA)
+    assert [r["emotion"] for r in results] == ["neutral", "positive", "negative"]
+    assert server.stats()["texts"] == 3
+
+    # The client caches what the server scored.
+    get_sentiments(texts, ROBERTA)
+    assert server.stats()["texts"] == 3
+
+
+def test_concurrent_requests_are_coalesced(server):
+    from mlb_sentiment.models.server import ScoringClient
+
+    barrier = threading.Barrier(8)
+    results = {}
+    # One client shared by the threads, as get_scoring_client hands out.
+    client = ScoringClient(server.path)
+
+    def request(i):
+        barrier.wait()
+        results[i] = client.score(["a " * i], ROBERTA, batch_size=32)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert [results[i][0][0] for i in range(8)] == [
+        process.ROBERTA_LABELS[f"LABEL_{i % 3}"] for i in range(8)
+    ]
+    stats = server.stats()
+    assert stats["requests"] == 8
+    assert stats["batches"] < 8
+
+
+def test_falls_back_in_process_when_the_server_is_gone(server):
+    get_sentiments(["a"], ROBERTA)
+    server.shutdown()
+    server.server_close()
+
+    results = get_sentiments(["a b"], ROBERTA)
+    assert results == [{"emotion": "positive", "score": 0.9}]
+    assert server.stats()["texts"] == 1
+
+
+def test_falls_back_in_process_when_the_server_fails(server, monkeypatch):
+    dispatch = server.dispatch
+
+    def fail(message):
+        if message.get("op", "score") == "score":
+            raise ValueError("model failed to load")
+        return dispatch(message)
+
+    monkeypatch.setattr(server, "dispatch", fail)
+    results = get_sentiments(["a b"], ROBERTA)
+    assert results == [{"emotion": "positive", "score": 0.9}]
+    assert server.stats()["texts"] == 0
@@ -0,0 +1,69 @@
+"""Hermetic tests for the local Reddit / Stats API stand-in (loopback only)."""
+
+import pytest
+
+from mlb_sentiment import config
+from mlb_sentiment.fetch.mlb import GameContext, fetch_mlb_events, fetch_mlb_games
+from mlb_sentiment.fetch.reddit import fetch_reddit_comments, fetch_reddit_posts
+from mlb_sentiment.scheduler import DEFAULT_LIMITS, configure_scheduler
+from mlb_sentiment.stub_server import StubServer, SyntheticLeague
+
+DATE = "06/15/2025"
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    configure_scheduler(limits={name: (1e6, 1e6, 8) for name in DEFAULT_LIMITS})
+    league = SyntheticLeague([DATE], comments=3000, max_depth=6, seed=7)
+    with StubServer(league) as server:
+        monkeypatch.setattr(config, "REDDIT_BASE_URL", server.url)
+        config.use_statsapi_url(server.statsapi_url)
+        try:
+            yield server
+        finally:
+            config.use_statsapi_url(None)
+            configure_scheduler()
+
+
+def test_games_match_feed(stub):
+    context = GameContext("NYM", DATE)
+    games = fetch_mlb_games("NYM", date=DATE, context=context)
+    assert len(games) == 1
+    game_id, _, _, home, away, home_score, away_score, wins, losses = games[0]
+    assert "NYM" in (home, away)
+    assert wins + losses == 140
+
+    events = fetch_mlb_events("NYM", date=DATE, context=context)
+    assert events[-1][0] == game_id
+    assert (events[-1][8], events[-1][9]) == (home_score, away_score)
+
+
+def test_full_thread_is_recovered(stub):
+    posts = fetch_reddit_posts("NYM", date=DATE)
+    assert len(posts) == 1
+    assert posts[0]["game_id"].startswith("121")
+
+    comments = fetch_reddit_comments(
+        posts, limit=0, sentiment_model=None, more_requests=None, more_seconds=None
+    )
+    assert len({c["id"] for c in comments}) == 3000
+    assert all(c["game_id"] == posts[0]["game_id"] for c in comments)
+
+    served = stub.stats()["requests"]
+    # The tree is deep and wide enough to need both kinds of expansion.
+    assert served["reddit.morechildren"] > 0
+    assert served["reddit.continue"] > 0
+    assert served["reddit.comments"] == 1
+
+
+def test_statsapi_url_is_restored():
+    import statsapi
+
+    config.use_statsapi_url("http://127.0.0.1:1/statsapi/api")
+    assert statsapi.endpoints.ENDPOINTS["schedule"]["url"].startswith(
+        "http://127.0.0.1:1/statsapi/api/"
+    )
+    config.use_statsapi_url(None)
+    assert statsapi.endpoints.ENDPOINTS["schedule"]["url"] == (
+        "https://statsapi.mlb.com/api/{ver}/schedule"
+    )
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from mlb_sentiment import utility
+
+
+def test_array_conversions_match_scalar_helpers():
+    """The vectorized converters agree with utc_to_est/iso_to_est row by row."""
+    # Summer (EDT), winter (EST) and the DST fall-back hour.
+    seconds = [1751411405.9, 1736000000.0, 1762061400.0, 1762065000.0]
+    expected = [utility.utc_to_est(t) for t in seconds]
+    for column in (seconds, np.array(seconds), pd.Series(seconds), pa.array(seconds)):
+        assert list(utility.utc_to_est_array(column)) == expected
+    assert list(utility.utc_to_est_array([None])) == [""]
+
+    isos = ["2025-07-01T23:10:05.123Z", "2025-11-02T05:30:00Z", "", None]
+    assert list(utility.iso_to_est_array(isos)) == [
+        utility.iso_to_est(iso) for iso in isos
+    ]